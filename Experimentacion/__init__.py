@@ -3,10 +3,31 @@ Módulo de inicialización para la carpeta `src`.
 
 Este archivo permite importar fácilmente las funciones y módulos principales 
 del sistema de simulación del seguidor solar.
+
+Las funciones se importan de forma diferida: el módulo que las define solo se
+carga la primera vez que se accede a ellas. En particular, `datetime_picker`
+abre su ventana de Tk solo cuando se importa explícitamente.
 """
 
-# Importaciones de los módulos internos del proyecto
-from .datetime_picker import obtener_fecha_y_horas, actualizar_horas_fin, st_fecha, start_t, end_t
-from .panel_position import visualizar_trayectoria_panel
-from .sun_path import graph_trayectoria_3d, configure_axes, create_sun
-from .sun_position import Rxyz, getSolarPosition
+from Interfaz.importacionDiferida import importacion_diferida
+
+# Nombre exportado -> submódulo que lo define
+_EXPORTACIONES = {
+    "obtener_fecha_y_horas": "datetime_picker",
+    "actualizar_horas_fin": "datetime_picker",
+    "st_fecha": "datetime_picker",
+    "start_t": "datetime_picker",
+    "end_t": "datetime_picker",
+    "visualizar_trayectoria_panel": "panel_position",
+    "graph_trayectoria_3d": "sun_path",
+    "configure_axes": "sun_path",
+    "create_sun": "sun_path",
+    "Rxyz": "sun_position",
+    "Rxyz_lote": "sun_position",
+    "rotar_vertices": "sun_position",
+    "getSolarPosition": "sun_position",
+}
+
+__all__ = list(_EXPORTACIONES)
+
+__getattr__, __dir__ = importacion_diferida(__name__, _EXPORTACIONES)
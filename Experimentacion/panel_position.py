@@ -87,23 +87,8 @@ def visualizar_trayectoria_panel(tiempos, azimuts, elevaciones, beta, phi):
     # Agregar una etiqueta de tiempo en la animación
     etiqueta_tiempo = ejes.text2D(0.05, 0.95, "", transform=ejes.transAxes, color='black', fontsize=12)
 
-    def aplicar_rotaciones(vertices, angulo_pitch, angulo_roll):
-        """
-        Aplica las rotaciones de pitch y roll a los vértices del panel.
-
-        Args:
-            vertices (np.array): Coordenadas de los vértices originales.
-            angulo_pitch (float): Ángulo de inclinación (beta).
-            angulo_roll (float): Ángulo de giro (phi).
-
-        Returns:
-            np.array: Coordenadas transformadas después de la rotación.
-        """
-        # Obtener la matriz de rotación combinada
-        rotacion_combinada = sun_position.Rxyz(angulo_roll, angulo_pitch, 0)  # Se asume gamma = 0
-
-        # Aplicar la rotación a los vértices
-        return vertices @ rotacion_combinada.T
+    # Aplicar las rotaciones de pitch y roll de toda la trayectoria en una sola operación
+    vertices_por_fotograma = sun_position.rotar_vertices(vertices, phi, beta)  # Se asume gamma = 0
 
     def iniciar_animacion():
         """
@@ -125,8 +110,8 @@ def visualizar_trayectoria_panel(tiempos, azimuts, elevaciones, beta, phi):
             fotograma (int): Índice del fotograma actual en la simulación.
         """
         if fotograma < len(tiempos):
-            # Aplicar rotaciones de pitch y roll
-            vertices_rotados = aplicar_rotaciones(vertices, beta[fotograma], phi[fotograma])
+            # Tomar los vértices ya rotados del fotograma actual
+            vertices_rotados = vertices_por_fotograma[fotograma]
 
             # Actualizar la posición del panel en la animación
             panel.set_verts([vertices_rotados])
@@ -6,9 +6,10 @@ en función de la fecha, hora y ubicación geográfica. También incluye funcion
 para calcular la matriz de rotación en 3D para ajustar la orientación del panel solar.
 """
 
-from pysolar.solar import get_altitude, get_azimuth
 from datetime import datetime, timedelta
 import numpy as np
+from Interfaz.efemerides import obtener_backend
+from Interfaz.calculoAngulos import calcular_pitch_roll, Rxyz_lote, rotar_vertices
 
 
 def Rxyz(alpha, beta, gamma):
@@ -58,7 +59,8 @@ def getSolarPosition(
     start_hour: int = 6,
     end_hour: int = 18,
     latitude: float = -0.2105367,
-    longitude: float = -78.491614
+    longitude: float = -78.491614,
+    backend="pysolar"
 ):
     """
     Calcula la posición solar en un rango de tiempo específico.
@@ -69,6 +71,7 @@ def getSolarPosition(
         end_hour (int, opcional): Hora de fin del cálculo (por defecto 6 PM).
         latitude (float, opcional): Latitud del lugar de observación (por defecto -0.2105367, Quito).
         longitude (float, opcional): Longitud del lugar de observación (por defecto -78.491614, Quito).
+        backend (str | callable, opcional): Motor de posición solar ("pysolar" por defecto o "numpy").
 
     Returns:
         tuple: Contiene cinco listas con los siguientes datos:
@@ -78,12 +81,8 @@ def getSolarPosition(
             - beta (list): Lista de ángulos de pitch del panel solar.
             - alpha (list): Lista de ángulos de roll del panel solar.
     """
-    # Listas para almacenar los resultados
+    # Lista para almacenar los tiempos de simulación
     times = []
-    azimuths = []
-    elevations = []
-    beta = []  # Pitch
-    alpha = []  # Roll
 
     # Intervalo de tiempo entre cálculos (10 minutos)
     time_interval = timedelta(minutes=10)
@@ -95,57 +94,19 @@ def getSolarPosition(
     current_time = start_time
 
     while current_time <= end_time:
-        # Obtener el azimut y la elevación solar usando pysolar
-        az = get_azimuth(latitude, longitude, current_time)
-        el = get_altitude(latitude, longitude, current_time)
-
-        # Convertir a radianes para cálculos
-        az_rad = np.radians(az)
-        el_rad = np.radians(el)
-
-        # --- Cálculo de beta (pitch) y alpha (roll) usando la matriz de rotación ---
-
-        # Suponemos gamma = 0 en este caso
-        gamma = 0
-        
-        # Calcular beta (pitch) con la ecuación trigonométrica
-        val = np.cos(el_rad) * np.sin(az_rad)
-        beta_rad_temp = np.arcsin(val)
-        beta_deg_temp = np.degrees(beta_rad_temp)
-
-        # Calcular alpha (roll) con la ecuación trigonométrica
-        val_fi1 = -(np.cos(el_rad) * np.cos(az_rad)) / np.cos(beta_rad_temp)
-        alpha_rad_temp = np.arcsin(val_fi1)
-        alpha_deg_temp = np.degrees(alpha_rad_temp)
-
-        # Obtener la matriz de rotación combinada
-        R = Rxyz(alpha_deg_temp, beta_deg_temp, gamma)
-
-        # Extraer elementos de la matriz de rotación
-        R31 = R[2, 0]
-        R11 = R[0, 0]
-        R21 = R[1, 0]
-        R32 = R[2, 1]
-        R33 = R[2, 2]
-
-        # Calcular beta (pitch) usando arctan2
-        beta_rad = np.arctan2(-R31, np.sqrt(R11**2 + R21**2))
-        beta_deg = np.degrees(beta_rad)
-
-        # Calcular alpha (roll) usando arctan2
-        alpha_rad = np.arctan2(R32, R33)
-        alpha_deg = np.degrees(alpha_rad)
-
-        # ---------------------------------------------------------------
-
-        # Guardar valores en las listas
         times.append(current_time)
-        azimuths.append(az)
-        elevations.append(el)
-        beta.append(beta_deg)  # Pitch
-        alpha.append(alpha_deg)  # Roll
 
         # Avanzar en el tiempo por intervalos de 10 minutos
         current_time += time_interval
 
+    # Obtener el azimut y la elevación solar de todos los instantes con el motor elegido
+    azimuths_array, elevations_array = obtener_backend(backend)(times, latitude, longitude)
+    azimuths = azimuths_array.tolist()
+    elevations = elevations_array.tolist()
+
+    # --- Cálculo de beta (pitch) y alpha (roll) en lote, equivalente a la ida y vuelta por Rxyz ---
+    beta_array, alpha_array = calcular_pitch_roll(azimuths_array, elevations_array)
+    beta = beta_array.tolist()  # Pitch
+    alpha = alpha_array.tolist()  # Roll
+
     return times, azimuths, elevations, beta, alpha
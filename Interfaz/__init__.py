@@ -1,11 +1,63 @@
 """
 Módulo de inicialización para la carpeta `Interfaz`.
 
-Este archivo permite importar fácilmente las funciones y módulos principales 
+Este archivo permite importar fácilmente las funciones y módulos principales
 de la interfaz gráfica del simulador de seguidor solar.
+
+Las funciones se importan de forma diferida: el módulo que las define solo se
+carga la primera vez que se accede a ellas. Así, usar el núcleo de cálculo
+(por ejemplo, desde la línea de comandos) no importa `tkinter` ni `matplotlib`.
 """
 
-from .seleccionarParametros import obtener_fecha_y_horas, crear_ventana_datetime, st_fecha, start_t, end_t
-from .calculoAngulos import Rxyz, getSolarPosition
-from .generarReporte import generar_reporte
-from .posicionSistema import visualizar_trayectoria_panel_y_sol
+from Interfaz.importacionDiferida import importacion_diferida
+
+# Nombre exportado -> submódulo que lo define
+_EXPORTACIONES = {
+    "obtener_fecha_y_horas": "seleccionarParametros",
+    "crear_ventana_datetime": "seleccionarParametros",
+    "st_fecha": "seleccionarParametros",
+    "start_t": "seleccionarParametros",
+    "end_t": "seleccionarParametros",
+    "Rxyz": "calculoAngulos",
+    "Rxyz_lote": "calculoAngulos",
+    "rotar_vertices": "calculoAngulos",
+    "calcular_pitch_roll": "calculoAngulos",
+    "getSolarPosition": "calculoAngulos",
+    "ResultadoSimulacion": "resultadoSimulacion",
+    "SimulationResult": "resultadoSimulacion",
+    "posicion_solar": "efemerides",
+    "a_hora_local": "zonaHoraria",
+    "formatear_tiempos": "zonaHoraria",
+    "eventos_solares": "eventosSolares",
+    "mascara_diurna": "eventosSolares",
+    "CampoSeguidores": "sombreadoFilas",
+    "fraccion_sombreada": "sombreadoFilas",
+    "backtracking": "sombreadoFilas",
+    "obtener_backend": "efemerides",
+    "TablaEfemerides": "tablaEfemerides",
+    "precalcular_tabla": "tablaEfemerides",
+    "simular_por_bloques": "simulacionBloques",
+    "muestreo_adaptativo": "pasoAdaptativo",
+    "CacheLRU": "cacheSimulacion",
+    "obtener_simulacion_cacheada": "cacheSimulacion",
+    "cargar_sitios": "simulacionFlota",
+    "simular_flota": "simulacionFlota",
+    "barrer_parametros": "barridoParametros",
+    "ResultadoBarrido": "barridoParametros",
+    "analizar_energia": "analisisEnergia",
+    "analizar_anio": "analisisEnergia",
+    "ServicioConsignas": "servicioConsignas",
+    "ControladorSimulado": "servicioConsignas",
+    "ServidorAPI": "servidorAPI",
+    "iniciar_servidor": "servidorAPI",
+    "abrir_escritor": "exportarResultados",
+    "exportar_resultado": "exportarResultados",
+    "cargar_resultados": "exportarResultados",
+    "generar_reporte": "generarReporte",
+    "visualizar_trayectoria_panel_y_sol": "posicionSistema",
+    "exportar_animacion": "exportarAnimacion",
+}
+
+__all__ = list(_EXPORTACIONES)
+
+__getattr__, __dir__ = importacion_diferida(__name__, _EXPORTACIONES)
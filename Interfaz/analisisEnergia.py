@@ -0,0 +1,296 @@
+"""
+Módulo para estimar cuánta energía gana el seguidor solar frente a paneles fijos.
+
+Para cada instante se calcula el ángulo de incidencia entre el vector hacia el
+sol y la normal del panel, tanto para el seguidor de dos ejes (con los ángulos
+de `calcular_pitch_roll`, los mismos que usa `getSolarPosition`) como para uno o
+varios paneles fijos de referencia. La irradiancia en el plano del panel se
+obtiene con un modelo de cielo despejado y se integra en energía diaria y total
+por metro cuadrado.
+
+Todo el cálculo es vectorizado y se hace por bloques con `simular_por_bloques`,
+así que un año con paso de 1 minuto para un sitio toma alrededor de un segundo
+y la memoria no depende de la duración del intervalo.
+
+Modelo de cielo despejado:
+
+* Irradiancia directa normal (DNI) de Meinel con corrección por altitud de Laue:
+  DNI = I0 · [(1 - a·h) · 0.7^(AM^0.678) + a·h], con a = 0.14, h en km, la masa de
+  aire AM de Kasten y Young, e I0 corregida por la distancia Tierra-Sol.
+* Difusa horizontal igual al 10 % de la directa horizontal, distribuida de forma
+  isótropa sobre el cielo, y reflejo del suelo con albedo constante.
+
+Uso:
+    python -m Interfaz.analisisEnergia --anio 2025 --paso 1
+    python -m Interfaz.analisisEnergia --anio 2025 --sitio guayaquil,-2.19616,-79.88621 --altitud 4 --limite 60
+"""
+
+import argparse
+import sys
+from datetime import date, timedelta
+import numpy as np
+from Interfaz.instrumentacion import medir
+from Interfaz.simulacionBloques import a_instante_utc, a_paso, simular_por_bloques
+
+# Constante solar (W/m²) del modelo de Meinel y coeficiente de altitud de Laue
+CONSTANTE_SOLAR = 1353.0
+COEFICIENTE_ALTITUD = 0.14
+
+# Fracción de la irradiancia directa horizontal que llega como difusa con cielo despejado
+FRACCION_DIFUSA = 0.1
+
+_NS_POR_DIA = 86_400 * 10 ** 9
+_NS_POR_HORA = 3_600 * 10 ** 9
+
+
+def irradiancia_cielo_despejado(elevations, tiempos, altitud: float = 0.0):
+    """
+    Calcula las componentes de la irradiancia con cielo despejado.
+
+    Args:
+        elevations (np.ndarray): Elevación del sol (en grados).
+        tiempos (np.ndarray): Instantes `datetime64` en UTC (para la distancia Tierra-Sol).
+        altitud (float): Altitud del sitio sobre el nivel del mar, en metros.
+
+    Returns:
+        tuple: Arreglos (dni, dhi) con la irradiancia directa normal y la difusa
+            horizontal, en W/m²; valen cero con el sol bajo el horizonte.
+    """
+    elevations = np.asarray(elevations, dtype=float)
+    de_dia = elevations > 0
+    sin_elevacion = np.sin(np.radians(elevations))
+
+    # Masa de aire de Kasten y Young (solo se evalúa con el sol sobre el horizonte)
+    elevacion_dia = np.where(de_dia, elevations, 90.0)
+    masa_aire = 1.0 / (np.sin(np.radians(elevacion_dia)) + 0.50572 * (elevacion_dia + 6.07995) ** -1.6364)
+
+    # Día del año para la excentricidad de la órbita
+    dias = (np.asarray(tiempos, dtype="datetime64[D]") - np.asarray(tiempos, dtype="datetime64[Y]")).astype(float)
+    extraterrestre = CONSTANTE_SOLAR * (1.0 + 0.033 * np.cos(2.0 * np.pi * dias / 365.0))
+
+    altura = COEFICIENTE_ALTITUD * altitud / 1000.0
+    dni = np.where(de_dia, extraterrestre * ((1.0 - altura) * 0.7 ** (masa_aire ** 0.678) + altura), 0.0)
+    dhi = FRACCION_DIFUSA * dni * np.maximum(sin_elevacion, 0.0)
+    return dni, dhi
+
+
+def vector_solar(azimuths, elevations):
+    """
+    Calcula el vector unitario hacia el sol (x: Este, y: Norte, z: cénit).
+
+    Args:
+        azimuths (array-like): Azimut del sol (en grados, desde el Norte hacia el Este).
+        elevations (array-like): Elevación del sol (en grados).
+
+    Returns:
+        tuple: Arreglos (sx, sy, sz).
+    """
+    az_rad = np.radians(azimuths)
+    el_rad = np.radians(elevations)
+    cos_el = np.cos(el_rad)
+    return cos_el * np.sin(az_rad), cos_el * np.cos(az_rad), np.sin(el_rad)
+
+
+def normal_seguidor(beta, alpha):
+    """
+    Calcula la normal del panel del seguidor a partir de pitch y roll.
+
+    Corresponde a girar la normal (0, 0, 1) con Rx(α)·Ry(β), la convención en la que
+    `calcular_pitch_roll` apunta el panel exactamente hacia el sol.
+
+    Args:
+        beta (array-like): Ángulo de pitch (en grados).
+        alpha (array-like): Ángulo de roll (en grados).
+
+    Returns:
+        tuple: Arreglos (nx, ny, nz) de la normal unitaria.
+    """
+    beta_rad = np.radians(beta)
+    alpha_rad = np.radians(alpha)
+    cos_beta = np.cos(beta_rad)
+    return np.sin(beta_rad), -np.sin(alpha_rad) * cos_beta, np.cos(alpha_rad) * cos_beta
+
+
+def normal_fija(inclinacion, azimut):
+    """
+    Calcula la normal de un panel fijo.
+
+    Args:
+        inclinacion (float): Inclinación respecto a la horizontal (en grados).
+        azimut (float): Hacia dónde mira el panel (en grados, desde el Norte hacia el Este).
+
+    Returns:
+        tuple: Componentes (nx, ny, nz) de la normal unitaria.
+    """
+    inclinacion_rad = np.radians(inclinacion)
+    azimut_rad = np.radians(azimut)
+    return (np.sin(inclinacion_rad) * np.sin(azimut_rad), np.sin(inclinacion_rad) * np.cos(azimut_rad),
+            np.cos(inclinacion_rad))
+
+
+def irradiancia_plano(sol, normal, dni, dhi, albedo: float = 0.2):
+    """
+    Calcula la irradiancia que recibe un panel (directa, difusa isótropa y reflejada).
+
+    Args:
+        sol (tuple): Vector hacia el sol (sx, sy, sz) de cada instante.
+        normal (tuple): Normal del panel (nx, ny, nz), por instante o constante.
+        dni (np.ndarray): Irradiancia directa normal (W/m²).
+        dhi (np.ndarray): Irradiancia difusa horizontal (W/m²).
+        albedo (float): Reflectividad del suelo.
+
+    Returns:
+        np.ndarray: Irradiancia en el plano del panel (W/m²).
+    """
+    # Coseno del ángulo de incidencia; la cara posterior no aporta directa
+    cos_incidencia = sol[0] * normal[0] + sol[1] * normal[1] + sol[2] * normal[2]
+    cos_inclinacion = normal[2]
+    ghi = dni * np.maximum(sol[2], 0.0) + dhi
+    return (dni * np.maximum(cos_incidencia, 0.0) + dhi * (1.0 + cos_inclinacion) / 2.0
+            + albedo * ghi * (1.0 - cos_inclinacion) / 2.0)
+
+
+def fijos_por_defecto(latitude):
+    """
+    Devuelve las referencias fijas habituales: panel horizontal y panel inclinado la latitud hacia el ecuador.
+
+    Args:
+        latitude (float): Latitud del sitio.
+
+    Returns:
+        dict: Nombre -> (inclinación, azimut) en grados.
+    """
+    return {"horizontal": (0.0, 0.0), "inclinado_latitud": (abs(latitude), 0.0 if latitude < 0 else 180.0)}
+
+
+def analizar_energia(inicio, fin, paso=timedelta(minutes=1), latitude: float = -0.2105367,
+                     longitude: float = -78.491614, altitud: float = 2850.0, fijos=None, limite_angulo=None,
+                     albedo: float = 0.2, backend="numpy", zona_horaria="America/Guayaquil"):
+    """
+    Compara la energía que recibe el seguidor de dos ejes con la de paneles fijos.
+
+    Cada muestra representa el intervalo [t, t + paso), de modo que `fin` no se incluye.
+    Los días se agrupan por medianoche solar (según la longitud), cuando el sol
+    está bajo el horizonte, sin depender de la zona horaria.
+
+    Args:
+        inicio: Instante inicial (ver `a_instante_utc`).
+        fin: Instante final (excluido).
+        paso (timedelta | float): Paso de tiempo (número = minutos).
+        latitude (float): Latitud geográfica. Por defecto es -0.2105367 (Quito).
+        longitude (float): Longitud geográfica. Por defecto es -78.491614 (Quito).
+        altitud (float): Altitud del sitio en metros. Por defecto es 2850 (Quito).
+        fijos (dict, opcional): Nombre -> (inclinación, azimut) de los paneles fijos de
+            referencia; por defecto, `fijos_por_defecto(latitude)`.
+        limite_angulo (float, opcional): Recorrido máximo del seguidor en pitch y roll (en
+            grados); los ángulos se recortan a ±`limite_angulo`.
+        albedo (float): Reflectividad del suelo.
+        backend (str | callable): Motor de posición solar (por defecto "numpy").
+        zona_horaria (str): Zona horaria IANA para interpretar los instantes locales.
+
+    Returns:
+        dict: `dias` (fechas `datetime64[D]`), `diaria` (nombre -> arreglo en kWh/m² por
+            día), `total` (nombre -> kWh/m²), `ganancia` (fijo -> energía del seguidor
+            dividida por la del fijo, menos 1) y `muestras`. El seguidor se llama "seguidor".
+    """
+    fijos = fijos_por_defecto(latitude) if fijos is None else fijos
+    paso = a_paso(paso)
+    inicio_utc = a_instante_utc(inicio, zona_horaria)
+    fin_utc = a_instante_utc(fin, zona_horaria)
+    if fin_utc <= inicio_utc:
+        raise ValueError("El final del análisis debe ser posterior al inicio.")
+    normales_fijas = {nombre: normal_fija(*orientacion) for nombre, orientacion in fijos.items()}
+
+    # Desfase de la hora solar media para agrupar por día solar
+    desfase_ns = int(round(longitude / 15.0 * _NS_POR_HORA))
+    primer_dia = (int(inicio_utc.astype(np.int64)) + desfase_ns) // _NS_POR_DIA
+    dias = (int((fin_utc - paso).astype(np.int64)) + desfase_ns) // _NS_POR_DIA - primer_dia + 1
+    diaria = {nombre: np.zeros(dias) for nombre in ("seguidor", *fijos)}
+    horas_paso = paso / np.timedelta64(1, "h")
+    muestras = 0
+
+    for times, azimuths, elevations, beta, alpha in simular_por_bloques(
+            inicio_utc, fin_utc - paso, paso, latitude, longitude, backend=backend):
+        with medir("analisisEnergia.bloque"):
+            dni, dhi = irradiancia_cielo_despejado(elevations, times, altitud)
+            sol = vector_solar(azimuths, elevations)
+            if limite_angulo is not None:
+                beta = np.clip(beta, -limite_angulo, limite_angulo)
+                alpha = np.clip(alpha, -limite_angulo, limite_angulo)
+
+            indice_dia = (times.astype(np.int64) + desfase_ns) // _NS_POR_DIA - primer_dia
+            planos = {"seguidor": irradiancia_plano(sol, normal_seguidor(beta, alpha), dni, dhi, albedo)}
+            planos.update({nombre: irradiancia_plano(sol, normal, dni, dhi, albedo)
+                           for nombre, normal in normales_fijas.items()})
+            for nombre, irradiancia in planos.items():
+                # W/m² · h -> kWh/m², acumulado por día
+                diaria[nombre] += np.bincount(indice_dia, weights=irradiancia, minlength=dias) * horas_paso / 1000.0
+            muestras += times.size
+
+    total = {nombre: float(valores.sum()) for nombre, valores in diaria.items()}
+    ganancia = {nombre: total["seguidor"] / total[nombre] - 1.0 if total[nombre] > 0 else float("inf")
+                for nombre in fijos}
+    return {
+        "dias": np.datetime64(primer_dia, "D") + np.arange(dias),
+        "diaria": diaria,
+        "total": total,
+        "ganancia": ganancia,
+        "muestras": muestras,
+    }
+
+
+def analizar_anio(anio: int, paso=timedelta(minutes=1), **opciones):
+    """
+    Ejecuta `analizar_energia` para un año calendario completo (en hora local).
+
+    Args:
+        anio (int): Año a analizar.
+        paso (timedelta | float): Paso de tiempo (número = minutos).
+        **opciones: Argumentos adicionales de `analizar_energia`.
+
+    Returns:
+        dict: Resultado de `analizar_energia`.
+    """
+    return analizar_energia(date(anio, 1, 1), date(anio + 1, 1, 1), paso, **opciones)
+
+
+def main(argv=None):
+    """Punto de entrada para comparar el seguidor con paneles fijos desde la línea de comandos."""
+    import time
+
+    def leer_fijo(texto):
+        nombre, inclinacion, azimut = (parte.strip() for parte in texto.split(","))
+        return nombre, (float(inclinacion), float(azimut))
+
+    parser = argparse.ArgumentParser(description="Energía anual del seguidor de dos ejes frente a paneles fijos.")
+    parser.add_argument("--anio", type=int, default=date.today().year, help="Año a analizar")
+    parser.add_argument("--sitio", default="quito,-0.2105367,-78.491614",
+                        help='Sitio "nombre,latitud,longitud[,zona_horaria]"')
+    parser.add_argument("--altitud", type=float, default=2850.0, help="Altitud del sitio en metros")
+    parser.add_argument("--paso", type=float, default=1, help="Paso de tiempo en minutos")
+    parser.add_argument("--fijo", action="append", type=leer_fijo, default=[],
+                        help='Panel fijo "nombre,inclinación,azimut" (se puede repetir)')
+    parser.add_argument("--limite", type=float, help="Recorrido máximo de pitch y roll en grados")
+    parser.add_argument("--albedo", type=float, default=0.2, help="Reflectividad del suelo")
+    args = parser.parse_args(argv)
+
+    partes = [parte.strip() for parte in args.sitio.split(",")]
+    nombre, latitud, longitud = partes[0], float(partes[1]), float(partes[2])
+    zona_horaria = partes[3] if len(partes) > 3 else "America/Guayaquil"
+
+    inicio = time.perf_counter()
+    resultado = analizar_anio(args.anio, args.paso, latitude=latitud, longitude=longitud, altitud=args.altitud,
+                              fijos=dict(args.fijo) or None, limite_angulo=args.limite, albedo=args.albedo,
+                              zona_horaria=zona_horaria)
+    duracion = time.perf_counter() - inicio
+
+    print(f"{nombre} {args.anio}: {resultado['muestras']} muestras en {duracion:.2f} s")
+    for panel, energia in resultado["total"].items():
+        ganancia = resultado["ganancia"].get(panel)
+        detalle = f"  (seguidor {ganancia * 100:+.1f} %)" if ganancia is not None else ""
+        print(f"{panel:<20} {energia:10.1f} kWh/m²  {energia / len(resultado['dias']):6.2f} kWh/m²/día{detalle}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,378 @@
+"""
+Módulo para barrer parámetros de simulación en un conjunto de procesos.
+
+`barrer_parametros` expande la rejilla de fechas, ventanas horarias, pasos y
+sitios, y simula cada caso con `getSolarPosition` en un `ProcessPoolExecutor`.
+Las columnas del resultado se reservan antes de empezar en memoria compartida
+(`multiprocessing.shared_memory`) y cada proceso escribe sus casos directamente
+en ellas: entre procesos solo viajan los parámetros de los casos, nunca los
+arreglos.
+
+El resultado es un `ResultadoBarrido` de N dimensiones (fecha, ventana, paso,
+sitio e instante) que se recorta por etiquetas con `sel` o por posiciones con
+`isel`. Como cada caso tiene un número distinto de instantes, el último eje se
+rellena con NaT y NaN a partir de `longitudes`; al elegir un solo caso se obtiene
+un `ResultadoSimulacion` con sus instantes válidos.
+
+Uso:
+    python -m Interfaz.barridoParametros --fecha 2025-03-20 --fecha 2025-06-21 \\
+        --ventana 6-18 --paso 1 --paso 10 --sitio quito,-0.2105367,-78.491614 --procesos 4
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing import shared_memory
+import os
+import sys
+import numpy as np
+from Interfaz.calculoAngulos import getSolarPosition, normalizar_parametros
+from Interfaz.resultadoSimulacion import COLUMNAS_RESULTADO, ResultadoSimulacion
+from Interfaz.simulacionFlota import cargar_sitios, normalizar_sitios
+
+# Ejes de parámetros del barrido, en orden
+EJES_BARRIDO = ("fecha", "ventana", "paso", "sitio")
+
+# Casos que simula cada tarea enviada a un proceso
+CASOS_POR_TAREA = 8
+
+# Columnas del barrido en memoria compartida de cada proceso trabajador, y sus bloques
+_ARREGLOS_TRABAJADOR = None
+_BLOQUES_TRABAJADOR = []
+
+
+def _normalizar_etiqueta(eje, valor):
+    """Convierte una etiqueta de un eje a la forma en que se guarda en el resultado."""
+    if eje == "fecha":
+        return normalizar_parametros(valor, 0, 0)[0]
+    if eje == "ventana":
+        if isinstance(valor, str):
+            valor = valor.split("-")
+        hora_inicio, hora_fin = (int(hora) for hora in valor)
+        if hora_fin <= hora_inicio:
+            raise ValueError("La hora de fin de cada ventana debe ser posterior a la de inicio.")
+        return hora_inicio, hora_fin
+    if eje == "paso":
+        if float(valor) <= 0:
+            raise ValueError("El paso de simulación debe ser positivo.")
+        return float(valor)
+    return valor["nombre"] if isinstance(valor, dict) else str(valor)
+
+
+def _instantes_maximos(ventanas, pasos):
+    """Cota del número de instantes de un caso (con una hora de margen por cambios de horario)."""
+    horas = max(hora_fin - hora_inicio for hora_inicio, hora_fin in ventanas) + 1
+    return int(horas * 60 // min(pasos)) + 1
+
+
+class ResultadoBarrido:
+    """
+    Resultado de un barrido de parámetros: columnas de N dimensiones con ejes etiquetados.
+
+    Cada columna tiene un eje por parámetro que no se ha fijado (ver `dims`) más el eje
+    de instantes, rellenado con NaT o NaN después de `longitudes` instantes.
+
+    Args:
+        ejes (dict): Eje -> lista de etiquetas, en el orden de las dimensiones.
+        columnas (tuple): Arreglos (times, azimuths, elevations, beta, alpha) de forma `shape`.
+        longitudes (np.ndarray): Instantes válidos de cada caso (forma `shape[:-1]`).
+        zonas_horarias (np.ndarray): Zona horaria de cada caso (la de su sitio).
+    """
+
+    __slots__ = COLUMNAS_RESULTADO + ("ejes", "longitudes", "zonas_horarias")
+
+    def __init__(self, ejes, columnas, longitudes, zonas_horarias):
+        self.ejes = dict(ejes)
+        self.times, self.azimuths, self.elevations, self.beta, self.alpha = columnas
+        self.longitudes = np.asarray(longitudes)
+        self.zonas_horarias = np.asarray(zonas_horarias)
+
+    def __repr__(self):
+        dimensiones = ", ".join(f"{eje}: {len(etiquetas)}" for eje, etiquetas in self.ejes.items())
+        return (f"ResultadoBarrido({dimensiones}, instante: {self.shape[-1]}; "
+                f"{self.nbytes / 1024 ** 2:.2f} MiB)")
+
+    def __len__(self):
+        return int(self.longitudes.size)
+
+    @property
+    def columnas(self):
+        """tuple: Las cinco columnas (times, azimuths, elevations, beta, alpha)."""
+        return self.times, self.azimuths, self.elevations, self.beta, self.alpha
+
+    @property
+    def dims(self):
+        """tuple: Nombres de las dimensiones de las columnas."""
+        return tuple(self.ejes) + ("instante",)
+
+    @property
+    def shape(self):
+        """tuple: Forma de las columnas."""
+        return self.azimuths.shape
+
+    @property
+    def nbytes(self):
+        """int: Memoria ocupada por las columnas, en bytes."""
+        return sum(columna.nbytes for columna in self.columnas) + self.longitudes.nbytes
+
+    def isel(self, **indices):
+        """
+        Recorta el resultado por posiciones en los ejes de parámetros.
+
+        Args:
+            **indices: Eje -> posición (el eje desaparece) o lista de posiciones.
+
+        Returns:
+            ResultadoBarrido | ResultadoSimulacion: Resultado recortado; si ya no quedan
+                ejes de parámetros, el `ResultadoSimulacion` del caso con sus instantes válidos.
+        """
+        desconocidos = set(indices) - set(self.ejes)
+        if desconocidos:
+            raise KeyError(f"Ejes desconocidos: {', '.join(sorted(desconocidos))}")
+
+        ejes = {}
+        seleccion = []
+        for eje, etiquetas in self.ejes.items():
+            indice = indices.get(eje, slice(None))
+            if isinstance(indice, slice):
+                ejes[eje] = etiquetas[indice]
+            elif np.ndim(indice) == 0:
+                indice = int(indice)
+                if not -len(etiquetas) <= indice < len(etiquetas):
+                    raise IndexError(f"Posición {indice} fuera del eje {eje}")
+            else:
+                indice = [int(posicion) for posicion in indice]
+                ejes[eje] = [etiquetas[posicion] for posicion in indice]
+            seleccion.append(indice)
+
+        # Aplicar los índices eje por eje para no mezclar listas como en el indexado avanzado de NumPy
+        def recortar(arreglo):
+            eje_actual = 0
+            for indice in seleccion:
+                if isinstance(indice, int):
+                    arreglo = np.take(arreglo, indice, axis=eje_actual)
+                    continue
+                if isinstance(indice, list):
+                    arreglo = np.take(arreglo, indice, axis=eje_actual)
+                elif indice != slice(None):
+                    arreglo = arreglo[(slice(None),) * eje_actual + (indice,)]
+                eje_actual += 1
+            return arreglo
+
+        columnas = tuple(recortar(columna) for columna in self.columnas)
+        longitudes = recortar(self.longitudes)
+        zonas_horarias = recortar(self.zonas_horarias)
+        if not ejes:
+            longitud = int(longitudes)
+            return ResultadoSimulacion(*(columna[:longitud] for columna in columnas), dtype=self.dtype,
+                                       zona_horaria=str(zonas_horarias))
+        return ResultadoBarrido(ejes, columnas, longitudes, zonas_horarias)
+
+    def sel(self, **etiquetas):
+        """
+        Recorta el resultado por etiquetas de los ejes de parámetros.
+
+        Una etiqueta sola fija el eje y lo quita del resultado; una lista de etiquetas lo
+        conserva con esas posiciones. Las fechas se aceptan como `date` o "YYYY-MM-DD",
+        las ventanas como `(hora_inicio, hora_fin)` o "6-18" y los sitios por su nombre.
+
+        Args:
+            **etiquetas: Eje -> etiqueta o lista de etiquetas.
+
+        Returns:
+            ResultadoBarrido | ResultadoSimulacion: Ver `isel`.
+
+        Ejemplo:
+            barrido.sel(paso=1, sitio="quito", fecha=["2025-03-20", "2025-06-21"])
+        """
+        indices = {}
+        for eje, valor in etiquetas.items():
+            if eje not in self.ejes:
+                raise KeyError(f"Eje desconocido: {eje}")
+            posiciones = {etiqueta: posicion for posicion, etiqueta in enumerate(self.ejes[eje])}
+
+            def buscar(etiqueta):
+                etiqueta = _normalizar_etiqueta(eje, etiqueta)
+                if etiqueta not in posiciones:
+                    raise KeyError(f"{etiqueta!r} no está en el eje {eje}")
+                return posiciones[etiqueta]
+
+            indices[eje] = [buscar(etiqueta) for etiqueta in valor] if isinstance(valor, list) else buscar(valor)
+        return self.isel(**indices)
+
+    def casos(self):
+        """
+        Recorre todos los casos del barrido.
+
+        Yields:
+            tuple: (etiquetas, resultado): diccionario eje -> etiqueta y `ResultadoSimulacion` del caso.
+        """
+        for posiciones in np.ndindex(self.longitudes.shape):
+            etiquetas = {eje: self.ejes[eje][posicion] for eje, posicion in zip(self.ejes, posiciones)}
+            yield etiquetas, self.isel(**dict(zip(self.ejes, posiciones)))
+
+    @property
+    def dtype(self):
+        """np.dtype: Precisión de los ángulos."""
+        return self.azimuths.dtype
+
+
+def _simular_casos(arreglos, casos, backend, dtype, solo_de_dia, elevacion_minima):
+    """
+    Simula varios casos y escribe cada uno en su fila de las columnas del barrido.
+
+    Args:
+        arreglos (dict): Columna -> arreglo (casos, instantes), más "longitudes" (casos,).
+        casos (list): Tuplas (fila, fecha, hora_inicio, hora_fin, paso, sitio).
+    """
+    for fila, fecha, hora_inicio, hora_fin, paso, sitio in casos:
+        resultado = getSolarPosition(fecha.isoformat(), hora_inicio, hora_fin, sitio["latitud"], sitio["longitud"],
+                                     step_minutes=paso, backend=backend, zona_horaria=sitio["zona_horaria"],
+                                     dtype=dtype, solo_de_dia=solo_de_dia, elevacion_minima=elevacion_minima)
+        longitud = resultado.muestras
+        if longitud > arreglos["times"].shape[1]:
+            raise RuntimeError("El caso tiene más instantes de los reservados para el barrido.")
+        for nombre, columna in zip(COLUMNAS_RESULTADO, resultado.columnas):
+            arreglos[nombre][fila, :longitud] = columna
+        arreglos["longitudes"][fila] = longitud
+
+
+def _iniciar_trabajador(descripcion):
+    """Inicializador de cada proceso: abre las columnas en memoria compartida una sola vez."""
+    global _ARREGLOS_TRABAJADOR
+    _ARREGLOS_TRABAJADOR = {}
+    for nombre, (memoria, forma, tipo) in descripcion.items():
+        # El bloque se mantiene abierto mientras viva el proceso (la vista no guarda una referencia a él)
+        bloque = shared_memory.SharedMemory(name=memoria)
+        _BLOQUES_TRABAJADOR.append(bloque)
+        _ARREGLOS_TRABAJADOR[nombre] = np.ndarray(forma, dtype=tipo, buffer=bloque.buf)
+
+
+def _simular_casos_trabajador(casos, *opciones):
+    """Tarea de cada proceso: escribe los casos en las columnas compartidas."""
+    _simular_casos(_ARREGLOS_TRABAJADOR, casos, *opciones)
+
+
+def barrer_parametros(fechas, ventanas=((6, 18),), pasos=(10,), sitios=(("quito", -0.2105367, -78.491614),),
+                      procesos=None, backend="numpy", dtype=np.float64, solo_de_dia=False, elevacion_minima=0.0,
+                      casos_por_tarea: int = CASOS_POR_TAREA):
+    """
+    Simula todas las combinaciones de fechas, ventanas horarias, pasos y sitios.
+
+    Args:
+        fechas (iterable): Fechas (`date` o "YYYY-MM-DD"), locales de cada sitio.
+        ventanas (iterable): Ventanas horarias `(hora_inicio, hora_fin)` en horas enteras.
+        pasos (iterable): Pasos de simulación en minutos.
+        sitios (iterable | str): Tabla de sitios (ver `normalizar_sitios`) o ruta a un CSV.
+        procesos (int, opcional): Número de procesos; por defecto, el número de núcleos.
+            Con 1 se simula en el proceso actual, sin memoria compartida.
+        backend (str): Motor de posición solar (debe poder enviarse a otro proceso).
+        dtype: Precisión de los ángulos, `np.float64` (por defecto) o `np.float32`.
+        solo_de_dia (bool): Si es True se omiten los instantes de noche (ver `getSolarPosition`).
+        elevacion_minima (float): Elevación mínima (en grados) con `solo_de_dia`.
+        casos_por_tarea (int): Casos que simula cada tarea enviada a un proceso.
+
+    Returns:
+        ResultadoBarrido: Columnas de forma (fechas, ventanas, pasos, sitios, instantes).
+    """
+    sitios = cargar_sitios(sitios) if isinstance(sitios, (str, os.PathLike)) else normalizar_sitios(sitios)
+    valores = dict(zip(EJES_BARRIDO, (
+        [_normalizar_etiqueta("fecha", fecha) for fecha in fechas],
+        [_normalizar_etiqueta("ventana", ventana) for ventana in ventanas],
+        [_normalizar_etiqueta("paso", paso) for paso in pasos],
+        sitios,
+    )))
+    for eje, etiquetas in valores.items():
+        if not etiquetas:
+            raise ValueError(f"El eje {eje} del barrido está vacío.")
+        if eje != "sitio" and len(set(etiquetas)) != len(etiquetas):
+            raise ValueError(f"Las etiquetas del eje {eje} deben ser únicas.")
+
+    forma_ejes = tuple(len(etiquetas) for etiquetas in valores.values())
+    total = int(np.prod(forma_ejes))
+    instantes = _instantes_maximos(valores["ventana"], valores["paso"])
+    casos = [(fila, fecha, *ventana, paso, sitio)
+             for fila, (fecha, ventana, paso, sitio) in enumerate(product(*valores.values()))]
+    opciones = (backend, dtype, solo_de_dia, elevacion_minima)
+    procesos = procesos or os.cpu_count() or 1
+
+    tipos = {"times": np.dtype("datetime64[ns]"), "longitudes": np.dtype(np.int64)}
+    formas = {"longitudes": (total,)}
+    bloques = []
+    try:
+        arreglos = {}
+        for nombre in COLUMNAS_RESULTADO + ("longitudes",):
+            tipo = tipos.get(nombre, np.dtype(dtype))
+            forma = formas.get(nombre, (total, instantes))
+            if procesos == 1:
+                arreglos[nombre] = np.empty(forma, dtype=tipo)
+            else:
+                bloque = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(forma)) * tipo.itemsize))
+                bloques.append(bloque)
+                arreglos[nombre] = np.ndarray(forma, dtype=tipo, buffer=bloque.buf)
+            # Relleno de los instantes que no usa cada caso
+            arreglos[nombre].fill(np.datetime64("NaT") if nombre == "times" else 0 if nombre == "longitudes" else np.nan)
+
+        tareas = [casos[desde:desde + casos_por_tarea] for desde in range(0, total, casos_por_tarea)]
+        if not bloques:
+            for tarea in tareas:
+                _simular_casos(arreglos, tarea, *opciones)
+        else:
+            descripcion = {nombre: (bloque.name, arreglo.shape, arreglo.dtype.str)
+                           for bloque, (nombre, arreglo) in zip(bloques, arreglos.items())}
+            with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                                     initargs=(descripcion,)) as ejecutor:
+                # Las tareas no devuelven nada: los resultados ya están en la memoria compartida
+                for futuro in [ejecutor.submit(_simular_casos_trabajador, tarea, *opciones) for tarea in tareas]:
+                    futuro.result()
+
+        # Copiar fuera de la memoria compartida, recortando el relleno sobrante
+        longitudes = arreglos["longitudes"].reshape(forma_ejes).copy()
+        usados = int(longitudes.max(initial=0))
+        columnas = tuple(arreglos[nombre][:, :usados].reshape(forma_ejes + (usados,)).copy()
+                         for nombre in COLUMNAS_RESULTADO)
+        del arreglos
+    finally:
+        for bloque in bloques:
+            bloque.close()
+            bloque.unlink()
+
+    zonas_horarias = np.broadcast_to(np.array([sitio["zona_horaria"] for sitio in sitios]), forma_ejes).copy()
+    ejes = {**valores, "sitio": [sitio["nombre"] for sitio in sitios]}
+    return ResultadoBarrido(ejes, columnas, longitudes, zonas_horarias)
+
+
+def main(argv=None):
+    """Punto de entrada para barrer parámetros desde la línea de comandos."""
+    import time
+
+    def leer_sitio(texto):
+        return dict(zip(("nombre", "latitud", "longitud", "zona_horaria"), (parte.strip() for parte in texto.split(","))))
+
+    parser = argparse.ArgumentParser(description="Barrido de fechas, ventanas, pasos y sitios del seguidor solar.")
+    parser.add_argument("--fecha", action="append", required=True, help="Fecha YYYY-MM-DD (se puede repetir)")
+    parser.add_argument("--ventana", action="append", help='Ventana horaria "6-18" (se puede repetir)')
+    parser.add_argument("--paso", action="append", type=float, help="Paso en minutos (se puede repetir)")
+    parser.add_argument("--sitio", action="append", type=leer_sitio,
+                        help='Sitio "nombre,latitud,longitud[,zona_horaria]" (se puede repetir)')
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos para repartir los casos")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    barrido = barrer_parametros(args.fecha, args.ventana or [(6, 18)], args.paso or [10],
+                                args.sitio or [("quito", -0.2105367, -78.491614)], procesos=args.procesos)
+    duracion = time.perf_counter() - inicio
+
+    print(f"{barrido} en {duracion:.2f} s")
+    print(f"{'fecha':<10} {'ventana':>7} {'paso':>6} {'sitio':<12} {'instantes':>9} {'pitch máx':>9} {'roll máx':>9}")
+    for etiquetas, resultado in barrido.casos():
+        hora_inicio, hora_fin = etiquetas["ventana"]
+        pitch = np.nanmax(np.abs(resultado.beta), initial=0.0)
+        roll = np.nanmax(np.abs(resultado.alpha), initial=0.0)
+        print(f"{etiquetas['fecha'].isoformat():<10} {f'{hora_inicio}-{hora_fin}':>7} {etiquetas['paso']:>6g} "
+              f"{etiquetas['sitio']:<12} {resultado.muestras:>9} {pitch:>9.2f} {roll:>9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Módulo con una caché de resultados de simulación con desalojo LRU.
+
+La interfaz vuelve a calcular la misma simulación en varios lugares (la
+animación y el reporte usan la misma fecha y horas). `CacheLRU` guarda los
+resultados recientes con un límite de entradas y/o de memoria, desalojando
+primero los menos usados, y lleva contadores de aciertos y fallos.
+`obtener_simulacion_cacheada` pone esa caché delante de `getSolarPosition`.
+"""
+
+from collections import OrderedDict
+from functools import wraps
+import sys
+import threading
+import numpy as np
+from Interfaz.calculoAngulos import getSolarPosition, normalizar_parametros
+
+
+def estimar_bytes(valor):
+    """
+    Estima la memoria ocupada por un resultado de simulación.
+
+    Args:
+        valor: Arreglo de NumPy, lista, tupla u objeto con `nbytes`.
+
+    Returns:
+        int: Tamaño aproximado en bytes.
+    """
+    if hasattr(valor, "nbytes"):
+        return int(valor.nbytes)
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(estimar_bytes(elemento) for elemento in valor)
+    return sys.getsizeof(valor)
+
+
+class CacheLRU:
+    """
+    Caché de resultados con desalojo del elemento usado menos recientemente.
+
+    Args:
+        max_entradas (int | None): Número máximo de resultados guardados.
+        max_bytes (int | None): Memoria máxima (estimada) de los resultados guardados.
+    """
+
+    def __init__(self, max_entradas=32, max_bytes=None):
+        if max_entradas is None and max_bytes is None:
+            raise ValueError("Se debe indicar max_entradas, max_bytes o ambos.")
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._datos = OrderedDict()
+        self._bloqueo = threading.Lock()
+        self.bytes_usados = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def __len__(self):
+        return len(self._datos)
+
+    def __contains__(self, clave):
+        return clave in self._datos
+
+    def obtener(self, clave):
+        """
+        Busca un resultado y lo marca como el usado más recientemente.
+
+        Args:
+            clave: Clave del resultado.
+
+        Returns:
+            tuple: (encontrado, valor); `valor` es None si no estaba en la caché.
+        """
+        with self._bloqueo:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                return True, self._datos[clave][0]
+            self.fallos += 1
+            return False, None
+
+    def guardar(self, clave, valor, tamano=None):
+        """
+        Guarda un resultado, desalojando los menos usados si se superan los límites.
+
+        Args:
+            clave: Clave del resultado.
+            valor: Resultado a guardar.
+            tamano (int, opcional): Tamaño en bytes; si no se indica se estima.
+        """
+        tamano = estimar_bytes(valor) if tamano is None else tamano
+        with self._bloqueo:
+            if clave in self._datos:
+                self.bytes_usados -= self._datos.pop(clave)[1]
+
+            # Un resultado más grande que el límite completo no se guarda
+            if self.max_bytes is not None and tamano > self.max_bytes:
+                return
+
+            self._datos[clave] = (valor, tamano)
+            self.bytes_usados += tamano
+            while ((self.max_entradas is not None and len(self._datos) > self.max_entradas)
+                   or (self.max_bytes is not None and self.bytes_usados > self.max_bytes)):
+                _, (_, tamano_desalojado) = self._datos.popitem(last=False)
+                self.bytes_usados -= tamano_desalojado
+                self.desalojos += 1
+
+    def limpiar(self):
+        """Vacía la caché y reinicia los contadores."""
+        with self._bloqueo:
+            self._datos.clear()
+            self.bytes_usados = 0
+            self.aciertos = self.fallos = self.desalojos = 0
+
+    def estadisticas(self):
+        """
+        Devuelve los contadores de uso de la caché.
+
+        Returns:
+            dict: Aciertos, fallos, desalojos, entradas y bytes usados.
+        """
+        with self._bloqueo:
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "entradas": len(self._datos),
+                "bytes": self.bytes_usados,
+            }
+
+
+def _copiar_resultado(resultado):
+    """Devuelve una copia superficial del resultado para que el llamador no altere la caché."""
+    if hasattr(resultado, "copia"):
+        return resultado.copia()
+    return tuple(columna.copy() if isinstance(columna, (list, np.ndarray)) else columna for columna in resultado)
+
+
+def memoizar(funcion, cache):
+    """
+    Envuelve una función de simulación para guardar sus resultados en una caché.
+
+    La clave se forma con los argumentos posicionales y nombrados, que deben ser
+    *hashables* (fechas, horas, coordenadas, pasos).
+
+    Args:
+        funcion (callable): Función que devuelve una tupla de columnas de resultados.
+        cache (CacheLRU): Caché donde guardar los resultados.
+
+    Returns:
+        callable: Función con la misma firma que consulta la caché antes de calcular.
+    """
+    @wraps(funcion)
+    def funcion_cacheada(*args, **kwargs):
+        clave = (funcion.__module__, funcion.__qualname__, args, tuple(sorted(kwargs.items())))
+        encontrado, resultado = cache.obtener(clave)
+        if not encontrado:
+            resultado = funcion(*args, **kwargs)
+            cache.guardar(clave, resultado)
+        return _copiar_resultado(resultado)
+
+    funcion_cacheada.cache = cache
+    return funcion_cacheada
+
+
+# Caché compartida por la interfaz para las simulaciones de getSolarPosition
+CACHE_SIMULACION = CacheLRU(max_entradas=32, max_bytes=256 * 1024 ** 2)
+
+
+def obtener_simulacion_cacheada(start_date, start_hour, end_hour, latitude: float = -0.2105367,
+                                longitude: float = -78.491614, step_minutes: float = 10,
+                                backend="pysolar", cache=None, zona_horaria="America/Guayaquil",
+                                solo_de_dia=False, elevacion_minima: float = 0.0):
+    """
+    Versión de `getSolarPosition` que reutiliza los resultados de escenarios ya calculados.
+
+    La clave de la caché usa la fecha y horas ya normalizadas, de modo que
+    "Fecha: 2025-01-27" y `date(2025, 1, 27)` corresponden al mismo escenario.
+
+    Args:
+        start_date (str | date): Fecha de la simulación.
+        start_hour (str | int): Hora de inicio.
+        end_hour (str | int): Hora de fin.
+        latitude (float): Latitud geográfica. Por defecto es -0.2105367 (Quito).
+        longitude (float): Longitud geográfica. Por defecto es -78.491614 (Quito).
+        step_minutes (float): Intervalo entre cálculos en minutos.
+        backend (str | callable): Motor de posición solar.
+        cache (CacheLRU, opcional): Caché a usar; por defecto `CACHE_SIMULACION`.
+        zona_horaria (str): Zona horaria IANA de la fecha y las horas.
+        solo_de_dia (bool): Omitir los instantes con el sol por debajo de `elevacion_minima`.
+        elevacion_minima (float): Elevación mínima (en grados) con `solo_de_dia`.
+
+    Returns:
+        ResultadoSimulacion: El mismo resultado que `getSolarPosition`.
+    """
+    cache = CACHE_SIMULACION if cache is None else cache
+    fecha, hora_inicio, hora_fin = normalizar_parametros(start_date, start_hour, end_hour)
+    clave = ("getSolarPosition", fecha, hora_inicio, hora_fin, float(latitude), float(longitude),
+             float(step_minutes), backend, zona_horaria, bool(solo_de_dia),
+             float(elevacion_minima) if solo_de_dia else None)
+
+    encontrado, resultado = cache.obtener(clave)
+    if not encontrado:
+        resultado = getSolarPosition(fecha, hora_inicio, hora_fin, latitude, longitude,
+                                     step_minutes=step_minutes, backend=backend, zona_horaria=zona_horaria,
+                                     solo_de_dia=solo_de_dia, elevacion_minima=elevacion_minima)
+        cache.guardar(clave, resultado)
+    return _copiar_resultado(resultado)
@@ -6,10 +6,13 @@ en función de la fecha, hora y ubicación geográfica. También incluye funcion
 para calcular la matriz de rotación en 3D para ajustar la orientación del panel solar.
 """
 
-from pysolar.solar import get_altitude, get_azimuth
 from datetime import datetime, timedelta
 import numpy as np
 import pytz
+from Interfaz.efemerides import obtener_backend
+from Interfaz.eventosSolares import mascara_diurna
+from Interfaz.instrumentacion import contar, instrumentar, medir
+from Interfaz.resultadoSimulacion import ResultadoSimulacion
 
 
 def Rxyz(alpha, beta, gamma):
@@ -54,36 +57,106 @@ def Rxyz(alpha, beta, gamma):
     return R
 
 
-def getSolarPosition(start_date: str, start_hour: str, end_hour: str, latitude: float = -0.2105367, longitude: float = -78.491614):
+def Rxyz_lote(alpha, beta, gamma):
     """
-    Calcula la posición del sol (azimut, elevación) durante un intervalo de tiempo.
+    Calcula una pila de matrices de rotación Rxyz(α, β, γ) para arreglos de ángulos.
+
+    Es la versión vectorizada de `Rxyz`: los ángulos se combinan con las reglas de
+    *broadcasting* de NumPy y cada matriz se arma directamente con el producto
+    expandido Rz(γ) * Ry(β) * Rx(α).
 
     Args:
-        start_date (str): Fecha de inicio en formato "YYYY-MM-DD".
-        start_hour (str): Hora de inicio en formato "HH:MM".
-        end_hour (str): Hora de fin en formato "HH:MM".
-        latitude (float): Latitud geográfica de la ubicación. Por defecto es -0.2105367 (Quito).
-        longitude (float): Longitud geográfica de la ubicación. Por defecto es -78.491614 (Quito).
+        alpha (array-like): Ángulos de rotación alrededor del eje X (en grados).
+        beta (array-like): Ángulos de rotación alrededor del eje Y (en grados).
+        gamma (array-like): Ángulos de rotación alrededor del eje Z (en grados).
 
     Returns:
-        tuple: Tupla que contiene las listas de:
-            - times (list): Lista de tiempos de simulación.
-            - azimuths (list): Lista de valores de azimut.
-            - elevations (list): Lista de valores de elevación.
-            - beta (list): Lista de valores de ángulo β.
-            - alpha (list): Lista de valores de ángulo α.
+        np.array: Arreglo de forma (N, 3, 3) con una matriz de rotación por cada terna de ángulos.
     """
-    # Listas para almacenar los resultados
-    times = []
-    azimuths = []
-    elevations = []
-    beta = []
-    alpha = []
+    alpha_rad, beta_rad, gamma_rad = np.broadcast_arrays(
+        np.radians(np.atleast_1d(np.asarray(alpha, dtype=float))),
+        np.radians(np.asarray(beta, dtype=float)),
+        np.radians(np.asarray(gamma, dtype=float))
+    )
+    ca, sa = np.cos(alpha_rad), np.sin(alpha_rad)
+    cb, sb = np.cos(beta_rad), np.sin(beta_rad)
+    cg, sg = np.cos(gamma_rad), np.sin(gamma_rad)
+
+    R = np.empty(alpha_rad.shape + (3, 3))
+    R[..., 0, 0] = cg * cb
+    R[..., 0, 1] = cg * sb * sa - sg * ca
+    R[..., 0, 2] = cg * sb * ca + sg * sa
+    R[..., 1, 0] = sg * cb
+    R[..., 1, 1] = sg * sb * sa + cg * ca
+    R[..., 1, 2] = sg * sb * ca - cg * sa
+    R[..., 2, 0] = -sb
+    R[..., 2, 1] = cb * sa
+    R[..., 2, 2] = cb * ca
+    return R
 
-    # Intervalo de tiempo de 10 minutos
-    time_interval = timedelta(minutes=10)
 
-    # LIMPIAR Y CONVERTIR LOS DATOS RECIBIDOS
+def rotar_vertices(vertices, alpha, beta, gamma=0):
+    """
+    Rota los vértices de un cuerpo para todos los fotogramas de una trayectoria a la vez.
+
+    Args:
+        vertices (array-like): Vértices originales de forma (V, 3).
+        alpha (array-like): Ángulos de roll, rotación alrededor del eje X (en grados).
+        beta (array-like): Ángulos de pitch, rotación alrededor del eje Y (en grados).
+        gamma (array-like): Ángulos de yaw, rotación alrededor del eje Z (en grados).
+
+    Returns:
+        np.array: Arreglo de forma (N, V, 3) con los vértices rotados de cada fotograma.
+    """
+    R = Rxyz_lote(alpha, beta, gamma)
+    return np.einsum("nij,vj->nvi", R, np.asarray(vertices, dtype=float))
+
+
+def calcular_pitch_roll(azimuths, elevations):
+    """
+    Calcula en lote los ángulos de control β (pitch) y α (roll) del panel solar.
+
+    Es la forma cerrada de resolver β y α con `arcsin`, construir `Rxyz(α, β, 0)`
+    y volver a extraer los ángulos con `arctan2`: con γ = 0 esa ida y vuelta se
+    reduce a β = arcsin(sx) y α = arcsin(-sy / cos β), donde (sx, sy, sz) es el
+    vector unitario hacia el sol. Se evalúa con `arctan2` para que sea estable
+    cuando el cociente roza ±1.
+
+    Args:
+        azimuths (array-like): Ángulos de azimut del sol (en grados).
+        elevations (array-like): Ángulos de elevación del sol (en grados).
+
+    Returns:
+        tuple: Arreglos (beta, alpha) con los ángulos de pitch y roll (en grados).
+    """
+    az_rad = np.radians(np.asarray(azimuths, dtype=float))
+    el_rad = np.radians(np.asarray(elevations, dtype=float))
+
+    # Componentes del vector unitario hacia el sol (x: Este, y: Norte, z: cénit)
+    sx = np.cos(el_rad) * np.sin(az_rad)
+    sy = np.cos(el_rad) * np.cos(az_rad)
+    sz = np.sin(el_rad)
+
+    beta = np.degrees(np.arctan2(sx, np.hypot(sy, sz)))
+    alpha = np.degrees(np.arctan2(-sy, np.abs(sz)))
+    return beta, alpha
+
+
+def normalizar_parametros(start_date, start_hour, end_hour):
+    """
+    Limpia y convierte la fecha y las horas recibidas desde la interfaz.
+
+    Acepta tanto los textos de las etiquetas de la interfaz ("Fecha: 2025-01-27",
+    "Hora de inicio: 06:00") como valores ya convertidos (fechas y enteros).
+
+    Args:
+        start_date (str | date): Fecha de la simulación.
+        start_hour (str | int): Hora de inicio.
+        end_hour (str | int): Hora de fin.
+
+    Returns:
+        tuple: (fecha, hora_inicio, hora_fin) como `date`, `int` e `int`.
+    """
     start_date = str(start_date).replace("Fecha: ", "").strip()
     start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
 
@@ -95,71 +168,79 @@ def getSolarPosition(start_date: str, start_hour: str, end_hour: str, latitude:
         end_hour = end_hour.replace("Hora de fin: ", "").strip().split(":")[0]
     end_hour = int(end_hour)  # Convertir a entero si aún no lo es
 
-    # Definir la zona horaria de Quito (UTC-5)
-    timezone = pytz.timezone("America/Guayaquil")
-
-    # Combinar correctamente la fecha con la hora de inicio y fin
-    start_time = datetime.combine(start_date, datetime.min.time()).replace(hour=start_hour, minute=0, second=0, microsecond=0)
-    start_time = timezone.localize(start_time)  # Convertir a timezone-aware
-
-    end_time = datetime.combine(start_date, datetime.min.time()).replace(hour=end_hour, minute=0, second=0, microsecond=0)
-    end_time = timezone.localize(end_time)  # Convertir a timezone-aware
+    return start_date, start_hour, end_hour
 
-    # Inicializar el tiempo actual en el tiempo de inicio
-    current_time = start_time
 
-    # Bucle para iterar sobre el intervalo de tiempo
-    while current_time <= end_time:
-        # Asegurarse de que current_time tiene la zona horaria
-        current_time = timezone.localize(current_time) if current_time.tzinfo is None else current_time
+@instrumentar("getSolarPosition")
+def getSolarPosition(start_date: str, start_hour: str, end_hour: str, latitude: float = -0.2105367, longitude: float = -78.491614,
+                     step_minutes: float = 10, backend="pysolar", zona_horaria="America/Guayaquil",
+                     dtype=np.float64, solo_de_dia=False, elevacion_minima=0.0):
+    """
+    Calcula la posición del sol (azimut, elevación) durante un intervalo de tiempo.
 
-        # Obtener el azimut y la elevación del sol
-        az = get_azimuth(latitude, longitude, current_time)
-        el = get_altitude(latitude, longitude, current_time)
+    El eje de tiempo es un arreglo `datetime64[ns]` en UTC: solo se localizan en la
+    zona horaria los instantes de inicio y fin, y el resto se obtiene sumando el paso.
+    Para mostrarlo en hora local se usa `Interfaz.zonaHoraria.a_hora_local`.
 
-        # Convertir azimut y elevación a radianes
-        az_rad = np.radians(az)
-        el_rad = np.radians(el)
+    Args:
+        start_date (str): Fecha de inicio en formato "YYYY-MM-DD".
+        start_hour (str): Hora de inicio en formato "HH:MM".
+        end_hour (str): Hora de fin en formato "HH:MM".
+        latitude (float): Latitud geográfica de la ubicación. Por defecto es -0.2105367 (Quito).
+        longitude (float): Longitud geográfica de la ubicación. Por defecto es -78.491614 (Quito).
+        step_minutes (float): Intervalo entre cálculos en minutos. Por defecto es 10.
+        backend (str | callable): Motor de posición solar: "pysolar" (por defecto), "numpy"
+            (vectorizado) o una función `(tiempos, latitud, longitud) -> (azimut, elevación)`.
+        zona_horaria (str): Zona horaria IANA en la que se interpretan la fecha y las horas.
+            Por defecto es "America/Guayaquil" (Quito).
+        dtype: Precisión de los ángulos del resultado, `np.float64` (por defecto) o `np.float32`.
+        solo_de_dia (bool): Si es True se omiten los instantes con el sol por debajo de
+            `elevacion_minima`, sin calcular sus efemérides (ver `Interfaz.eventosSolares`).
+        elevacion_minima (float): Elevación mínima (en grados) con `solo_de_dia`. Por defecto es 0.
 
-        # Ángulo de rotación alrededor del eje Z
-        gamma = 0
-        
-        # Calcular los ángulos β y α para la orientación del panel solar
-        val = np.cos(el_rad) * np.sin(az_rad)
-        beta_rad_temp = np.arcsin(val)
-        beta_deg_temp = np.degrees(beta_rad_temp)
+    Returns:
+        ResultadoSimulacion: Resultado que se desempaqueta como la tupla de arreglos:
+            - times (np.ndarray): Instantes de simulación (`datetime64[ns]` en UTC).
+            - azimuths (np.ndarray): Valores de azimut.
+            - elevations (np.ndarray): Valores de elevación.
+            - beta (np.ndarray): Valores de ángulo β.
+            - alpha (np.ndarray): Valores de ángulo α.
+    """
+    # Intervalo de tiempo entre cálculos (10 minutos por defecto)
+    time_interval = np.timedelta64(round(step_minutes * 60 * 10 ** 9), "ns")
+    if time_interval <= np.timedelta64(0, "ns"):
+        raise ValueError("El intervalo entre cálculos debe ser positivo.")
 
-        val_fi1 = -(np.cos(el_rad) * np.cos(az_rad)) / np.cos(beta_rad_temp)
-        alpha_rad_temp = np.arcsin(val_fi1)
-        alpha_deg_temp = np.degrees(alpha_rad_temp)
+    # LIMPIAR Y CONVERTIR LOS DATOS RECIBIDOS
+    start_date, start_hour, end_hour = normalizar_parametros(start_date, start_hour, end_hour)
 
-        # Obtener la matriz de rotación
-        R = Rxyz(alpha_deg_temp, beta_deg_temp, gamma)
+    timezone = pytz.timezone(zona_horaria)
 
-        # Extraer los ángulos de la matriz de rotación
-        R31 = R[2, 0]
-        R11 = R[0, 0]
-        R21 = R[1, 0]
-        R32 = R[2, 1]
-        R33 = R[2, 2]
+    with medir("getSolarPosition.eje_tiempo"):
+        # Solo el inicio y el fin se localizan en la zona horaria y se pasan a UTC
+        limites = []
+        for hora in (start_hour, end_hour):
+            instante = timezone.localize(datetime.combine(start_date, datetime.min.time()) + timedelta(hours=hora))
+            limites.append(np.datetime64(instante.astimezone(pytz.utc).replace(tzinfo=None), "ns"))
+        start_time, end_time = limites
 
-        # Calcular los ángulos finales β y α
-        beta_rad = np.arctan2(-R31, np.sqrt(R11**2 + R21**2))
-        beta_deg = np.degrees(beta_rad)
+        # Eje de tiempo completo en UTC, con el fin incluido si cae en la malla
+        times = np.arange(start_time, end_time + np.timedelta64(1, "ns"), time_interval)
 
-        alpha_rad = np.arctan2(R32, R33)
-        alpha_deg = np.degrees(alpha_rad)
+    if solo_de_dia:
+        # Quitar los instantes de noche (el pitch y el roll no tienen sentido con el sol bajo el horizonte)
+        with medir("getSolarPosition.recorte_dia"):
+            times = times[mascara_diurna(times, latitude, longitude, elevacion_minima)]
+    contar("getSolarPosition.muestras", times.size)
 
-        # Guardar los resultados
-        times.append(current_time)
-        azimuths.append(az)
-        elevations.append(el)
-        beta.append(beta_deg)
-        alpha.append(alpha_deg)
+    # Obtener el azimut y la elevación del sol para todos los instantes a la vez
+    with medir("getSolarPosition.efemerides"):
+        calcular_posicion = obtener_backend(backend)
+        azimuths, elevations = calcular_posicion(times, latitude, longitude)
 
-        # Avanzar al siguiente intervalo de tiempo
-        current_time += time_interval
+    # Calcular los ángulos β (pitch) y α (roll) de todo el intervalo en un solo paso
+    with medir("getSolarPosition.angulos"):
+        beta, alpha = calcular_pitch_roll(azimuths, elevations)
 
     # Devolver los resultados calculados
-    return times, azimuths, elevations, beta, alpha
-
+    return ResultadoSimulacion(times, azimuths, elevations, beta, alpha, dtype=dtype, zona_horaria=zona_horaria)
@@ -0,0 +1,368 @@
+"""
+Módulo con los motores de cálculo de la posición solar (efemérides).
+
+Incluye dos motores intercambiables que reciben un arreglo completo de instantes
+y devuelven los arreglos de azimut y elevación:
+
+* `pysolar`: llama a `pysolar.get_azimuth` y `get_altitude` una vez por instante.
+* `numpy`: implementa de forma vectorizada el mismo algoritmo de `pysolar`
+  (SPA de Reda y Andreas) usando sus mismas tablas de coeficientes, de modo que
+  los resultados coinciden con los de `pysolar` hasta el redondeo numérico.
+
+El motor se selecciona por nombre con `obtener_backend`, que es lo que utiliza
+`getSolarPosition` a través de su parámetro `backend`.
+"""
+
+from datetime import timezone
+import numpy as np
+from pysolar import constants, solartime
+from pysolar.solar import get_altitude, get_azimuth
+
+# Número de instantes que se procesan a la vez en las sumas de series periódicas
+TAMANO_BLOQUE = 16384
+
+# Separación (en días) de los nodos donde se evalúan los términos que varían lentamente
+PASO_NODOS_DIAS = 1 / 24
+
+# Constantes de tiempo usadas por pysolar para obtener el día juliano
+_DESFASE_DIA_JULIANO = solartime.gregorian_day_offset + solartime.julian_day_offset
+_SEGUNDOS_POR_DIA = constants.seconds_per_day
+
+
+def _tabla_series(coeficientes):
+    """
+    Convierte una serie periódica de pysolar (L, B o R) en arreglos de NumPy.
+
+    Args:
+        coeficientes (list): Lista de grupos de términos (A, B, C) de la serie.
+
+    Returns:
+        list: Lista de tuplas (A, B, C) con un arreglo por cada grupo de la serie.
+    """
+    return [tuple(np.array(columna, dtype=float) for columna in zip(*grupo)) for grupo in coeficientes]
+
+
+_SERIE_LONGITUD = _tabla_series(constants.heliocentric_longitude_coeffs)
+_SERIE_LATITUD = _tabla_series(constants.heliocentric_latitude_coeffs)
+_SERIE_DISTANCIA = _tabla_series(constants.sun_earth_distance_coeffs)
+
+# Coeficientes de nutación en el mismo orden que usa pysolar
+_TERMINOS_NUTACION = np.array(constants.aberration_sin_terms, dtype=float)
+_COEFICIENTES_NUTACION = np.array(constants.nutation_coefficients, dtype=float)
+_ARGUMENTOS_NUTACION = np.array([
+    (297.85036, 445267.111480, -0.0019142, 189474.0),   # Elongación media de la Luna
+    (357.52772, 35999.050340, -0.0001603, -300000.0),   # Anomalía media del Sol
+    (134.96298, 477198.867398, 0.0086972, 56250.0),     # Anomalía media de la Luna
+    (93.27191, 483202.017538, -0.0036825, 327270.0),    # Argumento de latitud de la Luna
+    (125.04452, -1934.136261, 0.0020708, 450000.0),     # Longitud del nodo ascendente
+])
+
+# Segundos intercalares acumulados al inicio de cada año de la tabla de pysolar
+_AJUSTES_INTERCALARES = np.array(solartime.leap_seconds_adjustments)
+_INTERCALARES_INICIO_ANIO = 10 + np.concatenate(([0], np.cumsum(_AJUSTES_INTERCALARES.sum(axis=1))))
+
+# Tabla de delta T (TT - UT1) por año y mes, rellenada hasta 12 meses por fila
+_DELTA_T = np.full((len(solartime.delta_t), 12), np.nan)
+for _fila, _valores in enumerate(solartime.delta_t):
+    _DELTA_T[_fila, :len(_valores)] = _valores
+_MESES_ULTIMO_ANIO = len(solartime.delta_t[-1])
+
+
+def a_datetime64_utc(tiempos):
+    """
+    Convierte una secuencia de instantes a un arreglo `datetime64[ns]` en UTC.
+
+    Args:
+        tiempos (array-like): Arreglo `datetime64` (se asume en UTC) o secuencia
+            de objetos `datetime` con zona horaria.
+
+    Returns:
+        np.ndarray: Arreglo de tipo `datetime64[ns]` expresado en UTC.
+    """
+    if isinstance(tiempos, np.ndarray) and np.issubdtype(tiempos.dtype, np.datetime64):
+        return tiempos.astype("datetime64[ns]")
+    if len(tiempos) and isinstance(tiempos[0], np.datetime64):
+        return np.array(tiempos, dtype="datetime64[ns]")
+
+    segundos = []
+    for tiempo in tiempos:
+        if tiempo.tzinfo is None:
+            raise ValueError(f"El instante {tiempo} debe tener zona horaria.")
+        segundos.append(tiempo.astimezone(timezone.utc).replace(tzinfo=None))
+    return np.array(segundos, dtype="datetime64[ns]")
+
+
+def _suma_serie(serie, jme):
+    """
+    Evalúa una serie periódica de VSOP87 para un arreglo de milenios julianos.
+
+    Args:
+        serie (list): Serie convertida con `_tabla_series`.
+        jme (np.ndarray): Milenios julianos de efemérides.
+
+    Returns:
+        np.ndarray: Valor de la serie para cada instante.
+    """
+    resultado = np.zeros_like(jme)
+    potencia = np.ones_like(jme)
+    for amplitud, fase, frecuencia in serie:
+        resultado += potencia * np.sum(amplitud[:, None] * np.cos(fase[:, None] + frecuencia[:, None] * jme), axis=0)
+        potencia = potencia * jme
+    return resultado
+
+
+def _dias_julianos(tiempos_utc):
+    """
+    Calcula el día juliano solar (UT) y de efemérides (TT) igual que `pysolar`.
+
+    Args:
+        tiempos_utc (np.ndarray): Arreglo `datetime64[ns]` en UTC.
+
+    Returns:
+        tuple: Arreglos (jd, jde).
+    """
+    anios = tiempos_utc.astype("datetime64[Y]").astype(np.int64) + 1970
+    meses = tiempos_utc.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    segundos = tiempos_utc.astype(np.int64) / 1e9
+
+    # Segundos intercalares (TAI - UTC)
+    indice_anio = np.clip(anios - solartime.leap_seconds_base_year, 0, len(_AJUSTES_INTERCALARES))
+    intercalares = _INTERCALARES_INICIO_ANIO[indice_anio]
+    dentro_tabla = (anios >= solartime.leap_seconds_base_year) & (indice_anio < len(_AJUSTES_INTERCALARES))
+    primer_semestre = _AJUSTES_INTERCALARES[np.minimum(indice_anio, len(_AJUSTES_INTERCALARES) - 1), 0]
+    intercalares = intercalares + np.where(dentro_tabla & (meses > 6), primer_semestre, 0)
+
+    # Delta T tomado de la tabla mensual, con las mismas reglas de borde que pysolar
+    anio_base = solartime.delta_t_base_year
+    ultimo_anio = anio_base + len(solartime.delta_t) - 1
+    mes_tabla = np.where(anios < anio_base, 1, meses)
+    mes_tabla = np.where(anios == anio_base, np.maximum(0, meses - solartime.delta_t_base_month) + 1, mes_tabla)
+    anio_tabla = np.clip(anios, anio_base, ultimo_anio)
+    mes_tabla = np.where(anio_tabla == ultimo_anio, np.minimum(mes_tabla, _MESES_ULTIMO_ANIO), mes_tabla)
+    delta_t = _DELTA_T[anio_tabla - anio_base, mes_tabla - 1]
+
+    jde = (segundos + intercalares + solartime.tt_offset) / _SEGUNDOS_POR_DIA + _DESFASE_DIA_JULIANO
+    jd = (segundos + intercalares + solartime.tt_offset - delta_t) / _SEGUNDOS_POR_DIA + _DESFASE_DIA_JULIANO
+    return jd, jde
+
+
+def _terminos_lentos(jce):
+    """
+    Evalúa los términos de la posición del sol que dependen solo del tiempo de efemérides.
+
+    Args:
+        jce (np.ndarray): Siglos julianos de efemérides.
+
+    Returns:
+        np.ndarray: Arreglo (5, N) con la longitud heliocéntrica sin reducir a 360°,
+            la latitud geocéntrica, la distancia sol-tierra y la nutación en
+            longitud y oblicuidad.
+    """
+    jme = jce / 10.0
+    longitud_helio = np.degrees(_suma_serie(_SERIE_LONGITUD, jme) / 1e8)
+    latitud_geo = -np.degrees(_suma_serie(_SERIE_LATITUD, jme) / 1e8)
+    distancia = _suma_serie(_SERIE_DISTANCIA, jme) / 1e8
+
+    # Nutación en longitud y oblicuidad
+    a, b, c, d = _ARGUMENTOS_NUTACION.T
+    argumentos = a[:, None] + b[:, None] * jce + c[:, None] * jce ** 2 + jce ** 3 / d[:, None]
+    sigma = np.radians(np.sum(_TERMINOS_NUTACION[:, :, None] * argumentos[None, :, :], axis=1))
+    coef = _COEFICIENTES_NUTACION
+    nutacion_longitud = np.sum((coef[:, 0, None] + coef[:, 1, None] * jce) * np.sin(sigma), axis=0) / 36000000.0
+    nutacion_oblicuidad = np.sum((coef[:, 2, None] + coef[:, 3, None] * jce) * np.cos(sigma), axis=0) / 36000000.0
+
+    return np.array([longitud_helio, latitud_geo, distancia, nutacion_longitud, nutacion_oblicuidad])
+
+
+def _terminos_lentos_interpolados(jce):
+    """
+    Obtiene los términos lentos evaluándolos en una malla fija de nodos e interpolando.
+
+    Las series VSOP87 y de nutación varían en escalas de días o más, por lo que
+    interpolar linealmente entre nodos separados `PASO_NODOS_DIAS` introduce un
+    error por debajo del propio redondeo de `pysolar` (del orden de 1e-7°). La
+    malla está anclada en J2000, así que el valor obtenido para un instante no
+    depende de con qué otros instantes se calcule.
+
+    Args:
+        jce (np.ndarray): Siglos julianos de efemérides.
+
+    Returns:
+        np.ndarray: Arreglo (5, N) con los mismos términos que `_terminos_lentos`.
+    """
+    paso = PASO_NODOS_DIAS / 36525.0
+    posicion = jce / paso
+    indice = np.floor(posicion)
+    fraccion = posicion - indice
+
+    # Evaluar solo los nodos que encierran a algún instante
+    if indice.size and indice.max() - indice.min() + 2 <= 2 * indice.size:
+        primero = indice.min()
+        nodos = np.arange(primero, indice.max() + 2)
+        izquierda = (indice - primero).astype(np.int64)
+        derecha = izquierda + 1
+    else:
+        nodos, inversa = np.unique(np.concatenate([indice, indice + 1]), return_inverse=True)
+        izquierda, derecha = inversa[:indice.size], inversa[indice.size:]
+
+    valores = _terminos_lentos(nodos * paso)
+    return valores[:, izquierda] + fraccion * (valores[:, derecha] - valores[:, izquierda])
+
+
+def _posicion_bloque(tiempos_utc, latitud, longitud):
+    """
+    Calcula azimut y elevación geométrica para un bloque de instantes con el algoritmo de `pysolar`.
+
+    Args:
+        tiempos_utc (np.ndarray): Arreglo `datetime64[ns]` en UTC.
+        latitud (float): Latitud geográfica en grados.
+        longitud (float): Longitud geográfica en grados.
+
+    Returns:
+        tuple: Arreglos (azimut, elevación) en grados.
+    """
+    jd, jde = _dias_julianos(tiempos_utc)
+    jce = (jde - 2451545.0) / 36525.0
+    jme = jce / 10.0
+
+    # Posición geocéntrica del sol
+    longitud_helio, latitud_geo, distancia, nutacion_longitud, nutacion_oblicuidad = _terminos_lentos_interpolados(jce)
+    longitud_geo = (longitud_helio % 360 + 180) % 360
+    aberracion = -20.4898 / (3600.0 * distancia)
+    paralaje_horizontal = 8.794 / (3600 / distancia)
+
+    u = jme / 10.0
+    oblicuidad_media = (84381.448 - 4680.93 * u - 1.55 * u ** 2 + 1999.25 * u ** 3
+                        - 51.38 * u ** 4 - 249.67 * u ** 5 - 39.05 * u ** 6 + 7.12 * u ** 7
+                        + 27.87 * u ** 8 + 5.79 * u ** 9 + 2.45 * u ** 10)
+    oblicuidad = oblicuidad_media / 3600.0 + nutacion_oblicuidad
+
+    # Tiempo sidéreo aparente (pysolar aplica el coseno a la oblicuidad en grados; se replica tal cual)
+    jc = (jd - 2451545.0) / 36525.0
+    sidereo_medio = (280.46061837 + 360.98564736629 * (jd - 2451545.0)
+                     + 0.000387933 * jc * jc * (1 - jc / 38710000)) % 360
+    sidereo_aparente = sidereo_medio + nutacion_longitud * np.cos(oblicuidad)
+
+    # Coordenadas ecuatoriales geocéntricas
+    longitud_aparente = np.radians(longitud_geo + nutacion_longitud + aberracion)
+    oblicuidad_rad = np.radians(oblicuidad)
+    latitud_geo_rad = np.radians(latitud_geo)
+    ascension = np.degrees(np.arctan2(
+        np.sin(longitud_aparente) * np.cos(oblicuidad_rad) - np.tan(latitud_geo_rad) * np.sin(oblicuidad_rad),
+        np.cos(longitud_aparente))) % 360
+    declinacion = np.arcsin(np.sin(latitud_geo_rad) * np.cos(oblicuidad_rad)
+                            + np.cos(latitud_geo_rad) * np.sin(oblicuidad_rad) * np.sin(longitud_aparente))
+    angulo_horario = np.radians((sidereo_aparente + longitud - ascension) % 360)
+
+    # Corrección por paralaje para obtener coordenadas topocéntricas
+    latitud_rad = np.radians(latitud)
+    latitud_aplanada = np.arctan(0.99664719 * np.tan(latitud_rad))
+    distancia_radial = np.cos(latitud_aplanada)
+    distancia_axial = 0.99664719 * np.sin(latitud_aplanada)
+    sen_paralaje = np.sin(np.radians(paralaje_horizontal))
+    paralaje_ascension = np.arctan2(-distancia_radial * sen_paralaje * np.sin(angulo_horario),
+                                    np.cos(declinacion) - distancia_radial * sen_paralaje * np.cos(angulo_horario))
+    angulo_horario_topo = angulo_horario - paralaje_ascension
+    declinacion_topo = np.arctan2((np.sin(declinacion) - distancia_axial * sen_paralaje) * np.cos(paralaje_ascension),
+                                  np.cos(declinacion) - distancia_axial * sen_paralaje * np.cos(angulo_horario))
+
+    # Elevación geométrica (sin refracción)
+    elevacion = np.degrees(np.arcsin(np.sin(latitud_rad) * np.sin(declinacion_topo)
+                                     + np.cos(latitud_rad) * np.cos(declinacion_topo) * np.cos(angulo_horario_topo)))
+
+    azimut = (180.0 + np.degrees(np.arctan2(
+        np.sin(angulo_horario_topo),
+        np.cos(angulo_horario_topo) * np.sin(latitud_rad) - np.tan(declinacion_topo) * np.cos(latitud_rad)))) % 360
+
+    return azimut, elevacion
+
+
+def corregir_refraccion(elevacion):
+    """
+    Aplica a una elevación geométrica la corrección de refracción estándar de `pysolar`.
+
+    Args:
+        elevacion (array-like): Elevación topocéntrica sin refracción (en grados).
+
+    Returns:
+        np.ndarray: Elevación aparente (en grados).
+    """
+    elevacion = np.asarray(elevacion, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        refraccion = (constants.standard_pressure * 2.830 * 1.02) / (
+            1010.0 * constants.standard_temperature * 60.0 * np.tan(np.radians(elevacion + 10.3 / (elevacion + 5.11))))
+    return elevacion + np.where(elevacion >= -1.0 * (0.26667 + 0.5667), refraccion, 0.0)
+
+
+def posicion_solar(tiempos, latitud, longitud, refraccion=True):
+    """
+    Calcula de forma vectorizada el azimut y la elevación del sol.
+
+    Args:
+        tiempos (array-like): Instantes a evaluar (`datetime64` en UTC o `datetime` con zona horaria).
+        latitud (float): Latitud geográfica en grados.
+        longitud (float): Longitud geográfica en grados.
+        refraccion (bool): Si es False se devuelve la elevación geométrica, sin corregir por refracción.
+
+    Returns:
+        tuple: Arreglos (azimut, elevación) en grados, con la misma convención que `pysolar`.
+    """
+    tiempos_utc = a_datetime64_utc(tiempos)
+    azimuts = np.empty(tiempos_utc.shape)
+    elevaciones = np.empty(tiempos_utc.shape)
+
+    # Procesar por bloques para acotar la memoria de las sumas de series
+    for inicio in range(0, tiempos_utc.size, TAMANO_BLOQUE):
+        bloque = slice(inicio, inicio + TAMANO_BLOQUE)
+        azimuts[bloque], elevaciones[bloque] = _posicion_bloque(tiempos_utc[bloque], latitud, longitud)
+
+    if refraccion:
+        elevaciones = corregir_refraccion(elevaciones)
+    return azimuts, elevaciones
+
+
+def posicion_solar_pysolar(tiempos, latitud, longitud):
+    """
+    Calcula el azimut y la elevación del sol llamando a `pysolar` instante por instante.
+
+    Args:
+        tiempos (array-like): Instantes a evaluar (`datetime64` en UTC o `datetime` con zona horaria).
+        latitud (float): Latitud geográfica en grados.
+        longitud (float): Longitud geográfica en grados.
+
+    Returns:
+        tuple: Arreglos (azimut, elevación) en grados.
+    """
+    if isinstance(tiempos, np.ndarray) and np.issubdtype(tiempos.dtype, np.datetime64):
+        tiempos = [t.replace(tzinfo=timezone.utc) for t in tiempos.astype("datetime64[us]").tolist()]
+
+    azimuts = [get_azimuth(latitud, longitud, tiempo) for tiempo in tiempos]
+    elevaciones = [get_altitude(latitud, longitud, tiempo) for tiempo in tiempos]
+    return np.array(azimuts, dtype=float), np.array(elevaciones, dtype=float)
+
+
+# Motores disponibles para `getSolarPosition`
+BACKENDS = {
+    "pysolar": posicion_solar_pysolar,
+    "numpy": posicion_solar,
+}
+
+
+def obtener_backend(backend):
+    """
+    Devuelve la función de cálculo asociada a un motor de posición solar.
+
+    Args:
+        backend (str | callable): Nombre de un motor registrado en `BACKENDS` o una
+            función con la firma `(tiempos, latitud, longitud) -> (azimut, elevación)`.
+
+    Returns:
+        callable: Función de cálculo de la posición solar.
+    """
+    if callable(backend):
+        return backend
+    try:
+        return BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Motor de posición solar desconocido: {backend!r}. "
+                         f"Opciones disponibles: {', '.join(BACKENDS)}") from None
@@ -0,0 +1,323 @@
+"""
+Módulo para encontrar el amanecer, el mediodía solar y el atardecer.
+
+Los eventos se obtienen resolviendo raíces sobre la elevación del sol: primero
+se recorre el día con una malla gruesa (10 minutos por defecto) en una sola
+llamada al motor de efemérides, y cada cambio de signo de `elevación - umbral`
+se refina con el método de la regla falsa modificado (Illinois), evaluando a la
+vez todos los cruces pendientes. El mediodía solar es el instante de elevación
+máxima (raíz de la derivada de la elevación).
+
+Con los mismos cruces, `intervalos_diurnos` y `mascara_diurna` indican qué
+instantes de una simulación tienen el sol por encima de una elevación mínima,
+para no calcular efemérides de noche (ver `solo_de_dia` en `getSolarPosition`
+y `simular_por_bloques`).
+
+Las elevaciones son las aparentes (con refracción) que devuelve el motor. Con
+`elevacion=0` el evento es el paso del centro del sol por el horizonte; para el
+amanecer convencional (borde superior del disco) se usa `ELEVACION_BORDE_SUPERIOR`.
+Dos cruces separados por menos que el paso de búsqueda (el sol rozando el
+horizonte en latitudes altas) pueden no detectarse.
+"""
+
+from datetime import date, datetime, timedelta
+import numpy as np
+import pytz
+from Interfaz.efemerides import obtener_backend
+from Interfaz.zonaHoraria import ZONA_HORARIA_POR_DEFECTO
+
+# Elevación aparente del centro del sol cuando el borde superior toca el horizonte (radio de 16')
+ELEVACION_BORDE_SUPERIOR = -16 / 60
+
+# Paso de la malla gruesa con la que se buscan los cambios de signo
+PASO_BUSQUEDA = timedelta(minutes=10)
+
+# Precisión, en segundos, con la que se refinan los eventos
+TOLERANCIA_SEGUNDOS = 0.5
+
+# Semiancho, en segundos, de la diferencia centrada con la que se busca la elevación máxima
+_DELTA_DERIVADA = 60.0
+
+
+def _a_nanosegundos(paso):
+    """Convierte un paso (`timedelta`, `np.timedelta64` o minutos) a nanosegundos enteros."""
+    if isinstance(paso, (int, float)) and not isinstance(paso, bool):
+        paso = timedelta(minutes=paso)
+    paso_ns = int(np.timedelta64(paso, "ns").astype(np.int64))
+    if paso_ns <= 0:
+        raise ValueError("El paso de búsqueda debe ser positivo.")
+    return paso_ns
+
+
+def _elevacion(calcular_posicion, latitud, longitud, base_ns):
+    """Devuelve la función segundos desde `base_ns` -> elevación del sol."""
+    def elevacion(segundos):
+        tiempos = (base_ns + np.round(np.asarray(segundos) * 1e9).astype(np.int64)).astype("datetime64[ns]")
+        return calcular_posicion(tiempos, latitud, longitud)[1]
+    return elevacion
+
+
+def _refinar_raices(funcion, a, b, fa, fb, tolerancia=TOLERANCIA_SEGUNDOS, max_iteraciones=60):
+    """
+    Refina a la vez varias raíces encerradas en [a, b] con el método de Illinois.
+
+    Args:
+        funcion (callable): Función vectorizada de los segundos.
+        a, b (np.ndarray): Extremos de cada intervalo (en segundos).
+        fa, fb (np.ndarray): Valores de la función en los extremos, de signos opuestos.
+        tolerancia (float): Ancho de intervalo, en segundos, con el que se da por encontrada la raíz.
+        max_iteraciones (int): Límite de iteraciones.
+
+    Returns:
+        np.ndarray: Raíces (en segundos).
+    """
+    a, b, fa, fb = (np.array(valor, dtype=float) for valor in (a, b, fa, fb))
+    raices = (a + b) / 2
+    pendientes = np.arange(a.size)
+    for _ in range(max_iteraciones):
+        if not pendientes.size:
+            break
+        a_p, b_p, fa_p, fb_p = a[pendientes], b[pendientes], fa[pendientes], fb[pendientes]
+        c = b_p - fb_p * (b_p - a_p) / (fb_p - fa_p)
+        fc = funcion(c)
+
+        # Regla falsa con la corrección de Illinois: si el extremo `a` se repite, se divide su valor a la mitad
+        cambia = np.sign(fc) != np.sign(fb_p)
+        a_p = np.where(cambia, b_p, a_p)
+        fa_p = np.where(cambia, fb_p, fa_p / 2)
+        a[pendientes], b[pendientes], fa[pendientes], fb[pendientes] = a_p, c, fa_p, fc
+        raices[pendientes] = c
+
+        listos = (np.abs(c - a_p) < tolerancia) | (fc == 0)
+        pendientes = pendientes[~listos]
+    return raices
+
+
+def _malla(inicios_ns, fines_ns, paso_ns):
+    """Une las mallas de búsqueda de varios intervalos; devuelve (instantes, intervalo de cada instante)."""
+    tramos = [np.append(np.arange(inicio, fin, paso_ns, dtype=np.int64), np.int64(fin))
+              for inicio, fin in zip(inicios_ns, fines_ns)]
+    segmentos = np.repeat(np.arange(len(tramos)), [tramo.size for tramo in tramos])
+    return np.concatenate(tramos), segmentos
+
+
+def _cruces(inicios_ns, fines_ns, latitud, longitud, elevacion, backend, paso_busqueda):
+    """
+    Busca los cruces de la elevación del sol por `elevacion` en varios intervalos.
+
+    Returns:
+        dict: `base_ns`, la malla (`segundos`, `segmentos`, `elevaciones` relativas al umbral),
+            la función `f(segundos)` y los cruces (`cruces` en segundos, `subidas`, `segmentos_cruces`).
+    """
+    calcular_posicion = obtener_backend(backend)
+    instantes, segmentos = _malla(inicios_ns, fines_ns, _a_nanosegundos(paso_busqueda))
+    base_ns = int(instantes.min())
+    funcion_elevacion = _elevacion(calcular_posicion, latitud, longitud, base_ns)
+
+    def funcion(segundos):
+        return funcion_elevacion(segundos) - elevacion
+
+    segundos = (instantes - base_ns) / 1e9
+    valores = funcion(segundos)
+    encima = valores > 0
+
+    # Cambios de signo entre instantes consecutivos del mismo intervalo
+    indices = np.flatnonzero((encima[:-1] != encima[1:]) & (segmentos[:-1] == segmentos[1:]))
+    cruces = _refinar_raices(funcion, segundos[indices], segundos[indices + 1],
+                             valores[indices], valores[indices + 1])
+    return {
+        "base_ns": base_ns,
+        "segundos": segundos,
+        "segmentos": segmentos,
+        "elevaciones": valores,
+        "funcion": funcion_elevacion,
+        "cruces": cruces,
+        "subidas": encima[indices + 1],
+        "segmentos_cruces": segmentos[indices],
+    }
+
+
+def _a_tiempos(base_ns, segundos):
+    """Convierte segundos desde `base_ns` a `datetime64[ns]`."""
+    return (base_ns + np.round(np.asarray(segundos) * 1e9).astype(np.int64)).astype("datetime64[ns]")
+
+
+def intervalos_diurnos(inicio, fin, latitud: float = -0.2105367, longitud: float = -78.491614,
+                       elevacion_minima: float = 0.0, backend="numpy", paso_busqueda=PASO_BUSQUEDA):
+    """
+    Calcula los intervalos con el sol por encima de una elevación entre dos instantes.
+
+    Args:
+        inicio (np.datetime64): Instante inicial (en UTC).
+        fin (np.datetime64): Instante final (en UTC).
+        latitud (float): Latitud geográfica. Por defecto es -0.2105367 (Quito).
+        longitud (float): Longitud geográfica. Por defecto es -78.491614 (Quito).
+        elevacion_minima (float): Elevación (en grados) por encima de la cual se considera de día.
+        backend (str | callable): Motor de posición solar (por defecto "numpy").
+        paso_busqueda (timedelta | np.timedelta64 | float): Paso de la malla de búsqueda.
+
+    Returns:
+        tuple: Arreglos `datetime64[ns]` (inicios, fines) de cada intervalo, en orden.
+    """
+    inicio_ns = int(np.datetime64(inicio, "ns").astype(np.int64))
+    fin_ns = int(np.datetime64(fin, "ns").astype(np.int64))
+    if fin_ns <= inicio_ns:
+        instantes = np.array([inicio_ns] if fin_ns == inicio_ns else [], dtype="datetime64[ns]")
+        if instantes.size and obtener_backend(backend)(instantes, latitud, longitud)[1][0] <= elevacion_minima:
+            instantes = instantes[:0]
+        return instantes, instantes.copy()
+
+    busqueda = _cruces([inicio_ns], [fin_ns], latitud, longitud, elevacion_minima, backend, paso_busqueda)
+    encima = busqueda["elevaciones"] > 0
+    subidas = busqueda["subidas"]
+
+    # Los cruces alternan subida y bajada; los extremos abren o cierran un intervalo si ya es de día
+    inicios = busqueda["cruces"][subidas]
+    fines = busqueda["cruces"][~subidas]
+    if encima[0]:
+        inicios = np.insert(inicios, 0, busqueda["segundos"][0])
+    if encima[-1]:
+        fines = np.append(fines, busqueda["segundos"][-1])
+    return _a_tiempos(busqueda["base_ns"], inicios), _a_tiempos(busqueda["base_ns"], fines)
+
+
+def mascara_diurna(tiempos, latitud: float = -0.2105367, longitud: float = -78.491614,
+                   elevacion_minima: float = 0.0, backend="numpy", paso_busqueda=PASO_BUSQUEDA):
+    """
+    Indica qué instantes tienen el sol por encima de una elevación, sin evaluar cada instante.
+
+    Args:
+        tiempos (np.ndarray): Instantes `datetime64` en UTC, en orden creciente.
+        latitud (float): Latitud geográfica. Por defecto es -0.2105367 (Quito).
+        longitud (float): Longitud geográfica. Por defecto es -78.491614 (Quito).
+        elevacion_minima (float): Elevación mínima (en grados).
+        backend (str | callable): Motor de posición solar (por defecto "numpy").
+        paso_busqueda (timedelta | np.timedelta64 | float): Paso de la malla de búsqueda.
+
+    Returns:
+        np.ndarray: Máscara booleana, True en los instantes de día.
+    """
+    tiempos = np.asarray(tiempos, dtype="datetime64[ns]")
+    if not tiempos.size:
+        return np.zeros(0, dtype=bool)
+    inicios, fines = intervalos_diurnos(tiempos[0], tiempos[-1], latitud, longitud, elevacion_minima,
+                                        backend, paso_busqueda)
+    return en_intervalos(tiempos, inicios, fines)
+
+
+def en_intervalos(tiempos, inicios, fines):
+    """
+    Indica qué instantes caen dentro de alguno de los intervalos [inicio, fin].
+
+    Args:
+        tiempos (np.ndarray): Instantes `datetime64[ns]`.
+        inicios (np.ndarray): Inicios de los intervalos, ordenados y sin solaparse.
+        fines (np.ndarray): Fines de los intervalos.
+
+    Returns:
+        np.ndarray: Máscara booleana.
+    """
+    if not inicios.size:
+        return np.zeros(np.shape(tiempos), dtype=bool)
+    indices = np.searchsorted(inicios, tiempos, side="right") - 1
+    return (indices >= 0) & (tiempos <= fines[np.maximum(indices, 0)])
+
+
+def eventos_solares(fechas, latitud: float = -0.2105367, longitud: float = -78.491614,
+                    zona_horaria=ZONA_HORARIA_POR_DEFECTO, elevacion: float = 0.0, backend="numpy",
+                    paso_busqueda=PASO_BUSQUEDA):
+    """
+    Calcula el amanecer, el mediodía solar y el atardecer de uno o varios días.
+
+    Args:
+        fechas (date | str | iterable): Fecha ("YYYY-MM-DD" o `date`) o fechas a evaluar; cada
+            una es el día local de 00:00 a 24:00 en `zona_horaria`.
+        latitud (float): Latitud geográfica. Por defecto es -0.2105367 (Quito).
+        longitud (float): Longitud geográfica. Por defecto es -78.491614 (Quito).
+        zona_horaria (str): Zona horaria IANA de las fechas.
+        elevacion (float): Elevación (en grados) que marca el amanecer y el atardecer; por
+            ejemplo `ELEVACION_BORDE_SUPERIOR` o una elevación mínima de operación.
+        backend (str | callable): Motor de posición solar (por defecto "numpy").
+        paso_busqueda (timedelta | np.timedelta64 | float): Paso de la malla de búsqueda.
+
+    Returns:
+        dict: Por cada día (escalares si `fechas` es una sola fecha):
+            - fecha (np.datetime64): Día local.
+            - amanecer (np.datetime64): Primer cruce ascendente, en UTC (NaT si no lo hay).
+            - mediodia (np.datetime64): Instante de elevación máxima, en UTC.
+            - atardecer (np.datetime64): Último cruce descendente, en UTC (NaT si no lo hay). Puede
+                ser anterior al amanecer si el día local empieza con el sol sobre el horizonte.
+            - elevacion_mediodia (float): Elevación máxima (en grados).
+            - duracion (np.timedelta64): Tiempo total del día con el sol sobre `elevacion`.
+    """
+    una_fecha = isinstance(fechas, (date, str))
+    fechas = [fechas] if una_fecha else list(fechas)
+    fechas = [date.fromisoformat(fecha) if isinstance(fecha, str) else fecha for fecha in fechas]
+    zona = pytz.timezone(zona_horaria)
+
+    def limite(fecha):
+        instante = zona.localize(datetime.combine(fecha, datetime.min.time()))
+        return int(np.datetime64(instante.astimezone(pytz.utc).replace(tzinfo=None), "ns").astype(np.int64))
+
+    inicios_ns = [limite(fecha) for fecha in fechas]
+    fines_ns = [limite(fecha + timedelta(days=1)) for fecha in fechas]
+    busqueda = _cruces(inicios_ns, fines_ns, latitud, longitud, elevacion, backend, paso_busqueda)
+    segundos, segmentos, valores = busqueda["segundos"], busqueda["segmentos"], busqueda["elevaciones"]
+    dias = len(fechas)
+
+    # Amanecer: primera subida de cada día; atardecer: última bajada
+    amanecer = np.full(dias, np.nan)
+    atardecer = np.full(dias, np.nan)
+    subidas = busqueda["subidas"]
+    dias_subida, primeras = np.unique(busqueda["segmentos_cruces"][subidas], return_index=True)
+    amanecer[dias_subida] = busqueda["cruces"][subidas][primeras]
+    bajadas = busqueda["cruces"][~subidas][::-1]
+    dias_bajada, ultimas = np.unique(busqueda["segmentos_cruces"][~subidas][::-1], return_index=True)
+    atardecer[dias_bajada] = bajadas[ultimas]
+
+    # Mediodía: máximo de la malla de cada día, refinado con la raíz de la derivada
+    desplazamientos = np.flatnonzero(np.r_[True, segmentos[1:] != segmentos[:-1]])
+    maximos = np.array([inicio + np.argmax(valores[inicio:fin])
+                        for inicio, fin in zip(desplazamientos, np.r_[desplazamientos[1:], valores.size])])
+    funcion_elevacion = busqueda["funcion"]
+
+    def derivada(t):
+        return funcion_elevacion(t + _DELTA_DERIVADA) - funcion_elevacion(t - _DELTA_DERIVADA)
+
+    a = segundos[np.maximum(maximos - 1, desplazamientos)]
+    b = segundos[np.minimum(maximos + 1, np.r_[desplazamientos[1:], valores.size] - 1)]
+    da, db = derivada(a), derivada(b)
+    encerrado = (da > 0) & (db < 0)
+    mediodia = segundos[maximos].astype(float)
+    if encerrado.any():
+        mediodia[encerrado] = _refinar_raices(derivada, a[encerrado], b[encerrado], da[encerrado], db[encerrado])
+    elevacion_mediodia = funcion_elevacion(mediodia)
+
+    # Duración: suma de los tramos de cada día con el sol sobre el umbral
+    duracion = np.zeros(dias)
+    for dia in range(dias):
+        en_dia = busqueda["segmentos_cruces"] == dia
+        cruces, subidas_dia = busqueda["cruces"][en_dia], subidas[en_dia]
+        limites_dia = segundos[segmentos == dia]
+        encima = valores[segmentos == dia] > 0
+        inicios = np.r_[limites_dia[:1][encima[:1]], cruces[subidas_dia]]
+        fines = np.r_[cruces[~subidas_dia], limites_dia[-1:][encima[-1:]]]
+        duracion[dia] = np.sum(fines - inicios)
+
+    def a_instantes(valores_segundos):
+        faltantes = np.isnan(valores_segundos)
+        tiempos = _a_tiempos(busqueda["base_ns"], np.where(faltantes, 0.0, valores_segundos))
+        tiempos[faltantes] = np.datetime64("NaT")
+        return tiempos
+
+    eventos = {
+        "fecha": np.array(fechas, dtype="datetime64[D]"),
+        "amanecer": a_instantes(amanecer),
+        "mediodia": a_instantes(mediodia),
+        "atardecer": a_instantes(atardecer),
+        "elevacion_mediodia": elevacion_mediodia,
+        "duracion": np.round(duracion * 1e9).astype("timedelta64[ns]"),
+    }
+    if una_fecha:
+        return {clave: valor[0] for clave, valor in eventos.items()}
+    return eventos
@@ -0,0 +1,213 @@
+"""
+Módulo para exportar la animación del seguidor solar a un archivo de video o GIF.
+
+Los fotogramas se dibujan fuera de pantalla con el backend Agg de `matplotlib`,
+repartiendo rangos de fotogramas entre varios procesos. Cada proceso construye
+una sola vez la escena de `posicionSistema` (con artistas persistentes) y
+devuelve los fotogramas como arreglos RGB; el proceso principal los escribe en
+orden mediante los *writers* de `matplotlib` (`ffmpeg` para MP4, Pillow para GIF).
+
+Ejemplo:
+    python -m Interfaz.exportarAnimacion simulacion.mp4 --fecha 2025-01-27 --paso 1 --procesos 4
+"""
+
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import os
+import numpy as np
+from Interfaz.efemerides import a_datetime64_utc
+from Interfaz.posicionSistema import crear_figura_escena
+from Interfaz.resultadoSimulacion import desempacar_resultado
+from Interfaz.zonaHoraria import ZONA_HORARIA_POR_DEFECTO
+
+# Fotogramas que dibuja cada tarea enviada a un proceso
+FOTOGRAMAS_POR_TAREA = 24
+
+# Escena y canvas de cada proceso trabajador (se crean una sola vez por proceso)
+_ESCENA_TRABAJADOR = None
+
+
+def _crear_escena_agg(tiempos, azimuts, elevaciones, beta, phi, figsize, dpi, zona_horaria=ZONA_HORARIA_POR_DEFECTO):
+    """
+    Crea la escena sobre un canvas Agg y guarda su fondo estático (ejes, rejilla, etiquetas).
+
+    Returns:
+        tuple: (canvas, escena, fondo).
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figura, escena = crear_figura_escena(tiempos, azimuts, elevaciones, beta, phi, figsize=figsize, dpi=dpi,
+                                         zona_horaria=zona_horaria)
+    canvas = FigureCanvasAgg(figura)
+    for artista in escena.artistas:
+        artista.set_animated(True)
+    escena.iniciar()
+    canvas.draw()
+    return canvas, escena, canvas.copy_from_bbox(figura.bbox)
+
+
+def _iniciar_trabajador(*datos_escena):
+    """Inicializador de cada proceso: construye la escena que usarán todas sus tareas."""
+    global _ESCENA_TRABAJADOR
+    _ESCENA_TRABAJADOR = _crear_escena_agg(*datos_escena)
+
+
+def renderizar_fotogramas(canvas, escena, fondo, desde, hasta):
+    """
+    Dibuja un rango de fotogramas de la escena y los devuelve como imágenes RGB.
+
+    Los ejes no se redibujan: en cada fotograma se restaura el fondo guardado y
+    solo se dibujan encima los artistas que cambian.
+
+    Args:
+        canvas (FigureCanvasAgg): Canvas de la figura de la escena.
+        escena (EscenaPanelSol): Escena a actualizar.
+        fondo: Región guardada con `canvas.copy_from_bbox`.
+        desde (int): Primer fotograma (incluido).
+        hasta (int): Último fotograma (excluido).
+
+    Returns:
+        np.ndarray: Arreglo (hasta - desde, alto, ancho, 3) de tipo `uint8`.
+    """
+    fotogramas = []
+    for fotograma in range(desde, hasta):
+        canvas.restore_region(fondo)
+        for artista in sorted(escena.actualizar(fotograma), key=lambda artista: artista.get_zorder()):
+            canvas.figure.draw_artist(artista)
+        fotogramas.append(np.asarray(canvas.buffer_rgba())[..., :3].copy())
+    return np.stack(fotogramas)
+
+
+def _renderizar_rango(desde, hasta):
+    """Tarea ejecutada en un proceso trabajador con la escena creada por `_iniciar_trabajador`."""
+    return renderizar_fotogramas(*_ESCENA_TRABAJADOR, desde, hasta)
+
+
+def obtener_writer(ruta, fps):
+    """
+    Elige el *writer* de `matplotlib` según la extensión del archivo.
+
+    Args:
+        ruta (str): Archivo de salida (`.gif` usa Pillow; otro formato usa `ffmpeg`).
+        fps (int): Fotogramas por segundo.
+
+    Returns:
+        AbstractMovieWriter: Writer listo para usarse.
+    """
+    from matplotlib import animation
+
+    if str(ruta).lower().endswith(".gif"):
+        return animation.PillowWriter(fps=fps)
+    if not animation.writers.is_available("ffmpeg"):
+        raise RuntimeError("Para exportar video se necesita ffmpeg; instálelo o exporte a un archivo .gif.")
+    return animation.FFMpegWriter(fps=fps, codec="h264", extra_args=["-pix_fmt", "yuv420p"])
+
+
+def exportar_animacion(ruta, tiempos, azimuts=None, elevaciones=None, beta=None, phi=None, fps: int = 30, procesos=None,
+                       fotogramas_por_tarea: int = FOTOGRAMAS_POR_TAREA, figsize=(10, 7), dpi: int = 100,
+                       writer=None, zona_horaria=None):
+    """
+    Exporta la animación del panel y el sol a un archivo MP4 o GIF sin abrir ventanas.
+
+    Args:
+        ruta (str): Archivo de salida (`.mp4`, `.gif`, ...).
+        tiempos (ResultadoSimulacion | array-like): Resultado de la simulación, o sus instantes
+            (`datetime64` en UTC o `datetime` con zona horaria) si las columnas se pasan por separado.
+        azimuts (list, opcional): Lista de ángulos de azimut a lo largo del tiempo.
+        elevaciones (list, opcional): Lista de ángulos de elevación a lo largo del tiempo.
+        beta (list, opcional): Lista de ángulos de pitch (inclinación) a lo largo del tiempo.
+        phi (list, opcional): Lista de ángulos de roll (balanceo) a lo largo del tiempo.
+        fps (int): Fotogramas por segundo del archivo.
+        procesos (int, opcional): Procesos que dibujan fotogramas; por defecto, el número de núcleos.
+        fotogramas_por_tarea (int): Fotogramas dibujados por cada tarea.
+        figsize (tuple): Tamaño de la figura en pulgadas.
+        dpi (int): Resolución de la figura.
+        writer (AbstractMovieWriter, opcional): Writer a usar; por defecto se elige con `obtener_writer`.
+        zona_horaria (str, opcional): Zona horaria IANA en la que se muestran las horas; por
+            defecto, la del resultado o "America/Guayaquil".
+
+    Returns:
+        str: Ruta del archivo generado.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    tiempos, azimuts, elevaciones, beta, phi, zona_horaria = desempacar_resultado(
+        tiempos, azimuts, elevaciones, beta, phi, zona_horaria)
+    total = len(tiempos)
+    if total == 0:
+        raise ValueError("No hay fotogramas para exportar.")
+    procesos = procesos or os.cpu_count() or 1
+    writer = writer or obtener_writer(ruta, fps)
+    datos_escena = (a_datetime64_utc(tiempos), np.asarray(azimuts, dtype=float), np.asarray(elevaciones, dtype=float),
+                    np.asarray(beta, dtype=float), np.asarray(phi, dtype=float), figsize, dpi, zona_horaria)
+    tareas = [(desde, min(desde + fotogramas_por_tarea, total)) for desde in range(0, total, fotogramas_por_tarea)]
+
+    # Figura de salida: una imagen del tamaño exacto del lienzo que recibe cada fotograma ya dibujado
+    salida = None
+    imagen = None
+
+    def escribir(fotogramas):
+        nonlocal salida, imagen
+        if salida is None:
+            alto, ancho = fotogramas.shape[1:3]
+            salida = Figure(figsize=(ancho / dpi, alto / dpi), dpi=dpi)
+            FigureCanvasAgg(salida)
+            imagen = salida.figimage(fotogramas[0], origin="upper")
+            writer.setup(salida, ruta, dpi=dpi)
+        for fotograma in fotogramas:
+            imagen.set_data(fotograma)
+            writer.grab_frame()
+
+    try:
+        if procesos == 1:
+            escena_agg = _crear_escena_agg(*datos_escena)
+            for desde, hasta in tareas:
+                escribir(renderizar_fotogramas(*escena_agg, desde, hasta))
+        else:
+            with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                                     initargs=datos_escena) as ejecutor:
+                # Solo unas pocas tareas en curso para no acumular fotogramas en memoria
+                restantes = iter(tareas)
+                pendientes = deque(ejecutor.submit(_renderizar_rango, *tarea)
+                                   for _, tarea in zip(range(2 * procesos), restantes))
+                while pendientes:
+                    fotogramas = pendientes.popleft().result()
+                    siguiente = next(restantes, None)
+                    if siguiente is not None:
+                        pendientes.append(ejecutor.submit(_renderizar_rango, *siguiente))
+                    escribir(fotogramas)
+    finally:
+        if salida is not None:
+            writer.finish()
+
+    return str(ruta)
+
+
+def main(argv=None):
+    """Punto de entrada para exportar una animación desde la línea de comandos."""
+    from Interfaz.calculoAngulos import getSolarPosition
+
+    parser = argparse.ArgumentParser(description="Exporta la animación del seguidor solar a MP4 o GIF.")
+    parser.add_argument("ruta", help="Archivo de salida (.mp4 o .gif)")
+    parser.add_argument("--fecha", required=True, help="Fecha de la simulación (YYYY-MM-DD)")
+    parser.add_argument("--hora-inicio", type=int, default=6)
+    parser.add_argument("--hora-fin", type=int, default=18)
+    parser.add_argument("--paso", type=float, default=10, help="Paso de simulación en minutos")
+    parser.add_argument("--latitud", type=float, default=-0.2105367)
+    parser.add_argument("--longitud", type=float, default=-78.491614)
+    parser.add_argument("--zona-horaria", default=ZONA_HORARIA_POR_DEFECTO, help="Zona horaria IANA de la fecha y horas")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos para dibujar los fotogramas")
+    parser.add_argument("--dpi", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    resultado = getSolarPosition(args.fecha, args.hora_inicio, args.hora_fin, args.latitud, args.longitud,
+                                 step_minutes=args.paso, backend="numpy", zona_horaria=args.zona_horaria)
+    ruta = exportar_animacion(args.ruta, resultado, fps=args.fps, procesos=args.procesos, dpi=args.dpi)
+    print(f"Animación exportada: {ruta} ({resultado.muestras} fotogramas)")
+
+
+if __name__ == "__main__":
+    main()
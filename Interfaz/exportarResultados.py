@@ -0,0 +1,338 @@
+"""
+Módulo para guardar y leer resultados de simulación en formatos binarios por columnas.
+
+Las columnas de un resultado son `times` (instantes UTC en `datetime64[ns]`),
+`azimuths`, `elevations`, `beta` y `alpha`. Se admiten los formatos:
+
+* `npz`: un solo archivo de NumPy con todas las columnas; cada columna se lee
+  por separado al accederla, pero no admite agregar bloques ni `mmap`.
+* `npy`: una carpeta con un archivo `.npy` por columna. Admite agregar bloques
+  a medida que se calculan y leer cada columna en modo `mmap`, sin cargar las demás.
+* `parquet` y `arrow` (Arrow IPC / Feather v2): requieren `pyarrow`. Admiten
+  agregar bloques y leer solo las columnas pedidas; `arrow` se lee en modo `mmap`.
+
+El formato se deduce de la extensión de la ruta (`.npz`, `.parquet`, `.arrow` o
+`.feather`); cualquier otra ruta se trata como una carpeta `npy`.
+
+Ejemplo:
+    with abrir_escritor("quito_2025") as escritor:
+        for bloque in simular_por_bloques("2025-01-01", "2026-01-01", paso=1):
+            escritor.agregar(bloque)
+    elevaciones = cargar_resultados("quito_2025", columnas=["elevations"])["elevations"]
+"""
+
+import os
+import numpy as np
+from Interfaz.efemerides import a_datetime64_utc
+
+COLUMNAS = ("times", "azimuths", "elevations", "beta", "alpha")
+FORMATOS = ("npz", "npy", "parquet", "arrow")
+
+# Tamaño fijo reservado para la cabecera de cada `.npy`, que se reescribe al agregar bloques
+_TAMANO_CABECERA_NPY = 128
+
+
+def detectar_formato(ruta):
+    """
+    Deduce el formato de almacenamiento a partir de la ruta.
+
+    Args:
+        ruta (str): Ruta del archivo o carpeta de resultados.
+
+    Returns:
+        str: Uno de `FORMATOS`.
+    """
+    extension = os.path.splitext(str(ruta))[1].lower()
+    return {".npz": "npz", ".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}.get(extension, "npy")
+
+
+def normalizar_columnas(resultado, dtype=np.float64):
+    """
+    Convierte un resultado de simulación a un diccionario de arreglos de NumPy.
+
+    Args:
+        resultado (tuple | dict): Columnas (times, azimuths, elevations, beta, alpha)
+            en orden, o un diccionario con esas claves. Los tiempos pueden ser
+            `datetime` con zona horaria o `datetime64` en UTC.
+        dtype: Tipo de las columnas de ángulos.
+
+    Returns:
+        dict: Columna -> arreglo.
+    """
+    if not isinstance(resultado, dict):
+        resultado = dict(zip(COLUMNAS, resultado))
+    columnas = {"times": a_datetime64_utc(resultado["times"])}
+    for nombre in COLUMNAS[1:]:
+        columnas[nombre] = np.asarray(resultado[nombre], dtype=dtype)
+    return columnas
+
+
+def _importar_pyarrow():
+    """Importa `pyarrow`, que solo se necesita para los formatos `parquet` y `arrow`."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError("Los formatos parquet y arrow requieren el paquete pyarrow (pip install pyarrow).") from error
+    return pyarrow
+
+
+class EscritorColumnas:
+    """
+    Escribe resultados por bloques en una carpeta con un archivo `.npy` por columna.
+
+    Cada archivo se abre una vez; los bloques se agregan al final y la cabecera
+    (que guarda la cantidad de filas) se reescribe en su lugar, de modo que los
+    archivos son `.npy` válidos incluso antes de cerrar el escritor.
+
+    Args:
+        ruta (str): Carpeta de salida (se crea si no existe).
+        dtype: Tipo de las columnas de ángulos.
+    """
+
+    formato = "npy"
+
+    def __init__(self, ruta, dtype=np.float64):
+        self.ruta = str(ruta)
+        self.dtype = np.dtype(dtype)
+        self.cantidad = 0
+        os.makedirs(self.ruta, exist_ok=True)
+        tipos = {nombre: self.dtype for nombre in COLUMNAS[1:]}
+        tipos["times"] = np.dtype("datetime64[ns]")
+        self._tipos = tipos
+        self._archivos = {nombre: open(os.path.join(self.ruta, f"{nombre}.npy"), "wb") for nombre in COLUMNAS}
+        self._escribir_cabeceras()
+
+    def _escribir_cabeceras(self):
+        """Escribe (o reescribe) la cabecera de cada archivo con la cantidad actual de filas."""
+        for nombre, archivo in self._archivos.items():
+            posicion = archivo.tell()
+            archivo.seek(0)
+            np.lib.format.write_array_header_1_0(archivo, {
+                "descr": np.lib.format.dtype_to_descr(self._tipos[nombre]),
+                "fortran_order": False,
+                "shape": (self.cantidad,),
+            })
+            if archivo.tell() != _TAMANO_CABECERA_NPY:
+                raise RuntimeError("La cabecera del archivo .npy cambió de tamaño.")
+            archivo.seek(max(posicion, _TAMANO_CABECERA_NPY))
+
+    def agregar(self, bloque):
+        """
+        Agrega un bloque de resultados al final de cada columna.
+
+        Args:
+            bloque (tuple | dict): Columnas del bloque (ver `normalizar_columnas`).
+        """
+        columnas = normalizar_columnas(bloque, self.dtype)
+        for nombre, archivo in self._archivos.items():
+            archivo.write(np.ascontiguousarray(columnas[nombre], dtype=self._tipos[nombre]).tobytes())
+        self.cantidad += len(columnas["times"])
+        self._escribir_cabeceras()
+
+    def cerrar(self):
+        """Cierra los archivos de todas las columnas."""
+        for archivo in self._archivos.values():
+            archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+class EscritorArrow:
+    """
+    Escribe resultados por bloques en un archivo Parquet o Arrow IPC (requiere `pyarrow`).
+
+    Cada bloque se guarda como un grupo de filas (Parquet) o un *record batch* (Arrow).
+
+    Args:
+        ruta (str): Archivo de salida.
+        formato (str): "parquet" o "arrow".
+        dtype: Tipo de las columnas de ángulos.
+    """
+
+    def __init__(self, ruta, formato="parquet", dtype=np.float64):
+        pa = _importar_pyarrow()
+        self._pa = pa
+        self.ruta = str(ruta)
+        self.formato = formato
+        self.dtype = np.dtype(dtype)
+        self.cantidad = 0
+        tipo_angulo = pa.from_numpy_dtype(self.dtype)
+        self.esquema = pa.schema([pa.field("times", pa.timestamp("ns", tz="UTC"))]
+                                 + [pa.field(nombre, tipo_angulo) for nombre in COLUMNAS[1:]])
+        if formato == "parquet":
+            self._escritor = pa.parquet.ParquetWriter(self.ruta, self.esquema)
+        else:
+            self._sumidero = pa.OSFile(self.ruta, "wb")
+            self._escritor = pa.ipc.new_file(self._sumidero, self.esquema)
+
+    def agregar(self, bloque):
+        """
+        Agrega un bloque de resultados.
+
+        Args:
+            bloque (tuple | dict): Columnas del bloque (ver `normalizar_columnas`).
+        """
+        columnas = normalizar_columnas(bloque, self.dtype)
+        lote = self._pa.RecordBatch.from_arrays(
+            [self._pa.array(columnas[campo.name], type=campo.type) for campo in self.esquema], schema=self.esquema)
+        if self.formato == "parquet":
+            self._escritor.write_table(self._pa.Table.from_batches([lote]))
+        else:
+            self._escritor.write_batch(lote)
+        self.cantidad += lote.num_rows
+
+    def cerrar(self):
+        """Termina el archivo (escribe el pie de página con los metadatos)."""
+        self._escritor.close()
+        if self.formato == "arrow":
+            self._sumidero.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+class EscritorNpz:
+    """
+    Acumula bloques de resultados y los guarda en un solo archivo `.npz` al cerrar.
+
+    El formato `npz` no permite agregar datos a un archivo existente; para
+    simulaciones que no caben en memoria conviene usar `npy`, `parquet` o `arrow`.
+
+    Args:
+        ruta (str): Archivo de salida.
+        dtype: Tipo de las columnas de ángulos.
+        comprimir (bool): Si es True, usa `np.savez_compressed`.
+    """
+
+    formato = "npz"
+
+    def __init__(self, ruta, dtype=np.float64, comprimir=False):
+        self.ruta = str(ruta)
+        self.dtype = np.dtype(dtype)
+        self.comprimir = comprimir
+        self.cantidad = 0
+        self._bloques = []
+
+    def agregar(self, bloque):
+        """
+        Agrega un bloque de resultados (se mantiene en memoria hasta cerrar).
+
+        Args:
+            bloque (tuple | dict): Columnas del bloque (ver `normalizar_columnas`).
+        """
+        columnas = normalizar_columnas(bloque, self.dtype)
+        self._bloques.append(columnas)
+        self.cantidad += len(columnas["times"])
+
+    def cerrar(self):
+        """Escribe el archivo `.npz` con todas las columnas."""
+        if self._bloques:
+            columnas = {nombre: np.concatenate([bloque[nombre] for bloque in self._bloques]) for nombre in COLUMNAS}
+        else:
+            columnas = normalizar_columnas({nombre: [] for nombre in COLUMNAS}, self.dtype)
+        guardar = np.savez_compressed if self.comprimir else np.savez
+        guardar(self.ruta, **columnas)
+        self._bloques = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+def abrir_escritor(ruta, formato=None, dtype=np.float64):
+    """
+    Crea un escritor por bloques para el formato indicado.
+
+    Args:
+        ruta (str): Archivo o carpeta de salida.
+        formato (str, opcional): Uno de `FORMATOS`; por defecto se deduce de la ruta.
+        dtype: Tipo de las columnas de ángulos (por ejemplo `np.float32` para ocupar la mitad).
+
+    Returns:
+        EscritorColumnas | EscritorArrow | EscritorNpz: Escritor con `agregar` y `cerrar`,
+            usable con `with`.
+    """
+    formato = formato or detectar_formato(ruta)
+    if formato == "npy":
+        return EscritorColumnas(ruta, dtype)
+    if formato == "npz":
+        return EscritorNpz(ruta, dtype)
+    if formato in ("parquet", "arrow"):
+        return EscritorArrow(ruta, formato, dtype)
+    raise ValueError(f"Formato no soportado: {formato!r}. Opciones: {', '.join(FORMATOS)}")
+
+
+def exportar_resultado(ruta, resultado, formato=None, dtype=np.float64):
+    """
+    Guarda un resultado de simulación completo.
+
+    Args:
+        ruta (str): Archivo o carpeta de salida.
+        resultado (tuple | dict): Columnas del resultado (ver `normalizar_columnas`).
+        formato (str, opcional): Uno de `FORMATOS`; por defecto se deduce de la ruta.
+        dtype: Tipo de las columnas de ángulos.
+
+    Returns:
+        str: Ruta escrita.
+    """
+    with abrir_escritor(ruta, formato, dtype) as escritor:
+        escritor.agregar(resultado)
+    return str(ruta)
+
+
+def cargar_resultados(ruta, columnas=None, formato=None, mmap=True):
+    """
+    Lee columnas de un resultado guardado, sin cargar las que no se piden.
+
+    Args:
+        ruta (str): Archivo o carpeta de resultados.
+        columnas (iterable, opcional): Columnas a leer; por defecto, todas.
+        formato (str, opcional): Uno de `FORMATOS`; por defecto se deduce de la ruta.
+        mmap (bool): Si es True, las columnas `npy` y `arrow` se mapean en memoria
+            en lugar de leerse completas.
+
+    Returns:
+        dict: Columna -> arreglo de NumPy (de solo lectura si está mapeado).
+    """
+    formato = formato or detectar_formato(ruta)
+    columnas = list(columnas or COLUMNAS)
+    desconocidas = set(columnas) - set(COLUMNAS)
+    if desconocidas:
+        raise ValueError(f"Columnas desconocidas: {sorted(desconocidas)}")
+
+    if formato == "npy":
+        return {nombre: np.load(os.path.join(str(ruta), f"{nombre}.npy"), mmap_mode="r" if mmap else None)
+                for nombre in columnas}
+
+    if formato == "npz":
+        # NpzFile descomprime cada columna solo al accederla
+        with np.load(ruta) as archivo:
+            return {nombre: archivo[nombre] for nombre in columnas}
+
+    if formato in ("parquet", "arrow"):
+        pa = _importar_pyarrow()
+        if formato == "parquet":
+            tabla = pa.parquet.read_table(str(ruta), columns=columnas, memory_map=mmap)
+        else:
+            fuente = pa.memory_map(str(ruta), "r") if mmap else pa.OSFile(str(ruta), "rb")
+            tabla = pa.ipc.open_file(fuente).read_all().select(columnas)
+        resultado = {}
+        for nombre in columnas:
+            columna = tabla.column(nombre)
+            if nombre == "times":
+                columna = columna.cast(pa.timestamp("ns"))
+            resultado[nombre] = columna.to_numpy()
+        return resultado
+
+    raise ValueError(f"Formato no soportado: {formato!r}. Opciones: {', '.join(FORMATOS)}")
@@ -1,153 +1,251 @@
-import matplotlib.pyplot as plt
-from fpdf import FPDF
 import os
-import io
-from PIL import Image
-from Interfaz.calculoAngulos import getSolarPosition
-import tkinter as tk
-from tkinter import messagebox
-import webbrowser
-
-def generar_reporte(fecha, hora_inicio, hora_fin):
+import zlib
+import numpy as np
+from Interfaz.cacheSimulacion import obtener_simulacion_cacheada
+from Interfaz.instrumentacion import instrumentar, medir
+from Interfaz.resultadoSimulacion import ResultadoSimulacion
+from Interfaz.zonaHoraria import ZONA_HORARIA_POR_DEFECTO, a_hora_local
+
+
+@instrumentar("generarReporte.grafica")
+def graficar_series(times, series, titulo, figsize=(10, 5), dpi=100):
+    """
+    Dibuja una gráfica de ángulos en memoria, sin archivos temporales.
+
+    La figura se crea sin `pyplot`, por lo que varios reportes pueden generarse
+    al mismo tiempo sin compartir el estado global de `matplotlib`.
+
+    Args:
+        times (array-like): Horas de la simulación tal como se muestran en el eje.
+        series (list): Tuplas (valores, etiqueta, marcador, color) a graficar.
+        titulo (str): Título de la gráfica.
+        figsize (tuple): Tamaño de la figura en pulgadas.
+        dpi (int): Resolución de la figura.
+
+    Returns:
+        tuple: (ancho, alto, datos) con los píxeles RGB de la gráfica.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figura = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(figura)
+    ejes = figura.add_subplot(111)
+    for valores, etiqueta, marcador, color in series:
+        ejes.plot(times, valores, label=etiqueta, marker=marcador, color=color)
+    ejes.set_xlabel("Hora local")
+    ejes.set_ylabel("Ángulo (°)")
+    ejes.set_title(titulo)
+    ejes.legend()
+    ejes.tick_params(axis="x", labelrotation=45)
+    canvas.draw()
+
+    pixeles = np.asarray(canvas.buffer_rgba())[..., :3]
+    alto, ancho = pixeles.shape[:2]
+    return ancho, alto, pixeles.tobytes()
+
+
+def agregar_imagen_rgb(pdf, nombre, ancho, alto, datos, x=None, y=None, w=0, h=0):
+    """
+    Inserta en un documento FPDF una imagen RGB que está en memoria.
+
+    FPDF 1.7 solo sabe leer imágenes desde archivos; aquí se registra la imagen
+    directamente en `pdf.images` con el mismo formato que usa al leer un PNG,
+    y luego se coloca con `pdf.image` como cualquier otra.
+
+    Args:
+        pdf (FPDF): Documento donde se inserta la imagen.
+        nombre (str): Nombre único de la imagen dentro del documento.
+        ancho (int): Ancho en píxeles.
+        alto (int): Alto en píxeles.
+        datos (bytes): Píxeles RGB de 8 bits por canal, fila por fila.
+        x, y, w, h (float, opcional): Posición y tamaño, como en `FPDF.image`.
+    """
+    if nombre not in pdf.images:
+        pdf.images[nombre] = {
+            "i": len(pdf.images) + 1,
+            "w": ancho,
+            "h": alto,
+            "cs": "DeviceRGB",
+            "bpc": 8,
+            "f": "FlateDecode",
+            "data": zlib.compress(datos),
+        }
+    pdf.image(nombre, x=x, y=y, w=w, h=h)
+
+
+def construir_reporte_pdf(resultado, fecha, hora_inicio, hora_fin, zona_horaria=None):
     """
-    Genera un reporte con los cálculos y gráficas en formato PDF sin guardar imágenes permanentes,
+    Construye el reporte PDF de una simulación completamente en memoria.
+
+    Args:
+        resultado (ResultadoSimulacion | tuple): Resultado de la simulación o sus columnas
+            (times, azimuths, elevations, beta, alpha).
+        fecha (datetime): Fecha en que se realiza la simulación.
+        hora_inicio (int): Hora de inicio de la simulación.
+        hora_fin (int): Hora de fin de la simulación.
+        zona_horaria (str, opcional): Zona horaria IANA en la que se muestran las horas; por
+            defecto, la del resultado o "America/Guayaquil".
+
+    Returns:
+        bytes: Contenido del archivo PDF.
+    """
+    from fpdf import FPDF
+
+    if not isinstance(resultado, ResultadoSimulacion):
+        resultado = ResultadoSimulacion(*resultado, zona_horaria=zona_horaria or ZONA_HORARIA_POR_DEFECTO)
+    times, azimuths, elevations, beta, alpha = resultado
+    times = a_hora_local(times, zona_horaria or resultado.zona_horaria)
+
+    # Gráficas de azimut y elevación, y de pitch y roll
+    grafica_posicion = graficar_series(times, [(azimuths, "Azimut", "o", None), (elevations, "Elevación", "s", None)],
+                                       "Azimut y Elevación a lo largo del tiempo")
+    grafica_control = graficar_series(times, [(beta, "Beta (Pitch)", "o", "r"), (alpha, "Alpha (Roll)", "s", "g")],
+                                      "Pitch y Roll a lo largo del tiempo")
+
+    with medir("generarReporte.pdf"):
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.set_font("Arial", "B", 16)
+        pdf.cell(200, 10, "Reporte del Seguidor Solar", ln=True, align="C")
+
+        pdf.set_font("Arial", "", 12)
+        pdf.ln(10)
+        pdf.cell(200, 10, f"Fecha: {fecha.strftime('%Y-%m-%d')}", ln=True)
+        pdf.cell(200, 10, f"Hora de Inicio: {hora_inicio}:00", ln=True)
+        pdf.cell(200, 10, f"Hora de Fin: {hora_fin}:00", ln=True)
+
+        pdf.ln(10)
+        agregar_imagen_rgb(pdf, "grafico_azimut_elevacion", *grafica_posicion, x=10, w=180)
+        pdf.ln(10)
+        agregar_imagen_rgb(pdf, "grafico_alpha_beta", *grafica_control, x=10, w=180)
+
+        return pdf.output(dest="S").encode("latin-1")
+
+
+def reservar_ruta_informe(carpeta):
+    """
+    Reserva el siguiente nombre de informe libre (`Informe_<n>.pdf`) en una carpeta.
+
+    El archivo se crea de forma exclusiva, así que dos reportes generados al mismo
+    tiempo nunca reciben el mismo nombre.
+
+    Args:
+        carpeta (str): Carpeta donde se guardan los informes.
+
+    Returns:
+        str: Ruta del archivo reservado (vacío).
+    """
+    os.makedirs(carpeta, exist_ok=True)
+
+    # Determinar el número de informe siguiente al mayor existente
+    report_numbers = []
+    for f in os.listdir(carpeta):
+        numero = f[len("Informe_"):-len(".pdf")]
+        if f.startswith("Informe_") and f.endswith(".pdf") and numero.isdigit():
+            report_numbers.append(int(numero))
+    report_number = max(report_numbers, default=0) + 1
+
+    while True:
+        pdf_path = os.path.join(carpeta, f"Informe_{report_number}.pdf")
+        try:
+            os.close(os.open(pdf_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return pdf_path
+        except FileExistsError:
+            report_number += 1
+
+
+@instrumentar("generar_reporte")
+def generar_reporte(fecha, hora_inicio, hora_fin, resultado=None, carpeta=None, mostrar_ventana=True,
+                    zona_horaria=None):
+    """
+    Genera un reporte con los cálculos y gráficas en formato PDF sin escribir imágenes temporales,
     guardado en el escritorio con nombre de archivo incremental.
 
     Args:
         fecha (datetime): Fecha en que se realiza la simulación.
         hora_inicio (int): Hora de inicio de la simulación.
         hora_fin (int): Hora de fin de la simulación.
+        resultado (ResultadoSimulacion | tuple, opcional): Resultado de una simulación ya calculada.
+            Si no se indica, se obtiene de la caché.
+        carpeta (str, opcional): Carpeta de destino; por defecto, el escritorio del usuario.
+        mostrar_ventana (bool): Si es True, muestra una ventana para abrir el PDF generado.
+        zona_horaria (str, opcional): Zona horaria IANA de la fecha y las horas; por defecto, la
+            del resultado o "America/Guayaquil".
 
     Returns:
         str: Mensaje indicando el nombre del archivo PDF generado.
     """
-    # Obtener datos de la simulación solar (azimut, elevación, etc.)
-    times, azimuths, elevations, beta, alpha = getSolarPosition(
-        start_date=fecha, start_hour=hora_inicio, end_hour=hora_fin
-    )
-
-    # Crear la primera gráfica (Azimut y Elevación)
-    plt.figure(figsize=(10, 5))
-    plt.plot(times, azimuths, label="Azimut", marker="o")
-    plt.plot(times, elevations, label="Elevación", marker="s")
-    plt.xlabel("Tiempo")
-    plt.ylabel("Ángulo (°)")
-    plt.title("Azimut y Elevación a lo largo del tiempo")
-    plt.legend()
-    plt.xticks(rotation=45)
-
-    # Guardar la figura en un archivo temporal
-    img_path1 = "grafico_azimut_elevacion.png"
-    plt.savefig(img_path1, format='png')
-    plt.close()
-
-    # Crear la segunda gráfica (Pitch y Roll)
-    plt.figure(figsize=(10, 5))
-    plt.plot(times, beta, label="Beta (Pitch)", marker="o", color="r")
-    plt.plot(times, alpha, label="Alpha (Roll)", marker="s", color="g")
-    plt.xlabel("Tiempo")
-    plt.ylabel("Ángulo (°)")
-    plt.title("Pitch y Roll a lo largo del tiempo")
-    plt.legend()
-    plt.xticks(rotation=45)
-
-    # Guardar la figura en otro archivo temporal
-    img_path2 = "grafico_alpha_beta.png"
-    plt.savefig(img_path2, format='png')
-    plt.close()
-
-    # Obtener la ruta del escritorio
-    desktop_path = os.path.join(os.path.expanduser("~"), "Desktop")
-
-    # Determinar el nombre de archivo incremental para PDF
-    report_files = [f for f in os.listdir(desktop_path) if f.startswith("Informe_") and f.endswith(".pdf")]
-    report_numbers = [int(f.split("_")[1].split(".")[0]) for f in report_files]
-    
-    # Si no existen informes, el primer archivo será Informe_1
-    if not report_numbers:
-        report_number = 1
-    else:
-        report_number = max(report_numbers) + 1  # Incrementar el número
-
-    # Definir el nombre del archivo PDF
-    pdf_filename = f"Informe_{report_number}.pdf"
-    pdf_path = os.path.join(desktop_path, pdf_filename)
-
-    # Generar PDF
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", "B", 16)
-    pdf.cell(200, 10, "Reporte del Seguidor Solar", ln=True, align="C")
-
-    pdf.set_font("Arial", "", 12)
-    pdf.ln(10)
-    pdf.cell(200, 10, f"Fecha: {fecha.strftime('%Y-%m-%d')}", ln=True)
-    pdf.cell(200, 10, f"Hora de Inicio: {hora_inicio}:00", ln=True)
-    pdf.cell(200, 10, f"Hora de Fin: {hora_fin}:00", ln=True)
-
-    pdf.ln(10)
-
-    # Insertar la primera imagen
-    pdf.image(img_path1, x=10, w=180)
-
-    pdf.ln(10)
-
-    # Insertar la segunda imagen
-    pdf.image(img_path2, x=10, w=180)
-
-    # Guardar el archivo PDF en el escritorio
-    pdf.output(pdf_path)
+    # Reutilizar la simulación ya calculada en lugar de repetirla
+    if resultado is None:
+        resultado = obtener_simulacion_cacheada(start_date=fecha, start_hour=hora_inicio, end_hour=hora_fin,
+                                                zona_horaria=zona_horaria or ZONA_HORARIA_POR_DEFECTO)
+
+    contenido = construir_reporte_pdf(resultado, fecha, hora_inicio, hora_fin, zona_horaria)
+
+    # Guardar el archivo PDF (por defecto en el escritorio)
+    with medir("generarReporte.guardar"):
+        pdf_path = reservar_ruta_informe(carpeta or os.path.join(os.path.expanduser("~"), "Desktop"))
+        pdf_filename = os.path.basename(pdf_path)
+        with open(pdf_path, "wb") as archivo:
+            archivo.write(contenido)
     print(f"Reporte generado exitosamente: {pdf_filename}")
 
-    # Eliminar los archivos de imágenes temporales
-    plt.close('all')  # Cierra todas las figuras activas
+    if mostrar_ventana:
+        mostrar_confirmacion(pdf_path)
+
+    return f"Reporte PDF guardado como {pdf_filename} en {'el escritorio' if carpeta is None else carpeta}."
+
 
-    os.remove(img_path1)
-    os.remove(img_path2)
+def mostrar_confirmacion(pdf_path):
+    """
+    Muestra una ventana emergente de confirmación con botones para abrir el PDF.
+
+    Args:
+        pdf_path (str): Ruta del PDF generado.
+    """
+    # Las bibliotecas de ventanas solo se importan al mostrar la confirmación
+    import tkinter as tk
+    import webbrowser
+
+    pdf_filename = os.path.basename(pdf_path)
 
     # Función para abrir el archivo PDF
     def open_pdf():
         webbrowser.open(pdf_path)
 
-    # Crear ventana emergente de confirmación con botones
-    def show_popup():
-        root = tk.Tk()
-        root.withdraw()  # Ocultar la ventana principal
-        
-        # Crear la ventana emergente
-        popup = tk.Toplevel(root)
-        popup.title("Reporte Generado")
-        
-        # Centramos la ventana emergente en la pantalla
-        window_width = 400
-        window_height = 100
-        screen_width = popup.winfo_screenwidth()
-        screen_height = popup.winfo_screenheight()
-        position_top = int(screen_height / 2 - window_height / 2)
-        position_right = int(screen_width / 2 - window_width / 2)
-        popup.geometry(f'{window_width}x{window_height}+{position_right}+{position_top}')
-        
-        # Agregar el ícono
-        popup.iconbitmap('./Imagenes/panel-solar.ico')
-
-        label = tk.Label(popup, text=f"Reporte generado como {pdf_filename}")
-        label.pack(pady=10)
-
-        # Crear un frame contenedor para centrar los botones
-        button_frame = tk.Frame(popup)
-        button_frame.pack(pady=10)
-
-        # Botón para abrir el PDF
-        open_button = tk.Button(button_frame, text="Abrir PDF", command=open_pdf)
-        open_button.pack(side="left", padx=10)
-
-        # Botón para cerrar
-        accept_button = tk.Button(button_frame, text="Cerrar", command=popup.destroy)
-        accept_button.pack(side="left", padx=10)
-
-        popup.mainloop()
-
-    # Mostrar la ventana emergente con botones
-    show_popup()
-
-    return f"Reporte PDF guardado como {pdf_filename} en el escritorio."
+    root = tk.Tk()
+    root.withdraw()  # Ocultar la ventana principal
+
+    # Crear la ventana emergente
+    popup = tk.Toplevel(root)
+    popup.title("Reporte Generado")
+
+    # Centramos la ventana emergente en la pantalla
+    window_width = 400
+    window_height = 100
+    screen_width = popup.winfo_screenwidth()
+    screen_height = popup.winfo_screenheight()
+    position_top = int(screen_height / 2 - window_height / 2)
+    position_right = int(screen_width / 2 - window_width / 2)
+    popup.geometry(f'{window_width}x{window_height}+{position_right}+{position_top}')
+
+    # Agregar el ícono
+    popup.iconbitmap('./Imagenes/panel-solar.ico')
+
+    label = tk.Label(popup, text=f"Reporte generado como {pdf_filename}")
+    label.pack(pady=10)
+
+    # Crear un frame contenedor para centrar los botones
+    button_frame = tk.Frame(popup)
+    button_frame.pack(pady=10)
+
+    # Botón para abrir el PDF
+    open_button = tk.Button(button_frame, text="Abrir PDF", command=open_pdf)
+    open_button.pack(side="left", padx=10)
+
+    # Botón para cerrar
+    accept_button = tk.Button(button_frame, text="Cerrar", command=popup.destroy)
+    accept_button.pack(side="left", padx=10)
+
+    popup.mainloop()
@@ -0,0 +1,37 @@
+"""
+Módulo con la importación diferida que usan los `__init__` de los paquetes.
+
+Cada paquete declara una tabla `_EXPORTACIONES` (nombre exportado -> submódulo
+que lo define) y obtiene de `importacion_diferida` sus funciones `__getattr__`
+y `__dir__` de módulo: el submódulo solo se importa la primera vez que se
+accede al nombre, y el objeto queda guardado en el paquete.
+"""
+
+import importlib
+import sys
+
+
+def importacion_diferida(nombre_paquete, exportaciones):
+    """
+    Crea las funciones `__getattr__` y `__dir__` de un paquete con importación diferida.
+
+    Args:
+        nombre_paquete (str): Nombre del paquete (`__name__` en su `__init__`).
+        exportaciones (dict): Nombre exportado -> submódulo que lo define.
+
+    Returns:
+        tuple: (__getattr__, __dir__) para asignar en el `__init__` del paquete.
+    """
+
+    def __getattr__(nombre):
+        submodulo = exportaciones.get(nombre)
+        if submodulo is None:
+            raise AttributeError(f"module {nombre_paquete!r} has no attribute {nombre!r}")
+        valor = getattr(importlib.import_module(f".{submodulo}", nombre_paquete), nombre)
+        setattr(sys.modules[nombre_paquete], nombre, valor)
+        return valor
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[nombre_paquete])) | set(exportaciones))
+
+    return __getattr__, __dir__
@@ -0,0 +1,217 @@
+"""
+Módulo de instrumentación: temporizadores y contadores con nombre para cada etapa.
+
+Sirve para saber en qué se va el tiempo de una simulación o un reporte (motor
+de efemérides, zonas horarias, cálculo de ángulos, dibujo, PDF). Está
+desactivada por defecto y en ese estado `medir` devuelve un contexto vacío
+compartido y `contar` retorna de inmediato, por lo que su costo es despreciable.
+
+Se activa con `activar()` o con la variable de entorno `SEGUIDOR_INSTRUMENTACION=1`.
+Con la instrumentación activa:
+
+* `resumen()` devuelve las métricas acumuladas y `imprimir_resumen()` las muestra en una tabla;
+* `registrar_exportador(funcion)` envía cada medición, como diccionario, a un colector propio
+  (por ejemplo, para escribir un registro JSON por líneas).
+
+Ejemplo:
+    from Interfaz import instrumentacion
+    instrumentacion.activar()
+    getSolarPosition("2025-01-27", 6, 18)
+    instrumentacion.imprimir_resumen()
+"""
+
+from contextlib import nullcontext
+from functools import wraps
+import os
+import sys
+import threading
+import time
+
+_activa = os.environ.get("SEGUIDOR_INSTRUMENTACION", "").lower() in ("1", "true", "si", "sí")
+_bloqueo = threading.Lock()
+_tiempos = {}       # nombre -> [llamadas, total, mínimo, máximo] en segundos
+_contadores = {}    # nombre -> valor acumulado
+_exportadores = []
+
+# Contexto vacío compartido que se devuelve cuando la instrumentación está desactivada
+_NULO = nullcontext()
+
+
+def activar():
+    """Activa la instrumentación."""
+    global _activa
+    _activa = True
+
+
+def desactivar():
+    """Desactiva la instrumentación (las métricas acumuladas se conservan)."""
+    global _activa
+    _activa = False
+
+
+def esta_activa():
+    """bool: Indica si la instrumentación está activa."""
+    return _activa
+
+
+def reiniciar():
+    """Borra todas las métricas acumuladas."""
+    with _bloqueo:
+        _tiempos.clear()
+        _contadores.clear()
+
+
+def registrar_exportador(exportador):
+    """
+    Registra una función que recibe cada medición a medida que se produce.
+
+    Args:
+        exportador (callable): Función que recibe un diccionario con las claves
+            `tipo` ("tiempo" o "contador"), `nombre`, `valor` y `instante` (segundos Unix).
+
+    Returns:
+        callable: El mismo exportador, para poder usarlo como decorador.
+    """
+    with _bloqueo:
+        _exportadores.append(exportador)
+    return exportador
+
+
+def quitar_exportador(exportador):
+    """Deja de enviar mediciones a un exportador registrado."""
+    with _bloqueo:
+        if exportador in _exportadores:
+            _exportadores.remove(exportador)
+
+
+def _exportar(tipo, nombre, valor):
+    """Envía una medición a los exportadores registrados."""
+    if _exportadores:
+        evento = {"tipo": tipo, "nombre": nombre, "valor": valor, "instante": time.time()}
+        for exportador in list(_exportadores):
+            exportador(evento)
+
+
+def registrar_tiempo(nombre, segundos):
+    """
+    Acumula la duración de una ejecución de una etapa.
+
+    Args:
+        nombre (str): Nombre de la etapa.
+        segundos (float): Duración medida.
+    """
+    with _bloqueo:
+        datos = _tiempos.get(nombre)
+        if datos is None:
+            _tiempos[nombre] = [1, segundos, segundos, segundos]
+        else:
+            datos[0] += 1
+            datos[1] += segundos
+            datos[2] = min(datos[2], segundos)
+            datos[3] = max(datos[3], segundos)
+    _exportar("tiempo", nombre, segundos)
+
+
+class _Temporizador:
+    """Contexto que mide el tiempo de un bloque y lo acumula con `registrar_tiempo`."""
+
+    __slots__ = ("nombre", "inicio")
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        registrar_tiempo(self.nombre, time.perf_counter() - self.inicio)
+
+
+def medir(nombre):
+    """
+    Devuelve un contexto que mide el tiempo del bloque `with` como la etapa `nombre`.
+
+    Args:
+        nombre (str): Nombre de la etapa (por convención, "módulo.etapa").
+
+    Returns:
+        Contexto para usar con `with`; vacío si la instrumentación está desactivada.
+    """
+    return _Temporizador(nombre) if _activa else _NULO
+
+
+def contar(nombre, cantidad=1):
+    """
+    Suma `cantidad` al contador `nombre` (no hace nada si la instrumentación está desactivada).
+
+    Args:
+        nombre (str): Nombre del contador.
+        cantidad (int | float): Valor a sumar.
+    """
+    if not _activa:
+        return
+    with _bloqueo:
+        _contadores[nombre] = _contadores.get(nombre, 0) + cantidad
+    _exportar("contador", nombre, cantidad)
+
+
+def instrumentar(nombre=None):
+    """
+    Decorador que mide cada llamada a una función.
+
+    Args:
+        nombre (str, opcional): Nombre de la etapa; por defecto, "módulo.función".
+
+    Returns:
+        callable: Decorador.
+    """
+    def decorador(funcion):
+        etiqueta = nombre or f"{funcion.__module__}.{funcion.__qualname__}"
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _activa:
+                return funcion(*args, **kwargs)
+            with _Temporizador(etiqueta):
+                return funcion(*args, **kwargs)
+
+        return envoltura
+
+    return decorador
+
+
+def resumen():
+    """
+    Devuelve las métricas acumuladas.
+
+    Returns:
+        dict: `tiempos` (por etapa: llamadas, total, media, mínimo y máximo en segundos)
+            y `contadores` (por nombre: valor acumulado).
+    """
+    with _bloqueo:
+        tiempos = {
+            nombre: {"llamadas": llamadas, "total_s": total, "media_s": total / llamadas,
+                     "min_s": minimo, "max_s": maximo}
+            for nombre, (llamadas, total, minimo, maximo) in sorted(_tiempos.items())
+        }
+        return {"tiempos": tiempos, "contadores": dict(sorted(_contadores.items()))}
+
+
+def imprimir_resumen(archivo=None):
+    """
+    Muestra las métricas acumuladas en forma de tabla.
+
+    Args:
+        archivo (file, opcional): Destino del texto; por defecto, la salida estándar.
+    """
+    archivo = archivo or sys.stdout
+    datos = resumen()
+    print(f"{'Etapa':<40} {'Llamadas':>9} {'Total (ms)':>12} {'Media (ms)':>12} {'Máx (ms)':>12}", file=archivo)
+    for nombre, tiempo in datos["tiempos"].items():
+        print(f"{nombre:<40} {tiempo['llamadas']:>9} {tiempo['total_s'] * 1000:>12.3f} "
+              f"{tiempo['media_s'] * 1000:>12.3f} {tiempo['max_s'] * 1000:>12.3f}", file=archivo)
+    if datos["contadores"]:
+        print(f"\n{'Contador':<40} {'Valor':>9}", file=archivo)
+        for nombre, valor in datos["contadores"].items():
+            print(f"{nombre:<40} {valor:>9}", file=archivo)
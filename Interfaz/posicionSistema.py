@@ -1,156 +1,249 @@
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection
-import matplotlib.animation as animation
-import tkinter as tk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
-from Interfaz.calculoAngulos import getSolarPosition, Rxyz
+from Interfaz.calculoAngulos import getSolarPosition, rotar_vertices
+from Interfaz.efemerides import a_datetime64_utc
+from Interfaz.instrumentacion import contar, instrumentar, medir
+from Interfaz.resultadoSimulacion import desempacar_resultado
+from Interfaz.zonaHoraria import a_hora_local, formatear_tiempo
 
-def visualizar_trayectoria_panel_y_sol(frame_padre, tiempos, azimuts, elevaciones, beta, phi):
+# Distancia del sol al origen en la escena y resolución de la esfera que lo representa
+RADIO_TRAYECTORIA = 10
+RESOLUCION_SOL = 24
+
+# Formato de la etiqueta de tiempo de cada fotograma
+FORMATO_ETIQUETA = "Hora: %H:%M\nFecha: %Y-%m-%d"
+
+
+def construir_panel(centro, ancho, alto):
     """
-    Renderiza la simulación de la trayectoria del panel solar y la trayectoria del sol 
-    dentro de un frame de Tkinter en la interfaz principal.
+    Construye un panel rectangular con las dimensiones proporcionadas.
 
     Args:
-        frame_padre (tk.Frame): El frame de Tkinter donde se incrustará el gráfico 3D.
-        tiempos (list): Lista de tiempos de la simulación.
-        azimuts (list): Lista de ángulos de azimut a lo largo del tiempo.
-        elevaciones (list): Lista de ángulos de elevación a lo largo del tiempo.
-        beta (list): Lista de ángulos de pitch (inclinación) a lo largo del tiempo.
-        phi (list): Lista de ángulos de roll (balanceo) a lo largo del tiempo.
+        centro (list): Coordenadas [x, y, z] del centro del panel.
+        ancho (float): Ancho del panel.
+        alto (float): Alto del panel.
+
+    Returns:
+        np.array: Vértices del panel en 3D.
     """
-    
-    # Limpiar cualquier contenido previo en el frame
-    for widget in frame_padre.winfo_children():
-        widget.destroy()
+    w, h = ancho / 2, alto / 2
+    return np.array([
+        [centro[0] - w, centro[1] - h, centro[2]],
+        [centro[0] + w, centro[1] - h, centro[2]],
+        [centro[0] + w, centro[1] + h, centro[2]],
+        [centro[0] - w, centro[1] + h, centro[2]]
+    ])
 
-    # Crear marco para el gráfico 3D dentro del frame
-    marco_3d = tk.Frame(frame_padre)
-    marco_3d.pack(fill=tk.BOTH, expand=True)
 
-    # Crear figura y ejes 3D
-    figura = plt.Figure(figsize=(10, 7), dpi=100)
-    ejes = figura.add_subplot(111, projection='3d')
+def construir_esfera(resolucion=RESOLUCION_SOL):
+    """
+    Construye los cuadriláteros de una esfera de radio 1 centrada en el origen.
 
-    # Definir el centro del panel solar y sus dimensiones
-    centro_panel = [0, 0, 0]
-    ancho, alto = 4, 2
-    sun_trajectory = {'x': [], 'y': [], 'z': []}
+    Args:
+        resolucion (int): Divisiones en longitud y en latitud.
 
-    def construir_panel(centro, ancho, alto):
-        """
-        Construye un panel rectangular con las dimensiones proporcionadas.
+    Returns:
+        np.array: Arreglo (M, 4, 3) con los vértices de cada cuadrilátero.
+    """
+    u = np.linspace(0, 2 * np.pi, resolucion + 1)
+    v = np.linspace(0, np.pi, resolucion + 1)
+    puntos = np.stack([
+        np.outer(np.cos(u), np.sin(v)),
+        np.outer(np.sin(u), np.sin(v)),
+        np.outer(np.ones(np.size(u)), np.cos(v)),
+    ], axis=-1)
+    return np.stack([puntos[:-1, :-1], puntos[1:, :-1], puntos[1:, 1:], puntos[:-1, 1:]], axis=2).reshape(-1, 4, 3)
 
-        Args:
-            centro (list): Coordenadas [x, y, z] del centro del panel.
-            ancho (float): Ancho del panel.
-            alto (float): Alto del panel.
 
-        Returns:
-            np.array: Vértices del panel en 3D.
-        """
-        w, h = ancho / 2, alto / 2
-        return np.array([
-            [centro[0] - w, centro[1] - h, centro[2]],
-            [centro[0] + w, centro[1] - h, centro[2]],
-            [centro[0] + w, centro[1] + h, centro[2]],
-            [centro[0] - w, centro[1] + h, centro[2]]
-        ])
-
-    def create_sun(ax, center, radius=1.0, color='orange'):
-        """
-        Crea una esfera representando el sol en la gráfica 3D.
+class EscenaPanelSol:
+    """
+    Escena 3D del panel solar y el sol con artistas persistentes.
 
-        Args:
-            ax (Axes3D): El objeto de los ejes 3D donde se graficará el sol.
-            center (list): Coordenadas [x, y, z] del centro del sol.
-            radius (float): Radio de la esfera (por defecto 1.0).
-            color (str): Color de la esfera (por defecto 'orange').
-        """
-        u = np.linspace(0, 2 * np.pi, 100)
-        v = np.linspace(0, np.pi, 100)
-        x = radius * np.outer(np.cos(u), np.sin(v)) + center[0]
-        y = radius * np.outer(np.sin(u), np.sin(v)) + center[1]
-        z = radius * np.outer(np.ones(np.size(u)), np.cos(v)) + center[2]
-        ax.plot_surface(x, y, z, color=color, shade=True, rstride=3, cstride=3, linewidth=0)
-
-    # Construir el panel y añadirlo a los ejes
-    vertices = construir_panel(centro_panel, ancho, alto)
-    panel = Poly3DCollection([vertices], facecolors=['red', 'yellow'], linewidths=3, edgecolors='black')
-    ejes.add_collection3d(panel)
-
-    # Ajuste de límites y dirección Este
-    ejes.set_xlim(-10, 10)
-    ejes.set_ylim(-10, 10)
-    ejes.set_zlim(-10, 10)
-    ejes.quiver(0, 0, 0, 5, 0, 0, color='blue', linewidth=2)
-    ejes.text(5.2, 0, 0, "Este", color='blue', fontsize=12)
-
-    def aplicar_rotaciones(vertices, angulo_pitch, angulo_roll, angulo_yaw=0):
-        """
-        Aplica las rotaciones al panel solar basado en los ángulos de control.
+    El panel, la trayectoria, el sol y las etiquetas se crean una sola vez; cada
+    fotograma solo actualiza sus datos, por lo que el costo por fotograma no
+    crece con la duración de la simulación. La escena no depende de Tkinter y
+    puede dibujarse en cualquier figura de `matplotlib`.
 
-        Args:
-            vertices (np.array): Vértices del panel.
-            angulo_pitch (float): Ángulo de pitch (inclinación).
-            angulo_roll (float): Ángulo de roll (balanceo).
-            angulo_yaw (float): Ángulo de yaw (giro horizontal).
+    Args:
+        ejes (Axes3D): Ejes 3D donde se dibuja la escena.
+        tiempos (ResultadoSimulacion | array-like): Resultado de la simulación, o sus instantes
+            (`datetime64` en UTC o `datetime` con zona horaria) si las columnas se pasan por separado.
+        azimuts (list, opcional): Lista de ángulos de azimut a lo largo del tiempo.
+        elevaciones (list, opcional): Lista de ángulos de elevación a lo largo del tiempo.
+        beta (list, opcional): Lista de ángulos de pitch (inclinación) a lo largo del tiempo.
+        phi (list, opcional): Lista de ángulos de roll (balanceo) a lo largo del tiempo.
+        ancho (float): Ancho del panel.
+        alto (float): Alto del panel.
+        zona_horaria (str, opcional): Zona horaria IANA en la que se muestran las horas; por
+            defecto, la del resultado o "America/Guayaquil".
+    """
+
+    def __init__(self, ejes, tiempos, azimuts=None, elevaciones=None, beta=None, phi=None, ancho=4, alto=2,
+                 zona_horaria=None):
+        from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+
+        tiempos, azimuts, elevaciones, beta, phi, zona_horaria = desempacar_resultado(
+            tiempos, azimuts, elevaciones, beta, phi, zona_horaria)
+        self.ejes = ejes
+        self.cantidad = len(tiempos)
+
+        # Todo lo que depende del fotograma se calcula una sola vez para toda la simulación
+        vertices = construir_panel([0, 0, 0], ancho, alto)
+        self.vertices_por_fotograma = rotar_vertices(vertices, phi, beta)
+
+        az_rad = np.radians(np.asarray(azimuts, dtype=float))
+        el_rad = np.radians(np.asarray(elevaciones, dtype=float))
+        self.posiciones_sol = RADIO_TRAYECTORIA * np.stack(
+            [np.cos(el_rad) * np.sin(az_rad), np.cos(el_rad) * np.cos(az_rad), np.sin(el_rad)], axis=-1)
+        self.radios_sol = 1.0 + (np.asarray(elevaciones, dtype=float) / 90) * 0.5
+        # Las horas se pasan a hora local de una vez; el texto se genera al mostrar cada fotograma
+        self.tiempos_locales = a_hora_local(a_datetime64_utc(tiempos), zona_horaria)
+        self.esfera = construir_esfera()
+
+        # Elementos estáticos: límites y dirección Este
+        ejes.set_xlim(-10, 10)
+        ejes.set_ylim(-10, 10)
+        ejes.set_zlim(-10, 10)
+        ejes.quiver(0, 0, 0, 5, 0, 0, color='blue', linewidth=2)
+        ejes.text(5.2, 0, 0, "Este", color='blue', fontsize=12)
+
+        # Artistas que se actualizan en cada fotograma
+        self.panel = Poly3DCollection([vertices], facecolors=['red', 'yellow'], linewidths=3, edgecolors='black')
+        ejes.add_collection3d(self.panel)
+        self.trayectoria, = ejes.plot([], [], [], color='yellow', linewidth=2, linestyle='-')
+        self.sol = Poly3DCollection(self.esfera, facecolors='orange', edgecolors='orange',
+                                    linewidths=0, shade=True)
+        ejes.add_collection3d(self.sol)
+        self.etiqueta = ejes.text2D(0.05, 0.05, "", transform=ejes.figure.transFigure, fontsize=12,
+                                    color='black', bbox=dict(facecolor='white', alpha=0.7))
+
+    @property
+    def artistas(self):
+        """list: Artistas que cambian en cada fotograma."""
+        return [self.panel, self.trayectoria, self.sol, self.etiqueta]
+
+    def iniciar(self):
+        """
+        Deja la escena en su estado inicial (sin trayectoria del sol).
 
         Returns:
-            np.array: Vértices rotados del panel.
+            list: Artistas de la escena.
         """
-        rotacion_combinada = Rxyz(angulo_roll, angulo_pitch, angulo_yaw)
-        return vertices @ rotacion_combinada.T
+        self.trayectoria.set_data_3d([], [], [])
+        self.etiqueta.set_text("")
+        return self.artistas
 
-    def actualizar_animacion(fotograma):
+    @instrumentar("posicionSistema.fotograma")
+    def actualizar(self, fotograma):
         """
-        Actualiza la animación del panel solar y la trayectoria del sol.
+        Actualiza el panel, la trayectoria del sol, el sol y la etiqueta de tiempo.
 
         Args:
             fotograma (int): Índice del fotograma actual.
 
         Returns:
-            list: Lista de objetos del panel (en este caso, solo el panel).
+            list: Artistas modificados.
         """
-        if fotograma < len(tiempos):
-            ejes.clear()
-            vertices_rotados = aplicar_rotaciones(vertices, beta[fotograma], phi[fotograma])
-            panel = Poly3DCollection([vertices_rotados], facecolors=['red', 'yellow'], linewidths=3, edgecolors='black')
-            ejes.add_collection3d(panel)
-
-            azimuth, elevation = azimuts[fotograma], elevaciones[fotograma]
-            sun_size = 1.0 + (elevation / 90) * 0.5  
-            r = 10  
-            sun_position = [
-                r * np.cos(np.radians(elevation)) * np.sin(np.radians(azimuth)),
-                r * np.cos(np.radians(elevation)) * np.cos(np.radians(azimuth)),
-                r * np.sin(np.radians(elevation))
-            ]
-
-            sun_trajectory['x'].append(sun_position[0])
-            sun_trajectory['y'].append(sun_position[1])
-            sun_trajectory['z'].append(sun_position[2])
-
-            ejes.plot(sun_trajectory['x'], sun_trajectory['y'], sun_trajectory['z'], color='yellow', linewidth=2, linestyle='-')
-            create_sun(ejes, sun_position, radius=sun_size)
-
-            # Ajustes de límites y dirección Este
-            ejes.set_xlim(-10, 10)
-            ejes.set_ylim(-10, 10)
-            ejes.set_zlim(-10, 10)
-            ejes.quiver(0, 0, 0, 5, 0, 0, color='blue', linewidth=2)
-            ejes.text(5.2, 0, 0, "Este", color='blue', fontsize=12)
-
-            # Agregar la etiqueta de tiempo dentro del gráfico
-            ejes.text2D(0.05,0.05, tiempos[fotograma].strftime("Hora: %H:%M\nFecha: %Y-%m-%d"), 
-                        transform=figura.transFigure, fontsize=12, color='black', bbox=dict(facecolor='white', alpha=0.7))
-
-        return [panel]
-
-    # Crear canvas y animación
+        if fotograma < self.cantidad:
+            self.panel.set_verts([self.vertices_por_fotograma[fotograma]])
+
+            recorrido = self.posiciones_sol[:fotograma + 1]
+            self.trayectoria.set_data_3d(recorrido[:, 0], recorrido[:, 1], recorrido[:, 2])
+
+            self.sol.set_verts(self.esfera * self.radios_sol[fotograma] + self.posiciones_sol[fotograma])
+            self.etiqueta.set_text(formatear_tiempo(self.tiempos_locales[fotograma], FORMATO_ETIQUETA))
+            self._proyectar()
+            contar("posicionSistema.fotogramas")
+
+        return self.artistas
+
+    def _proyectar(self):
+        """
+        Proyecta el panel y el sol con la vista actual y los ordena por profundidad.
+
+        Con blitting los ejes no se redibujan completos, así que las colecciones
+        3D no se proyectarían de nuevo al cambiar sus vértices.
+        """
+        if getattr(self.ejes, "M", None) is None:
+            return
+        base = min(self.panel.get_zorder(), self.sol.get_zorder())
+        colecciones = sorted((self.panel, self.sol), key=lambda coleccion: coleccion.do_3d_projection(), reverse=True)
+        for orden, coleccion in enumerate(colecciones):
+            coleccion.set_zorder(base + orden)
+
+
+def crear_figura_escena(tiempos, azimuts=None, elevaciones=None, beta=None, phi=None, figsize=(10, 7), dpi=100,
+                        zona_horaria=None):
+    """
+    Crea una figura de `matplotlib` (sin ventana) con la escena del panel y el sol.
+
+    Args:
+        tiempos (ResultadoSimulacion | array-like): Resultado de la simulación, o sus instantes
+            (`datetime64` en UTC o `datetime` con zona horaria) si las columnas se pasan por separado.
+        azimuts (list, opcional): Lista de ángulos de azimut a lo largo del tiempo.
+        elevaciones (list, opcional): Lista de ángulos de elevación a lo largo del tiempo.
+        beta (list, opcional): Lista de ángulos de pitch (inclinación) a lo largo del tiempo.
+        phi (list, opcional): Lista de ángulos de roll (balanceo) a lo largo del tiempo.
+        figsize (tuple): Tamaño de la figura en pulgadas.
+        dpi (int): Resolución de la figura.
+        zona_horaria (str, opcional): Zona horaria IANA en la que se muestran las horas; por
+            defecto, la del resultado o "America/Guayaquil".
+
+    Returns:
+        tuple: (figura, escena).
+    """
+    from matplotlib.figure import Figure
+
+    figura = Figure(figsize=figsize, dpi=dpi)
+    ejes = figura.add_subplot(111, projection='3d')
+    return figura, EscenaPanelSol(ejes, tiempos, azimuts, elevaciones, beta, phi, zona_horaria=zona_horaria)
+
+
+def visualizar_trayectoria_panel_y_sol(frame_padre, tiempos, azimuts=None, elevaciones=None, beta=None, phi=None,
+                                       zona_horaria=None):
+    """
+    Renderiza la simulación de la trayectoria del panel solar y la trayectoria del sol
+    dentro de un frame de Tkinter en la interfaz principal.
+
+    Args:
+        frame_padre (tk.Frame): El frame de Tkinter donde se incrustará el gráfico 3D.
+        tiempos (ResultadoSimulacion | array-like): Resultado de la simulación, o sus instantes
+            (`datetime64` en UTC o `datetime` con zona horaria) si las columnas se pasan por separado.
+        azimuts (list, opcional): Lista de ángulos de azimut a lo largo del tiempo.
+        elevaciones (list, opcional): Lista de ángulos de elevación a lo largo del tiempo.
+        beta (list, opcional): Lista de ángulos de pitch (inclinación) a lo largo del tiempo.
+        phi (list, opcional): Lista de ángulos de roll (balanceo) a lo largo del tiempo.
+        zona_horaria (str, opcional): Zona horaria IANA en la que se muestran las horas; por
+            defecto, la del resultado o "America/Guayaquil".
+
+    Returns:
+        FuncAnimation: Animación en curso.
+    """
+    # Las bibliotecas gráficas se importan solo cuando se visualiza algo
+    import matplotlib.animation as animation
+    import tkinter as tk
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+    # Limpiar cualquier contenido previo en el frame
+    for widget in frame_padre.winfo_children():
+        widget.destroy()
+
+    # Crear marco para el gráfico 3D dentro del frame
+    marco_3d = tk.Frame(frame_padre)
+    marco_3d.pack(fill=tk.BOTH, expand=True)
+
+    # Crear figura, escena y canvas
+    with medir("posicionSistema.crear_escena"):
+        figura, escena = crear_figura_escena(tiempos, azimuts, elevaciones, beta, phi, zona_horaria=zona_horaria)
     canvas = FigureCanvasTkAgg(figura, master=marco_3d)
     canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-    animacion = animation.FuncAnimation(figura, actualizar_animacion, frames=len(tiempos), interval=200, blit=False)
-    
+
+    # Con blit=True solo se redibujan los artistas de la escena (si el backend lo soporta)
+    animacion = animation.FuncAnimation(figura, escena.actualizar, frames=escena.cantidad, init_func=escena.iniciar,
+                                        interval=200, blit=True)
+
+    # Mantener una referencia a la animación mientras exista el canvas
+    canvas.animacion = animacion
+
     # Actualizar el frame de Tkinter
     frame_padre.update_idletasks()
+    return animacion
@@ -0,0 +1,218 @@
+"""
+Módulo con el contenedor compacto de los resultados de una simulación.
+
+`ResultadoSimulacion` guarda las cinco columnas de una simulación (instantes,
+azimut, elevación, beta y alpha) como arreglos contiguos de NumPy en lugar de
+cinco listas de objetos de Python. Los instantes son `datetime64[ns]` en UTC y
+los ángulos pueden guardarse en `float64` o en `float32` (la mitad de memoria,
+con una precisión de unos 1e-5 grados, de sobra para graficar o animar).
+
+Se comporta como la tupla que devolvía `getSolarPosition`, así que el código que
+desempaqueta `times, azimuths, elevations, beta, alpha = resultado` sigue
+funcionando. Como tupla, `resultado[0]` es la columna de instantes y `len()` no
+está definido (no se confunden columnas con instantes): el número de instantes
+es `resultado.muestras`. Además:
+
+* `entre(inicio, fin)` y `por_indices(desde, hasta)` devuelven vistas de un
+  intervalo de tiempo sin copiar los datos;
+* `con_precision(dtype)` cambia la precisión de los ángulos;
+* `muestras` es el número de instantes y `nbytes` la memoria ocupada por las columnas;
+* `zona_horaria` indica en qué zona mostrar las horas (ver `a_hora_local`).
+
+`SimulationResult` es otro nombre de la misma clase.
+"""
+
+import numpy as np
+from Interfaz.efemerides import a_datetime64_utc
+from Interfaz.zonaHoraria import ZONA_HORARIA_POR_DEFECTO, a_hora_local
+
+COLUMNAS_RESULTADO = ("times", "azimuths", "elevations", "beta", "alpha")
+PRECISIONES = (np.float32, np.float64)
+
+
+class ResultadoSimulacion:
+    """
+    Columnas de una simulación respaldadas por arreglos contiguos de NumPy.
+
+    Args:
+        times (array-like): Instantes (`datetime64` en UTC o `datetime` con zona horaria), en orden creciente.
+        azimuths (array-like): Azimut del sol (en grados).
+        elevations (array-like): Elevación del sol (en grados).
+        beta (array-like): Ángulo de pitch (en grados).
+        alpha (array-like): Ángulo de roll (en grados).
+        dtype: Precisión de los ángulos, `np.float64` (por defecto) o `np.float32`.
+        zona_horaria (str): Zona horaria IANA en la que se muestran las horas.
+    """
+
+    __slots__ = COLUMNAS_RESULTADO + ("zona_horaria",)
+
+    def __init__(self, times, azimuths, elevations, beta, alpha, dtype=np.float64,
+                 zona_horaria=ZONA_HORARIA_POR_DEFECTO):
+        dtype = np.dtype(dtype)
+        if dtype.type not in PRECISIONES:
+            raise ValueError("La precisión de los ángulos debe ser float32 o float64.")
+        self.times = a_datetime64_utc(times)
+        angulos = [np.ascontiguousarray(columna, dtype=dtype) for columna in (azimuths, elevations, beta, alpha)]
+        if any(columna.shape != self.times.shape for columna in angulos):
+            raise ValueError("Todas las columnas deben tener la misma longitud.")
+        self.azimuths, self.elevations, self.beta, self.alpha = angulos
+        self.zona_horaria = zona_horaria
+
+    @classmethod
+    def desde_bloques(cls, bloques, dtype=np.float64, zona_horaria=ZONA_HORARIA_POR_DEFECTO):
+        """
+        Reúne en un resultado los bloques de `simular_por_bloques`.
+
+        Args:
+            bloques (iterable): Tuplas (times, azimuths, elevations, beta, alpha).
+            dtype: Precisión de los ángulos.
+            zona_horaria (str): Zona horaria IANA en la que se muestran las horas.
+
+        Returns:
+            ResultadoSimulacion: Resultado con todas las filas de los bloques.
+        """
+        dtype = np.dtype(dtype)
+        columnas = [[], [], [], [], []]
+        for bloque in bloques:
+            columnas[0].append(np.asarray(bloque[0], dtype="datetime64[ns]"))
+            for lista, columna in zip(columnas[1:], bloque[1:]):
+                lista.append(np.asarray(columna, dtype=dtype))
+        if not columnas[0]:
+            return cls(np.array([], dtype="datetime64[ns]"), *([np.array([], dtype=dtype)] * 4), dtype=dtype,
+                       zona_horaria=zona_horaria)
+        return cls(*(np.concatenate(lista) for lista in columnas), dtype=dtype, zona_horaria=zona_horaria)
+
+    # ------------------------------------------------------------------ interfaz de tupla
+
+    def __iter__(self):
+        # Permite desempacar el resultado como la tupla de cinco columnas de `getSolarPosition`
+        return iter(self.columnas)
+
+    def __getitem__(self, clave):
+        if isinstance(clave, str):
+            if clave not in COLUMNAS_RESULTADO:
+                raise KeyError(clave)
+            return getattr(self, clave)
+        return self.columnas[clave]
+
+    def __repr__(self):
+        if self.muestras:
+            intervalo = f"{self.times[0]} - {self.times[-1]} UTC"
+        else:
+            intervalo = "vacío"
+        return (f"ResultadoSimulacion({self.muestras} instantes, {intervalo}, {self.dtype.name}, "
+                f"{self.nbytes / 1024 ** 2:.2f} MiB, zona_horaria={self.zona_horaria!r})")
+
+    @property
+    def columnas(self):
+        """tuple: Las cinco columnas (times, azimuths, elevations, beta, alpha)."""
+        return self.times, self.azimuths, self.elevations, self.beta, self.alpha
+
+    @property
+    def muestras(self):
+        """int: Número de instantes."""
+        return self.times.size
+
+    @property
+    def dtype(self):
+        """np.dtype: Precisión de los ángulos."""
+        return self.azimuths.dtype
+
+    @property
+    def nbytes(self):
+        """int: Memoria ocupada por las columnas, en bytes."""
+        return sum(columna.nbytes for columna in self.columnas)
+
+    # ------------------------------------------------------------------ vistas y conversiones
+
+    def _vista(self, seleccion):
+        """Crea un resultado con las columnas recortadas por `seleccion` (sin copiar si es un `slice`)."""
+        vista = object.__new__(ResultadoSimulacion)
+        for nombre in COLUMNAS_RESULTADO:
+            setattr(vista, nombre, getattr(self, nombre)[seleccion])
+        vista.zona_horaria = self.zona_horaria
+        return vista
+
+    def por_indices(self, desde=None, hasta=None):
+        """
+        Devuelve las filas `desde:hasta` como vistas de las columnas, sin copiarlas.
+
+        Args:
+            desde (int, opcional): Primera fila.
+            hasta (int, opcional): Fila final (excluida).
+
+        Returns:
+            ResultadoSimulacion: Resultado que comparte memoria con este.
+        """
+        return self._vista(slice(desde, hasta))
+
+    def entre(self, inicio=None, fin=None):
+        """
+        Devuelve las filas del intervalo [inicio, fin) como vistas, sin copiar los datos.
+
+        Args:
+            inicio (opcional): Instante inicial (ver `a_instante_utc`; las fechas y horas sin zona
+                horaria se interpretan en `zona_horaria`).
+            fin (opcional): Instante final (excluido).
+
+        Returns:
+            ResultadoSimulacion: Resultado que comparte memoria con este.
+        """
+        from Interfaz.simulacionBloques import a_instante_utc
+
+        desde = None if inicio is None else int(np.searchsorted(
+            self.times, a_instante_utc(inicio, self.zona_horaria), side="left"))
+        hasta = None if fin is None else int(np.searchsorted(
+            self.times, a_instante_utc(fin, self.zona_horaria), side="left"))
+        return self.por_indices(desde, hasta)
+
+    def con_precision(self, dtype):
+        """
+        Devuelve el resultado con los ángulos en otra precisión (sin copiar si ya la tiene).
+
+        Args:
+            dtype: `np.float32` o `np.float64`.
+
+        Returns:
+            ResultadoSimulacion: Resultado con la precisión pedida.
+        """
+        return ResultadoSimulacion(*self.columnas, dtype=dtype, zona_horaria=self.zona_horaria)
+
+    def copia(self):
+        """ResultadoSimulacion: Copia independiente de las columnas."""
+        return ResultadoSimulacion(*(columna.copy() for columna in self.columnas), dtype=self.dtype,
+                                   zona_horaria=self.zona_horaria)
+
+    def a_hora_local(self):
+        """np.ndarray: Instantes en hora local de `zona_horaria` (`datetime64[ns]` sin zona horaria)."""
+        return a_hora_local(self.times, self.zona_horaria)
+
+    def a_diccionario(self):
+        """dict: Columna -> arreglo (sin copiar)."""
+        return dict(zip(COLUMNAS_RESULTADO, self.columnas))
+
+
+# Nombre en inglés, como `getSolarPosition`
+SimulationResult = ResultadoSimulacion
+
+
+def desempacar_resultado(tiempos, azimuts=None, elevaciones=None, beta=None, phi=None, zona_horaria=None):
+    """
+    Acepta un `ResultadoSimulacion` o las cinco columnas por separado.
+
+    Permite que las funciones de visualización y reporte reciban tanto
+    `funcion(resultado)` como `funcion(tiempos, azimuts, elevaciones, beta, phi)`.
+
+    Args:
+        tiempos (ResultadoSimulacion | array-like): Resultado completo o columna de instantes.
+        azimuts, elevaciones, beta, phi (array-like, opcional): Resto de columnas si `tiempos` no es un resultado.
+        zona_horaria (str, opcional): Zona horaria; por defecto, la del resultado o la del simulador.
+
+    Returns:
+        tuple: (tiempos, azimuts, elevaciones, beta, phi, zona_horaria).
+    """
+    if isinstance(tiempos, ResultadoSimulacion):
+        return (*tiempos.columnas, zona_horaria or tiempos.zona_horaria)
+    if any(columna is None for columna in (azimuts, elevaciones, beta, phi)):
+        raise TypeError("Se esperaba un ResultadoSimulacion o las cinco columnas de la simulación.")
+    return tiempos, azimuts, elevaciones, beta, phi, zona_horaria or ZONA_HORARIA_POR_DEFECTO
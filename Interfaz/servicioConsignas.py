@@ -0,0 +1,512 @@
+"""
+Módulo con el servicio de consignas en tiempo real para los controladores de seguidores.
+
+Usa el mismo cálculo de ángulos que la interfaz gráfica (`calcular_pitch_roll`
+sobre el motor de efemerides) para publicar el pitch y el roll que debe tener cada
+seguidor de una flota, a una frecuencia fija (por ejemplo, 1 Hz), por un socket
+local TCP o Unix.
+
+* El programa de consignas de las próximas horas se precalcula en una malla
+  uniforme y cada publicación solo interpola linealmente entre dos columnas, de
+  modo que el costo por ciclo no depende del motor de posición solar. Los seguidores
+  que comparten coordenadas comparten también su programa.
+* Antes de que el programa se agote se recalcula en segundo plano (en un hilo del
+  `executor` del bucle de eventos) y se reemplaza de una sola vez.
+* Cada mensaje se serializa una sola vez por ciclo y por suscripción distinta, y se
+  escribe a todos los suscriptores sin esperar a ninguno. Si un cliente no lee y su
+  búfer de salida supera `max_bufer`, sus mensajes se descartan en lugar de
+  acumularse; así la latencia del resto no depende de los clientes lentos.
+
+Protocolo (JSON por líneas): el cliente envía una línea con los seguidores que le
+interesan, `{"seguidores": ["fila_1", "fila_2"]}` (o `"*"`, o una línea vacía,
+para todos), y recibe en cada ciclo una línea como:
+
+    {"secuencia": 12, "instante": "2025-01-27T17:00:00.000Z",
+     "consignas": {"fila_1": [beta, alpha], "fila_2": [beta, alpha]}}
+
+Puede enviar otra línea de suscripción en cualquier momento para cambiarla.
+`ControladorSimulado` implementa el lado del cliente y sirve como controlador
+falso para pruebas.
+
+Uso:
+    python -m Interfaz.servicioConsignas --sitios sitios.csv --puerto 8765 --frecuencia 1
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import timedelta
+import numpy as np
+from Interfaz.calculoAngulos import calcular_pitch_roll
+from Interfaz.efemerides import obtener_backend
+from Interfaz.instrumentacion import contar, medir
+from Interfaz.simulacionBloques import a_paso
+from Interfaz.simulacionFlota import cargar_sitios, normalizar_sitios
+
+# Tamaño máximo de una línea del protocolo (una suscripción o un mensaje con miles de seguidores)
+LIMITE_LINEA = 16 * 1024 * 1024
+
+
+def calcular_programa(coordenadas, inicio_ns, horizonte=timedelta(hours=6), paso=timedelta(minutes=1),
+                      backend="numpy"):
+    """
+    Precalcula las consignas de pitch y roll de varias coordenadas en una malla uniforme.
+
+    Args:
+        coordenadas (list): Tuplas (latitud, longitud).
+        inicio_ns (int): Primer instante de la malla, en nanosegundos Unix (UTC).
+        horizonte (timedelta | float): Duración cubierta por el programa (número = minutos).
+        paso (timedelta | float): Paso de la malla (número = minutos).
+        backend (str | callable): Motor de posición solar.
+
+    Returns:
+        dict: `inicio` y `paso` (nanosegundos), `fin` (último instante de la malla) y
+            `angulos`, arreglo (coordenadas, instantes, 2) con beta y alpha en grados.
+    """
+    paso_ns = int(a_paso(paso).astype(np.int64))
+    horizonte_ns = int(a_paso(horizonte).astype(np.int64))
+    cantidad = max(2, -(-horizonte_ns // paso_ns) + 1)
+    tiempos = (inicio_ns + paso_ns * np.arange(cantidad, dtype=np.int64)).astype("datetime64[ns]")
+
+    calcular_posicion = obtener_backend(backend)
+    angulos = np.empty((len(coordenadas), cantidad, 2))
+    for indice, (latitud, longitud) in enumerate(coordenadas):
+        azimuths, elevations = calcular_posicion(tiempos, latitud, longitud)
+        angulos[indice, :, 0], angulos[indice, :, 1] = calcular_pitch_roll(azimuths, elevations)
+
+    return {"inicio": int(inicio_ns), "paso": paso_ns, "fin": int(inicio_ns) + paso_ns * (cantidad - 1),
+            "angulos": angulos}
+
+
+def interpolar_programa(programa, instante_ns):
+    """
+    Interpola linealmente las consignas de un programa en un instante.
+
+    Fuera de la malla se conserva el valor del extremo más cercano.
+
+    Args:
+        programa (dict): Programa devuelto por `calcular_programa`.
+        instante_ns (int): Instante en nanosegundos Unix (UTC).
+
+    Returns:
+        np.ndarray: Arreglo (coordenadas, 2) con beta y alpha en grados.
+    """
+    angulos = programa["angulos"]
+    desplazamiento = min(max(instante_ns - programa["inicio"], 0), programa["fin"] - programa["inicio"])
+    indice = min(desplazamiento // programa["paso"], angulos.shape[1] - 2)
+    fraccion = (desplazamiento - indice * programa["paso"]) / programa["paso"]
+    return angulos[:, indice] * (1.0 - fraccion) + angulos[:, indice + 1] * fraccion
+
+
+def _formatear_instante(instante_ns):
+    """Convierte nanosegundos Unix a una cadena ISO 8601 en UTC con milisegundos."""
+    return f"{np.datetime64(int(instante_ns), 'ns').astype('datetime64[ms]')}Z"
+
+
+class _Suscriptor:
+    """Conexión de un controlador y los seguidores a los que está suscrito."""
+
+    __slots__ = ("escritor", "seguidores")
+
+    def __init__(self, escritor, seguidores=None):
+        self.escritor = escritor
+        self.seguidores = seguidores  # None = todos; tupla de nombres en otro caso
+
+
+class ServicioConsignas:
+    """
+    Servicio asyncio que publica las consignas de pitch y roll de una flota de seguidores.
+
+    Args:
+        sitios (iterable): Seguidores a publicar (ver `normalizar_sitios`); el nombre
+            identifica al seguidor en el protocolo.
+        frecuencia (float): Publicaciones por segundo.
+        horizonte (timedelta | float): Duración de cada programa precalculado (número = minutos).
+        paso (timedelta | float): Paso de la malla del programa (número = minutos).
+        renovar_antes (timedelta | float): Tiempo antes del final del programa en que se
+            calcula el siguiente (número = minutos). Por defecto, la mitad del horizonte.
+        backend (str | callable): Motor de posición solar.
+        max_bufer (int): Bytes pendientes de envío a partir de los cuales se descartan
+            los mensajes de un suscriptor lento.
+        reloj (callable, opcional): Función sin argumentos que devuelve el instante actual
+            en nanosegundos Unix; por defecto, `time.time_ns`. Permite simular otra fecha.
+    """
+
+    def __init__(self, sitios, frecuencia: float = 1.0, horizonte=timedelta(hours=6), paso=timedelta(minutes=1),
+                 renovar_antes=None, backend="numpy", max_bufer: int = 256 * 1024, reloj=None):
+        if frecuencia <= 0:
+            raise ValueError("La frecuencia de publicación debe ser positiva.")
+        self.sitios = normalizar_sitios(sitios)
+        if not self.sitios:
+            raise ValueError("Se requiere al menos un seguidor.")
+        self.frecuencia = float(frecuencia)
+        self.horizonte = a_paso(horizonte)
+        self.paso = a_paso(paso)
+        self.renovar_antes = a_paso(renovar_antes) if renovar_antes is not None else self.horizonte // 2
+        if not self.paso < self.renovar_antes < self.horizonte:
+            raise ValueError("Se requiere paso < renovar_antes < horizonte.")
+        self.backend = backend
+        self.max_bufer = max_bufer
+        self.reloj = reloj or time.time_ns
+
+        # Coordenadas distintas y, para cada seguidor, la fila de su programa
+        coordenadas = {}
+        self._filas = np.array([coordenadas.setdefault((sitio["latitud"], sitio["longitud"]), len(coordenadas))
+                                for sitio in self.sitios])
+        self._coordenadas = list(coordenadas)
+        self._nombres = [sitio["nombre"] for sitio in self.sitios]
+
+        self.programa = None
+        self._suscriptores = set()
+        self._servidor = None
+        self._tareas = []
+        self._ultimo = None  # (secuencia, instante_ns, consignas) de la última publicación
+        self._estadisticas = {"publicaciones": 0, "mensajes": 0, "descartados": 0, "renovaciones": 0,
+                              "retraso_max_s": 0.0, "difusion_max_s": 0.0, "ultimo_error": None}
+
+    # ------------------------------------------------------------------ programa
+
+    async def _calcular_programa(self):
+        """Calcula en un hilo el programa que empieza en el instante actual y lo reemplaza."""
+        paso_ns = int(self.paso.astype(np.int64))
+        inicio_ns = self.reloj() // paso_ns * paso_ns
+        loop = asyncio.get_running_loop()
+        with medir("servicioConsignas.programa"):
+            self.programa = await loop.run_in_executor(
+                None, calcular_programa, self._coordenadas, inicio_ns, self.horizonte, self.paso, self.backend)
+        self._estadisticas["renovaciones"] += 1
+
+    async def _mantener_programa(self):
+        """Renueva el programa en segundo plano antes de que se agote."""
+        renovar_antes_ns = int(self.renovar_antes.astype(np.int64))
+        while True:
+            espera = (self.programa["fin"] - renovar_antes_ns - self.reloj()) / 1e9
+            await asyncio.sleep(max(espera, 0.0))
+            try:
+                await self._calcular_programa()
+            except Exception as error:  # Se reintenta; mientras tanto se sigue usando el programa anterior
+                self._estadisticas["ultimo_error"] = repr(error)
+                await asyncio.sleep(1.0)
+
+    def consignas(self, instante_ns=None):
+        """
+        Devuelve las consignas de todos los seguidores en un instante.
+
+        Args:
+            instante_ns (int, opcional): Instante en nanosegundos Unix; por defecto, el actual.
+
+        Returns:
+            dict: Nombre del seguidor -> (beta, alpha) en grados.
+        """
+        if self.programa is None:
+            raise RuntimeError("El servicio no tiene un programa calculado; llame antes a `iniciar`.")
+        valores = interpolar_programa(self.programa, self.reloj() if instante_ns is None else instante_ns)
+        valores = np.round(valores[self._filas], 3).tolist()
+        return dict(zip(self._nombres, map(tuple, valores)))
+
+    # ------------------------------------------------------------------ publicación
+
+    def _mensaje(self, secuencia, instante, consignas, seguidores=None):
+        """Serializa un mensaje para un conjunto de seguidores (None = todos)."""
+        if seguidores is not None:
+            consignas = {nombre: consignas[nombre] for nombre in seguidores}
+        return (json.dumps({"secuencia": secuencia, "instante": instante, "consignas": consignas},
+                           separators=(",", ":")) + "\n").encode()
+
+    def _enviar(self, suscriptor, datos):
+        """Escribe un mensaje sin esperar; lo descarta si el cliente no está leyendo."""
+        transporte = suscriptor.escritor.transport
+        if transporte.is_closing():
+            self._suscriptores.discard(suscriptor)
+        elif transporte.get_write_buffer_size() > self.max_bufer:
+            self._estadisticas["descartados"] += 1
+        else:
+            suscriptor.escritor.write(datos)
+            self._estadisticas["mensajes"] += 1
+
+    def publicar(self):
+        """Calcula las consignas actuales y las envía a todos los suscriptores."""
+        with medir("servicioConsignas.publicacion"):
+            inicio = time.perf_counter()
+            secuencia = self._estadisticas["publicaciones"]
+            instante_ns = self.reloj()
+            consignas = self.consignas(instante_ns)
+            instante = _formatear_instante(instante_ns)
+            self._ultimo = (secuencia, instante, consignas)
+
+            # Un solo mensaje serializado por suscripción distinta
+            mensajes = {}
+            for suscriptor in list(self._suscriptores):
+                datos = mensajes.get(suscriptor.seguidores)
+                if datos is None:
+                    datos = mensajes[suscriptor.seguidores] = self._mensaje(secuencia, instante, consignas,
+                                                                            suscriptor.seguidores)
+                self._enviar(suscriptor, datos)
+
+            self._estadisticas["publicaciones"] += 1
+            self._estadisticas["difusion_max_s"] = max(self._estadisticas["difusion_max_s"],
+                                                       time.perf_counter() - inicio)
+        contar("servicioConsignas.mensajes", len(self._suscriptores))
+
+    async def _bucle_publicacion(self):
+        """Publica a la frecuencia configurada, sin acumular deriva."""
+        loop = asyncio.get_running_loop()
+        periodo = 1.0 / self.frecuencia
+        siguiente = loop.time()
+        while True:
+            self.publicar()
+            siguiente += periodo
+            retraso = loop.time() - siguiente
+            if retraso > 0:
+                # Ciclo atrasado (bucle saturado): se registra y se salta a la siguiente marca
+                self._estadisticas["retraso_max_s"] = max(self._estadisticas["retraso_max_s"], retraso)
+                siguiente += periodo * (retraso // periodo + 1)
+            await asyncio.sleep(siguiente - loop.time())
+
+    # ------------------------------------------------------------------ conexiones
+
+    def _leer_suscripcion(self, linea):
+        """Interpreta una línea de suscripción; devuelve None (todos) o una tupla de nombres."""
+        texto = linea.strip()
+        if not texto:
+            return None
+        suscripcion = json.loads(texto)
+        if not isinstance(suscripcion, dict):
+            raise ValueError('La suscripción debe ser un objeto JSON como {"seguidores": [...]}.')
+        seguidores = suscripcion.get("seguidores", "*")
+        if seguidores == "*":
+            return None
+        if isinstance(seguidores, str):
+            seguidores = [seguidores]
+        if not isinstance(seguidores, list) or not all(isinstance(nombre, str) for nombre in seguidores):
+            raise ValueError('"seguidores" debe ser "*", un nombre o una lista de nombres.')
+        desconocidos = set(seguidores) - set(self._nombres)
+        if desconocidos:
+            raise ValueError(f"Seguidores desconocidos: {', '.join(sorted(map(str, desconocidos)))}")
+        return tuple(seguidores)
+
+    async def _atender(self, lector, escritor):
+        """Atiende a un controlador: registra su suscripción y la actualiza con cada línea que envía."""
+        suscriptor = None
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                try:
+                    seguidores = self._leer_suscripcion(linea.decode())
+                except ValueError as error:
+                    escritor.write((json.dumps({"error": str(error)}) + "\n").encode())
+                    continue
+
+                if suscriptor is None:
+                    suscriptor = _Suscriptor(escritor, seguidores)
+                    self._suscriptores.add(suscriptor)
+                else:
+                    suscriptor.seguidores = seguidores
+
+                # La consigna vigente se envía de inmediato, sin esperar al siguiente ciclo
+                if self._ultimo is not None:
+                    self._enviar(suscriptor, self._mensaje(*self._ultimo, seguidores))
+        except (ConnectionError, asyncio.LimitOverrunError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Conexión perdida o servicio detenido: solo se da de baja al suscriptor
+            pass
+        finally:
+            self._suscriptores.discard(suscriptor)
+            escritor.close()
+
+    async def iniciar(self, host: str = "127.0.0.1", puerto: int = 0, ruta_unix=None):
+        """
+        Calcula el primer programa y empieza a aceptar conexiones y a publicar.
+
+        Args:
+            host (str): Dirección local donde escuchar (solo TCP).
+            puerto (int): Puerto TCP; 0 elige uno libre.
+            ruta_unix (str, opcional): Si se indica, escucha en este socket Unix en lugar de TCP.
+
+        Returns:
+            tuple | str: Dirección (host, puerto) del socket TCP, o la ruta del socket Unix.
+        """
+        await self._calcular_programa()
+        if ruta_unix:
+            self._servidor = await asyncio.start_unix_server(self._atender, path=ruta_unix, limit=LIMITE_LINEA)
+            direccion = ruta_unix
+        else:
+            self._servidor = await asyncio.start_server(self._atender, host, puerto, limit=LIMITE_LINEA,
+                                                        backlog=4096)
+            direccion = self._servidor.sockets[0].getsockname()[:2]
+        self._tareas = [asyncio.create_task(self._bucle_publicacion()),
+                        asyncio.create_task(self._mantener_programa())]
+        return direccion
+
+    async def detener(self):
+        """Deja de publicar y cierra todas las conexiones."""
+        for tarea in self._tareas:
+            tarea.cancel()
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+        self._tareas = []
+        if self._servidor is not None:
+            self._servidor.close()
+            for suscriptor in list(self._suscriptores):
+                suscriptor.escritor.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+        self._suscriptores.clear()
+
+    async def __aenter__(self):
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, *excepcion):
+        await self.detener()
+
+    def estadisticas(self):
+        """
+        Devuelve las métricas del servicio.
+
+        Returns:
+            dict: Suscriptores conectados, publicaciones, mensajes enviados y descartados,
+                renovaciones del programa, mayor retraso de un ciclo y mayor tiempo de difusión
+                (en segundos) y el último error al renovar el programa.
+        """
+        return {"suscriptores": len(self._suscriptores), **self._estadisticas}
+
+
+class ControladorSimulado:
+    """
+    Cliente del servicio de consignas que se comporta como un controlador de seguidores.
+
+    Guarda la última consigna recibida de cada seguidor y la latencia de cada mensaje
+    (medida con el reloj del sistema, por lo que solo tiene sentido si el servicio usa
+    el reloj real). Sirve para pruebas y demostraciones sin hardware.
+
+    Args:
+        seguidores (str | list): Seguidores a los que suscribirse ("*" = todos).
+        host (str): Dirección del servicio (TCP).
+        puerto (int): Puerto del servicio (TCP).
+        ruta_unix (str, opcional): Socket Unix del servicio, en lugar de TCP.
+    """
+
+    def __init__(self, seguidores="*", host: str = "127.0.0.1", puerto: int = 8765, ruta_unix=None):
+        self.seguidores = seguidores
+        self.host = host
+        self.puerto = puerto
+        self.ruta_unix = ruta_unix
+        self.consignas = {}
+        self.latencias = []
+        self.recibidos = 0
+        self._lector = None
+        self._escritor = None
+
+    async def conectar(self):
+        """Se conecta al servicio y envía la suscripción."""
+        if self.ruta_unix:
+            self._lector, self._escritor = await asyncio.open_unix_connection(self.ruta_unix, limit=LIMITE_LINEA)
+        else:
+            self._lector, self._escritor = await asyncio.open_connection(self.host, self.puerto, limit=LIMITE_LINEA)
+        await self.suscribir(self.seguidores)
+        return self
+
+    async def suscribir(self, seguidores):
+        """Cambia los seguidores a los que está suscrito el controlador."""
+        self.seguidores = seguidores
+        self._escritor.write((json.dumps({"seguidores": seguidores}) + "\n").encode())
+        await self._escritor.drain()
+
+    async def recibir(self, tiempo_limite: float = 5.0):
+        """
+        Espera el siguiente mensaje del servicio y actualiza las consignas.
+
+        Args:
+            tiempo_limite (float): Segundos máximos de espera.
+
+        Returns:
+            dict: Mensaje recibido.
+        """
+        linea = await asyncio.wait_for(self._lector.readline(), tiempo_limite)
+        if not linea:
+            raise ConnectionError("El servicio cerró la conexión.")
+        mensaje = json.loads(linea)
+        if "error" in mensaje:
+            raise ValueError(mensaje["error"])
+        instante_ns = int(np.datetime64(mensaje["instante"].rstrip("Z"), "ns").astype(np.int64))
+        self.latencias.append((time.time_ns() - instante_ns) / 1e9)
+        self.consignas.update({nombre: tuple(valor) for nombre, valor in mensaje["consignas"].items()})
+        self.recibidos += 1
+        return mensaje
+
+    async def escuchar(self, cantidad: int, tiempo_limite: float = 5.0):
+        """Recibe `cantidad` mensajes y los devuelve en una lista."""
+        return [await self.recibir(tiempo_limite) for _ in range(cantidad)]
+
+    async def cerrar(self):
+        """Cierra la conexión con el servicio."""
+        if self._escritor is not None:
+            self._escritor.close()
+            try:
+                await self._escritor.wait_closed()
+            except ConnectionError:
+                pass
+            self._escritor = None
+
+    async def __aenter__(self):
+        return await self.conectar()
+
+    async def __aexit__(self, *excepcion):
+        await self.cerrar()
+
+
+async def servir(sitios, host="127.0.0.1", puerto=8765, ruta_unix=None, **opciones):
+    """
+    Ejecuta el servicio de consignas hasta que se cancele.
+
+    Args:
+        sitios (iterable): Seguidores a publicar (ver `ServicioConsignas`).
+        host (str): Dirección local donde escuchar.
+        puerto (int): Puerto TCP.
+        ruta_unix (str, opcional): Socket Unix en lugar de TCP.
+        **opciones: Argumentos adicionales de `ServicioConsignas`.
+    """
+    servicio = ServicioConsignas(sitios, **opciones)
+    direccion = await servicio.iniciar(host, puerto, ruta_unix)
+    print(f"Publicando consignas de {len(servicio.sitios)} seguidores en {direccion} "
+          f"a {servicio.frecuencia:g} Hz")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servicio.detener()
+
+
+def main(argv=None):
+    """Punto de entrada para ejecutar el servicio desde la línea de comandos."""
+    def leer_sitio(texto):
+        return normalizar_sitios([[parte.strip() for parte in texto.split(",")]])[0]
+
+    parser = argparse.ArgumentParser(description="Servicio de consignas en tiempo real para seguidores solares.")
+    parser.add_argument("--sitios", help="CSV con columnas nombre, latitud, longitud[, zona_horaria]")
+    parser.add_argument("--sitio", action="append", type=leer_sitio, default=[],
+                        help='Seguidor "nombre,latitud,longitud[,zona_horaria]" (se puede repetir)')
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección local donde escuchar")
+    parser.add_argument("--puerto", type=int, default=8765, help="Puerto TCP")
+    parser.add_argument("--unix", help="Socket Unix donde escuchar en lugar de TCP")
+    parser.add_argument("--frecuencia", type=float, default=1.0, help="Publicaciones por segundo")
+    parser.add_argument("--horizonte", type=float, default=360, help="Minutos cubiertos por cada programa")
+    parser.add_argument("--paso", type=float, default=1, help="Paso del programa en minutos")
+    parser.add_argument("--backend", default="numpy", help="Motor de posición solar")
+    args = parser.parse_args(argv)
+
+    sitios = (cargar_sitios(args.sitios) if args.sitios else []) + args.sitio
+    if not sitios:
+        parser.error("Indique al menos un seguidor con --sitios o --sitio.")
+    try:
+        asyncio.run(servir(sitios, args.host, args.puerto, args.unix, frecuencia=args.frecuencia,
+                           horizonte=args.horizonte, paso=args.paso, backend=args.backend))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
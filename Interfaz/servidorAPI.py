@@ -0,0 +1,471 @@
+"""
+Módulo con una API HTTP local que entrega programas de ángulos en JSON o en binario.
+
+Permite que otras herramientas consulten la simulación del seguidor solar sin
+abrir la interfaz gráfica ni depender de servicios externos (solo la biblioteca
+estándar y NumPy).
+
+* `GET /posicion`: simulación entre dos instantes para un sitio. Parámetros:
+  `inicio` y `fin` (fechas u horas locales "YYYY-MM-DD[THH:MM]"), o bien `fecha`,
+  `hora_inicio` y `hora_fin` como en `getSolarPosition`; `sitio` (nombre de la tabla
+  de sitios) o `latitud`, `longitud` y `zona_horaria`; `paso` en minutos; `backend`;
+  `columnas` separadas por comas; y `formato`: `json` (por defecto) o `npy`, un arreglo
+  estructurado de NumPy que se lee con `np.load(io.BytesIO(respuesta))`.
+* `GET /sitios`: sitios configurados.
+* `GET /estadisticas`: solicitudes atendidas y contadores de la caché de respuestas.
+* `GET /salud`: comprobación de que el servidor responde.
+
+Las respuestas ya codificadas se guardan en una `CacheLRU`, con la consulta
+normalizada como clave, de modo que las consultas repetidas no vuelven a
+simular ni a serializar. Las consultas idénticas que llegan a la vez se calculan
+una sola vez. Las conexiones se atienden en un grupo fijo de hilos.
+
+`prueba_carga` mide la latencia y el rendimiento de un servidor en marcha, y
+`ejecutar_prueba_carga` levanta uno local y mide varios escenarios.
+
+Uso:
+    python -m Interfaz.servidorAPI --puerto 8080 --trabajadores 8 --sitios sitios.csv
+    python -m Interfaz.servidorAPI --prueba-carga --solicitudes 2000 --concurrencia 16
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import http.client
+import io
+import json
+import sys
+import threading
+import time
+import numpy as np
+from Interfaz.cacheSimulacion import CacheLRU
+from Interfaz.exportarResultados import COLUMNAS
+from Interfaz.instrumentacion import contar, medir
+from Interfaz.simulacionBloques import a_instante_utc, a_paso, contar_instantes, simular_por_bloques
+from Interfaz.simulacionFlota import cargar_sitios, normalizar_sitios
+
+FORMATOS_API = ("json", "npy")
+TIPOS_CONTENIDO = {"json": "application/json", "npy": "application/x-npy"}
+
+# Límite de instantes por consulta (un año a 1 minuto), para acotar memoria y tiempo de respuesta
+MAX_INSTANTES = 526_000
+
+# Sitio por defecto (Quito), igual que en `getSolarPosition`
+SITIO_POR_DEFECTO = {"nombre": "quito", "latitud": -0.2105367, "longitud": -78.491614,
+                     "zona_horaria": "America/Guayaquil"}
+
+
+class ErrorConsulta(ValueError):
+    """Consulta con parámetros inválidos; se responde con el código HTTP indicado."""
+
+    def __init__(self, mensaje, codigo=400):
+        super().__init__(mensaje)
+        self.codigo = codigo
+
+
+def _valor(parametros, nombre, por_defecto=None):
+    """Devuelve el último valor de un parámetro de la consulta, o `por_defecto`."""
+    valores = parametros.get(nombre)
+    return valores[-1] if valores else por_defecto
+
+
+def normalizar_consulta(parametros, sitios):
+    """
+    Convierte los parámetros de `/posicion` en una consulta con tipos uniformes.
+
+    Args:
+        parametros (dict): Parámetros de la URL (nombre -> lista de valores).
+        sitios (dict): Sitios configurados por nombre.
+
+    Returns:
+        tuple: Consulta hashable (inicio UTC, fin UTC, paso, latitud, longitud,
+            zona horaria, backend, columnas, formato) usada también como clave de caché.
+    """
+    try:
+        nombre_sitio = _valor(parametros, "sitio")
+        if nombre_sitio is not None:
+            if nombre_sitio not in sitios:
+                raise ErrorConsulta(f"Sitio desconocido: {nombre_sitio!r}", 404)
+            sitio = sitios[nombre_sitio]
+        else:
+            sitio = SITIO_POR_DEFECTO
+        latitud = float(_valor(parametros, "latitud", sitio["latitud"]))
+        longitud = float(_valor(parametros, "longitud", sitio["longitud"]))
+        zona_horaria = _valor(parametros, "zona_horaria", sitio["zona_horaria"])
+        if not (-90 <= latitud <= 90 and -180 <= longitud <= 180):
+            raise ErrorConsulta("Coordenadas fuera de rango.")
+
+        # Intervalo: inicio/fin, o fecha con horas enteras como en getSolarPosition
+        if "fecha" in parametros:
+            fecha = _valor(parametros, "fecha")
+            inicio = f"{fecha} {int(_valor(parametros, 'hora_inicio', 0)):02d}:00"
+            hora_fin = int(_valor(parametros, "hora_fin", 24))
+            fin = (datetime.fromisoformat(fecha) + timedelta(hours=hora_fin)).isoformat(sep=" ")
+        elif "inicio" in parametros and "fin" in parametros:
+            inicio, fin = _valor(parametros, "inicio"), _valor(parametros, "fin")
+        else:
+            raise ErrorConsulta("Indique `inicio` y `fin`, o `fecha`, `hora_inicio` y `hora_fin`.")
+        inicio_utc = a_instante_utc(inicio, zona_horaria)
+        fin_utc = a_instante_utc(fin, zona_horaria)
+        paso = a_paso(float(_valor(parametros, "paso", 10)))
+        instantes = contar_instantes(inicio_utc, fin_utc, paso)
+    except ErrorConsulta:
+        raise
+    except (ValueError, TypeError, KeyError, OverflowError) as error:
+        raise ErrorConsulta(f"Parámetros inválidos: {error}") from error
+    except Exception as error:  # Por ejemplo, una zona horaria desconocida de pytz
+        raise ErrorConsulta(f"Parámetros inválidos: {error!r}") from error
+
+    if instantes == 0:
+        raise ErrorConsulta("El final debe ser posterior al inicio.")
+    if instantes > MAX_INSTANTES:
+        raise ErrorConsulta(f"La consulta tiene {instantes} instantes; el máximo es {MAX_INSTANTES}.", 413)
+
+    backend = _valor(parametros, "backend", "numpy")
+    if backend not in ("numpy", "pysolar"):
+        raise ErrorConsulta("El backend debe ser 'numpy' o 'pysolar'.")
+    columnas = tuple(_valor(parametros, "columnas", ",".join(COLUMNAS)).split(","))
+    if not columnas or set(columnas) - set(COLUMNAS):
+        raise ErrorConsulta(f"Columnas válidas: {', '.join(COLUMNAS)}.")
+    formato = _valor(parametros, "formato", "json")
+    if formato not in FORMATOS_API:
+        raise ErrorConsulta(f"Formatos válidos: {', '.join(FORMATOS_API)}.")
+
+    return (int(inicio_utc.astype(np.int64)), int(fin_utc.astype(np.int64)), int(paso.astype(np.int64)),
+            latitud, longitud, zona_horaria, backend, columnas, formato)
+
+
+def simular_consulta(consulta):
+    """
+    Simula una consulta normalizada y codifica la respuesta.
+
+    Args:
+        consulta (tuple): Consulta devuelta por `normalizar_consulta`.
+
+    Returns:
+        bytes: Cuerpo de la respuesta en el formato pedido.
+    """
+    inicio_ns, fin_ns, paso_ns, latitud, longitud, zona_horaria, backend, columnas, formato = consulta
+    inicio, fin = np.datetime64(inicio_ns, "ns"), np.datetime64(fin_ns, "ns")
+    with medir("servidorAPI.simulacion"):
+        bloques = list(simular_por_bloques(inicio, fin, np.timedelta64(paso_ns, "ns"), latitud, longitud,
+                                           backend=backend))
+        resultado = dict(zip(COLUMNAS, (np.concatenate(columna) for columna in zip(*bloques))))
+
+    with medir("servidorAPI.codificacion"):
+        if formato == "npy":
+            tabla = np.empty(resultado["times"].size, dtype=[(nombre, resultado[nombre].dtype) for nombre in columnas])
+            for nombre in columnas:
+                tabla[nombre] = resultado[nombre]
+            salida = io.BytesIO()
+            np.save(salida, tabla, allow_pickle=False)
+            return salida.getvalue()
+
+        datos = {}
+        for nombre in columnas:
+            if nombre == "times":
+                datos[nombre] = np.datetime_as_string(resultado[nombre], unit="s", timezone="UTC").tolist()
+            else:
+                datos[nombre] = np.round(resultado[nombre], 6).tolist()
+        cuerpo = {"latitud": latitud, "longitud": longitud, "zona_horaria": zona_horaria,
+                  "paso_minutos": paso_ns / 60e9, "instantes": int(resultado["times"].size), "columnas": datos}
+        return json.dumps(cuerpo, separators=(",", ":")).encode()
+
+
+class _ManejadorAPI(BaseHTTPRequestHandler):
+    """Atiende una solicitud HTTP de la API."""
+
+    server_version = "SeguidorSolarAPI/1.0"
+
+    def do_GET(self):
+        inicio = time.perf_counter()
+        url = urlsplit(self.path)
+        try:
+            if url.path == "/posicion":
+                cuerpo, tipo, en_cache = self.server.responder_posicion(parse_qs(url.query))
+                self._responder(200, cuerpo, tipo, {"X-Cache": "acierto" if en_cache else "fallo"})
+            elif url.path == "/sitios":
+                self._responder_json(200, list(self.server.sitios.values()))
+            elif url.path == "/estadisticas":
+                self._responder_json(200, self.server.estadisticas())
+            elif url.path == "/salud":
+                self._responder_json(200, {"estado": "ok"})
+            else:
+                self._responder_json(404, {"error": f"Ruta desconocida: {url.path}"})
+        except ErrorConsulta as error:
+            self._responder_json(error.codigo, {"error": str(error)})
+        except Exception as error:
+            self._responder_json(500, {"error": repr(error)})
+        finally:
+            self.server.registrar_solicitud(time.perf_counter() - inicio)
+
+    def _responder_json(self, codigo, datos):
+        self._responder(codigo, json.dumps(datos).encode(), TIPOS_CONTENIDO["json"])
+        if codigo >= 400:
+            self.server.registrar_error()
+
+    def _responder(self, codigo, cuerpo, tipo, cabeceras=None):
+        self.send_response(codigo)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        for nombre, valor in (cabeceras or {}).items():
+            self.send_header(nombre, valor)
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        # Sin una línea por solicitud en la consola; las métricas están en /estadisticas
+        pass
+
+
+class ServidorAPI(HTTPServer):
+    """
+    Servidor HTTP de la API que atiende las conexiones en un grupo fijo de hilos.
+
+    Args:
+        direccion (tuple): (host, puerto) donde escuchar; el puerto 0 elige uno libre.
+        sitios (iterable, opcional): Sitios consultables por nombre (ver `normalizar_sitios`).
+        trabajadores (int): Hilos que atienden solicitudes a la vez.
+        cache (CacheLRU, opcional): Caché de respuestas; por defecto, 256 entradas o 256 MiB.
+    """
+
+    request_queue_size = 1024
+
+    def __init__(self, direccion, sitios=None, trabajadores: int = 8, cache=None):
+        super().__init__(direccion, _ManejadorAPI)
+        self.sitios = {sitio["nombre"]: sitio for sitio in normalizar_sitios(sitios or [])}
+        self.cache = cache if cache is not None else CacheLRU(max_entradas=256, max_bytes=256 * 1024 ** 2)
+        self.trabajadores = trabajadores
+        self._grupo = ThreadPoolExecutor(trabajadores, thread_name_prefix="servidorAPI")
+        self._bloqueo = threading.Lock()
+        self._en_curso = {}  # consulta -> Future de las consultas que se están calculando
+        self._solicitudes = 0
+        self._errores = 0
+        self._tiempo_total = 0.0
+
+    def process_request(self, request, client_address):
+        # En lugar de un hilo nuevo por conexión, la conexión espera turno en el grupo
+        self._grupo.submit(self._procesar, request, client_address)
+
+    def _procesar(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._grupo.shutdown(wait=True)
+
+    def responder_posicion(self, parametros):
+        """
+        Resuelve una consulta de `/posicion`, desde la caché si es posible.
+
+        Args:
+            parametros (dict): Parámetros de la URL.
+
+        Returns:
+            tuple: (cuerpo, tipo de contenido, si vino de la caché).
+        """
+        consulta = normalizar_consulta(parametros, self.sitios)
+        tipo = TIPOS_CONTENIDO[consulta[-1]]
+        encontrado, cuerpo = self.cache.obtener(consulta)
+        if encontrado:
+            contar("servidorAPI.aciertos")
+            return cuerpo, tipo, True
+
+        # Si la misma consulta ya se está calculando, se espera ese resultado
+        with self._bloqueo:
+            futuro = self._en_curso.get(consulta)
+            propio = futuro is None
+            if propio:
+                futuro = self._en_curso[consulta] = Future()
+        if not propio:
+            return futuro.result(), tipo, True
+
+        try:
+            cuerpo = simular_consulta(consulta)
+            self.cache.guardar(consulta, cuerpo, tamano=len(cuerpo))
+            futuro.set_result(cuerpo)
+        except BaseException as error:
+            futuro.set_exception(error)
+            raise
+        finally:
+            with self._bloqueo:
+                del self._en_curso[consulta]
+        contar("servidorAPI.fallos")
+        return cuerpo, tipo, False
+
+    def registrar_solicitud(self, segundos):
+        """Acumula una solicitud atendida y su duración."""
+        with self._bloqueo:
+            self._solicitudes += 1
+            self._tiempo_total += segundos
+
+    def registrar_error(self):
+        """Cuenta una respuesta con código de error."""
+        with self._bloqueo:
+            self._errores += 1
+
+    def estadisticas(self):
+        """
+        Devuelve las métricas del servidor.
+
+        Returns:
+            dict: Solicitudes, errores, tiempo medio de servicio y contadores de la caché.
+        """
+        with self._bloqueo:
+            media = self._tiempo_total / self._solicitudes if self._solicitudes else 0.0
+            datos = {"solicitudes": self._solicitudes, "errores": self._errores, "media_ms": media * 1000,
+                     "trabajadores": self.trabajadores}
+        datos["cache"] = self.cache.estadisticas()
+        return datos
+
+
+def iniciar_servidor(host="127.0.0.1", puerto=8080, sitios=None, trabajadores=8, cache=None):
+    """
+    Arranca un servidor de la API en un hilo en segundo plano.
+
+    Args:
+        host (str): Dirección donde escuchar.
+        puerto (int): Puerto; 0 elige uno libre (ver `server_address`).
+        sitios (iterable, opcional): Sitios consultables por nombre.
+        trabajadores (int): Hilos que atienden solicitudes.
+        cache (CacheLRU, opcional): Caché de respuestas.
+
+    Returns:
+        ServidorAPI: Servidor en marcha; se detiene con `shutdown()` y `server_close()`.
+    """
+    servidor = ServidorAPI((host, puerto), sitios, trabajadores, cache)
+    threading.Thread(target=servidor.serve_forever, name="servidorAPI", daemon=True).start()
+    return servidor
+
+
+def prueba_carga(host, puerto, rutas, solicitudes: int = 1000, concurrencia: int = 16):
+    """
+    Envía muchas solicitudes concurrentes a un servidor y mide latencia y rendimiento.
+
+    Args:
+        host (str): Dirección del servidor.
+        puerto (int): Puerto del servidor.
+        rutas (list): Rutas a consultar (con su consulta), repartidas de forma cíclica.
+        solicitudes (int): Número total de solicitudes.
+        concurrencia (int): Clientes simultáneos.
+
+    Returns:
+        dict: Solicitudes, errores, duración, solicitudes por segundo y percentiles de la
+            latencia (p50, p90, p99 y máximo) en milisegundos.
+    """
+    def solicitar(indice):
+        inicio = time.perf_counter()
+        conexion = http.client.HTTPConnection(host, puerto, timeout=60)
+        try:
+            conexion.request("GET", rutas[indice % len(rutas)])
+            respuesta = conexion.getresponse()
+            respuesta.read()
+            correcto = respuesta.status == 200
+        except OSError:
+            correcto = False
+        finally:
+            conexion.close()
+        return time.perf_counter() - inicio, correcto
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(concurrencia) as clientes:
+        mediciones = list(clientes.map(solicitar, range(solicitudes)))
+    duracion = time.perf_counter() - inicio
+
+    latencias = np.array([latencia for latencia, _ in mediciones]) * 1000
+    p50, p90, p99 = np.percentile(latencias, [50, 90, 99])
+    return {
+        "solicitudes": solicitudes,
+        "concurrencia": concurrencia,
+        "errores": sum(not correcto for _, correcto in mediciones),
+        "duracion_s": duracion,
+        "solicitudes_por_segundo": solicitudes / duracion,
+        "p50_ms": float(p50),
+        "p90_ms": float(p90),
+        "p99_ms": float(p99),
+        "max_ms": float(latencias.max()),
+    }
+
+
+def ejecutar_prueba_carga(solicitudes: int = 1000, concurrencia: int = 16, trabajadores: int = 8):
+    """
+    Levanta un servidor local y mide varios escenarios de carga.
+
+    * `cache`: la misma consulta de un día a 10 minutos (JSON), servida desde la caché.
+    * `sin_cache`: un día distinto en cada solicitud, que obliga a simular y serializar.
+    * `binario`: como `cache` pero con un año a 10 minutos en formato `npy`.
+
+    Args:
+        solicitudes (int): Solicitudes por escenario.
+        concurrencia (int): Clientes simultáneos.
+        trabajadores (int): Hilos del servidor.
+
+    Returns:
+        dict: Resultados de `prueba_carga` por escenario.
+    """
+    servidor = iniciar_servidor(puerto=0, trabajadores=trabajadores,
+                                cache=CacheLRU(max_entradas=4 * solicitudes, max_bytes=512 * 1024 ** 2))
+    host, puerto = servidor.server_address[:2]
+    primer_dia = datetime(2020, 1, 1)
+    escenarios = {
+        "cache": ["/posicion?fecha=2025-01-27&hora_inicio=6&hora_fin=18&paso=10"],
+        "sin_cache": [f"/posicion?fecha={(primer_dia + timedelta(days=dia)).date()}&hora_inicio=6&hora_fin=18&paso=10"
+                      for dia in range(solicitudes)],
+        "binario": ["/posicion?inicio=2025-01-01&fin=2026-01-01&paso=10&formato=npy"],
+    }
+    try:
+        return {nombre: prueba_carga(host, puerto, rutas, solicitudes, concurrencia)
+                for nombre, rutas in escenarios.items()}
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+def main(argv=None):
+    """Punto de entrada para ejecutar el servidor o la prueba de carga desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="API HTTP local del simulador de seguidor solar.")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección donde escuchar")
+    parser.add_argument("--puerto", type=int, default=8080, help="Puerto HTTP")
+    parser.add_argument("--trabajadores", type=int, default=8, help="Hilos que atienden solicitudes")
+    parser.add_argument("--sitios", help="CSV con columnas nombre, latitud, longitud[, zona_horaria]")
+    parser.add_argument("--prueba-carga", action="store_true",
+                        help="Levantar un servidor local, medir latencia y rendimiento, y salir")
+    parser.add_argument("--solicitudes", type=int, default=1000, help="Solicitudes por escenario de la prueba")
+    parser.add_argument("--concurrencia", type=int, default=16, help="Clientes simultáneos de la prueba")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados de la prueba")
+    args = parser.parse_args(argv)
+
+    if args.prueba_carga:
+        resultados = ejecutar_prueba_carga(args.solicitudes, args.concurrencia, args.trabajadores)
+        for nombre, medicion in resultados.items():
+            print(f"{nombre:<10} {medicion['solicitudes_por_segundo']:10.1f} solicitudes/s  "
+                  f"p50 {medicion['p50_ms']:8.2f} ms  p90 {medicion['p90_ms']:8.2f} ms  "
+                  f"p99 {medicion['p99_ms']:8.2f} ms  errores {medicion['errores']}")
+        if args.salida:
+            with open(args.salida, "w", encoding="utf-8") as archivo:
+                json.dump(resultados, archivo, indent=2)
+            print(f"Resultados guardados en {args.salida}")
+        return 0
+
+    servidor = ServidorAPI((args.host, args.puerto), cargar_sitios(args.sitios) if args.sitios else None,
+                           args.trabajadores)
+    print(f"API escuchando en http://{args.host}:{servidor.server_address[1]} "
+          f"con {args.trabajadores} trabajadores")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Módulo para simular intervalos largos de tiempo por bloques.
+
+`getSolarPosition` cubre un solo día entre dos horas enteras y devuelve todos
+los resultados juntos. Este módulo permite recorrer intervalos arbitrarios
+(meses, años o décadas) entregando los resultados en bloques de tamaño fijo,
+de modo que un consumidor puede procesar la simulación con memoria constante.
+"""
+
+from datetime import date, datetime, timedelta
+import numpy as np
+import pytz
+from Interfaz.efemerides import obtener_backend
+from Interfaz.calculoAngulos import calcular_pitch_roll
+from Interfaz.eventosSolares import en_intervalos, intervalos_diurnos
+
+# Cantidad de instantes por bloque (un año a 1 minuto son unos 525 600 instantes)
+TAMANO_BLOQUE_SIMULACION = 100_000
+
+
+def a_instante_utc(instante, zona_horaria="America/Guayaquil"):
+    """
+    Convierte un instante a `datetime64[ns]` en UTC.
+
+    Args:
+        instante (datetime | date | str | np.datetime64): Instante a convertir. Las fechas,
+            cadenas "YYYY-MM-DD[ HH:MM]" y `datetime` sin zona horaria se interpretan
+            en `zona_horaria`; los `np.datetime64` se asumen en UTC.
+        zona_horaria (str): Zona horaria IANA para interpretar los instantes locales.
+
+    Returns:
+        np.datetime64: Instante en UTC con resolución de nanosegundos.
+    """
+    if isinstance(instante, np.datetime64):
+        return instante.astype("datetime64[ns]")
+    if isinstance(instante, str):
+        instante = datetime.fromisoformat(instante.strip())
+    elif isinstance(instante, date) and not isinstance(instante, datetime):
+        instante = datetime.combine(instante, datetime.min.time())
+
+    if instante.tzinfo is None:
+        instante = pytz.timezone(zona_horaria).localize(instante)
+    return np.datetime64(instante.astimezone(pytz.utc).replace(tzinfo=None), "ns")
+
+
+def a_paso(paso):
+    """
+    Convierte un paso de simulación a `timedelta64[ns]`.
+
+    Args:
+        paso (timedelta | np.timedelta64 | float): Paso de tiempo; los números se interpretan en minutos.
+
+    Returns:
+        np.timedelta64: Paso con resolución de nanosegundos.
+    """
+    if isinstance(paso, (int, float)) and not isinstance(paso, bool):
+        paso = timedelta(minutes=paso)
+    paso = np.timedelta64(paso, "ns") if isinstance(paso, timedelta) else paso.astype("timedelta64[ns]")
+    if paso <= np.timedelta64(0, "ns"):
+        raise ValueError("El paso de simulación debe ser positivo.")
+    return paso
+
+
+def contar_instantes(inicio, fin, paso=timedelta(minutes=10), zona_horaria="America/Guayaquil"):
+    """
+    Calcula cuántos instantes tiene la simulación entre `inicio` y `fin` (ambos incluidos).
+
+    Args:
+        inicio: Instante inicial (ver `a_instante_utc`).
+        fin: Instante final (ver `a_instante_utc`).
+        paso (timedelta | np.timedelta64 | float): Paso de tiempo.
+        zona_horaria (str): Zona horaria IANA para interpretar los instantes locales.
+
+    Returns:
+        int: Número de instantes de la simulación.
+    """
+    duracion = a_instante_utc(fin, zona_horaria) - a_instante_utc(inicio, zona_horaria)
+    if duracion < np.timedelta64(0, "ns"):
+        return 0
+    return int(duracion // a_paso(paso)) + 1
+
+
+def simular_por_bloques(inicio, fin, paso=timedelta(minutes=10), latitude: float = -0.2105367,
+                        longitude: float = -78.491614, tamano_bloque: int = TAMANO_BLOQUE_SIMULACION,
+                        backend="numpy", zona_horaria="America/Guayaquil", solo_de_dia=False,
+                        elevacion_minima: float = 0.0):
+    """
+    Genera la simulación del seguidor solar entre dos instantes, bloque a bloque.
+
+    El eje de tiempo se construye como `inicio + k * paso` a partir del índice
+    global `k`, por lo que el tamaño de bloque no altera los resultados.
+
+    Args:
+        inicio: Instante inicial (ver `a_instante_utc`).
+        fin: Instante final, incluido si cae en la malla de tiempo.
+        paso (timedelta | np.timedelta64 | float): Paso de tiempo (por defecto 10 minutos).
+        latitude (float): Latitud geográfica. Por defecto es -0.2105367 (Quito).
+        longitude (float): Longitud geográfica. Por defecto es -78.491614 (Quito).
+        tamano_bloque (int): Número máximo de instantes por bloque.
+        backend (str | callable): Motor de posición solar (por defecto "numpy").
+        zona_horaria (str): Zona horaria IANA para interpretar los instantes locales.
+        solo_de_dia (bool): Si es True se omiten los instantes con el sol por debajo de
+            `elevacion_minima` (los bloques pueden quedar más cortos o no generarse).
+        elevacion_minima (float): Elevación mínima (en grados) con `solo_de_dia`.
+
+    Yields:
+        tuple: Arreglos de NumPy (times, azimuths, elevations, beta, alpha) de cada bloque,
+            con `times` en `datetime64[ns]` UTC.
+    """
+    if tamano_bloque <= 0:
+        raise ValueError("El tamaño de bloque debe ser positivo.")
+
+    inicio_utc = a_instante_utc(inicio, zona_horaria)
+    paso = a_paso(paso)
+    total = contar_instantes(inicio, fin, paso, zona_horaria)
+    calcular_posicion = obtener_backend(backend)
+    if solo_de_dia and total:
+        # Intervalos de día de todo el rango, calculados una sola vez
+        inicios_dia, fines_dia = intervalos_diurnos(inicio_utc, inicio_utc + (total - 1) * paso, latitude, longitude,
+                                                    elevacion_minima)
+
+    for primero in range(0, total, tamano_bloque):
+        indices = np.arange(primero, min(primero + tamano_bloque, total))
+        times = inicio_utc + indices * paso
+        if solo_de_dia:
+            times = times[en_intervalos(times, inicios_dia, fines_dia)]
+            if not times.size:
+                continue
+        azimuths, elevations = calcular_posicion(times, latitude, longitude)
+        beta, alpha = calcular_pitch_roll(azimuths, elevations)
+        yield times, azimuths, elevations, beta, alpha
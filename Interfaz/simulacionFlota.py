@@ -0,0 +1,136 @@
+"""
+Módulo para simular una flota de seguidores solares repartida en muchos sitios.
+
+Cada sitio se describe con su nombre, latitud, longitud y zona horaria. La
+simulación de cada sitio se ejecuta en un proceso independiente de un
+`ProcessPoolExecutor` y los resultados se entregan a medida que cada sitio
+termina, de modo que el rendimiento escala con el número de núcleos.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import timedelta
+import csv
+import os
+import numpy as np
+from Interfaz.simulacionBloques import simular_por_bloques
+
+# Columnas reconocidas en las tablas de sitios
+COLUMNAS_SITIO = ("nombre", "latitud", "longitud", "zona_horaria")
+
+
+def cargar_sitios(ruta):
+    """
+    Lee una tabla de sitios desde un archivo CSV.
+
+    El archivo debe tener las columnas `nombre`, `latitud`, `longitud` y,
+    opcionalmente, `zona_horaria` (por defecto "America/Guayaquil").
+
+    Args:
+        ruta (str): Ruta del archivo CSV.
+
+    Returns:
+        list: Lista de diccionarios de sitios.
+    """
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        return normalizar_sitios(list(csv.DictReader(archivo)))
+
+
+def normalizar_sitios(sitios):
+    """
+    Convierte una tabla de sitios a una lista de diccionarios con tipos uniformes.
+
+    Args:
+        sitios (iterable): Diccionarios con las claves de `COLUMNAS_SITIO` o tuplas
+            `(nombre, latitud, longitud[, zona_horaria])`.
+
+    Returns:
+        list: Lista de diccionarios con las claves de `COLUMNAS_SITIO`.
+    """
+    normalizados = []
+    for indice, sitio in enumerate(sitios):
+        if not isinstance(sitio, dict):
+            sitio = dict(zip(COLUMNAS_SITIO, sitio))
+        normalizados.append({
+            "nombre": str(sitio.get("nombre") or f"sitio_{indice}"),
+            "latitud": float(sitio["latitud"]),
+            "longitud": float(sitio["longitud"]),
+            "zona_horaria": sitio.get("zona_horaria") or "America/Guayaquil",
+        })
+
+    nombres = [sitio["nombre"] for sitio in normalizados]
+    if len(set(nombres)) != len(nombres):
+        raise ValueError("Los nombres de los sitios deben ser únicos.")
+    return normalizados
+
+
+def simular_sitio(sitio, inicio, fin, paso=timedelta(minutes=10), backend="numpy", resumen=None):
+    """
+    Simula un sitio completo en el proceso actual.
+
+    Args:
+        sitio (dict): Sitio con las claves de `COLUMNAS_SITIO`.
+        inicio: Instante inicial, interpretado en la zona horaria del sitio si es local.
+        fin: Instante final, interpretado en la zona horaria del sitio si es local.
+        paso (timedelta | float): Paso de tiempo.
+        backend (str | callable): Motor de posición solar.
+        resumen (callable, opcional): Función que recibe la tupla de resultados y
+            devuelve lo que se quiere enviar de vuelta (por ejemplo, totales diarios)
+            para no transferir los arreglos completos entre procesos.
+
+    Returns:
+        tuple | object: Arreglos (times, azimuths, elevations, beta, alpha) del sitio,
+            o lo que devuelva `resumen`.
+    """
+    bloques = list(simular_por_bloques(inicio, fin, paso, sitio["latitud"], sitio["longitud"],
+                                       backend=backend, zona_horaria=sitio["zona_horaria"]))
+    if bloques:
+        resultado = tuple(np.concatenate(columna) for columna in zip(*bloques))
+    else:
+        resultado = (np.array([], dtype="datetime64[ns]"),) + tuple(np.array([]) for _ in range(4))
+    return resumen(resultado) if resumen is not None else resultado
+
+
+def simular_flota(sitios, inicio, fin, paso=timedelta(minutes=10), procesos=None, backend="numpy",
+                  resumen=None, max_pendientes=None):
+    """
+    Simula todos los sitios de una flota en un conjunto de procesos.
+
+    Los resultados se entregan en el orden en que terminan los sitios. Para no
+    acumular resultados en memoria, solo se mantienen `max_pendientes` sitios
+    enviados al mismo tiempo.
+
+    Args:
+        sitios (iterable | str): Tabla de sitios (ver `normalizar_sitios`) o ruta a un CSV.
+        inicio: Instante inicial, interpretado en la zona horaria de cada sitio si es local.
+        fin: Instante final, interpretado en la zona horaria de cada sitio si es local.
+        paso (timedelta | float): Paso de tiempo (por defecto 10 minutos).
+        procesos (int, opcional): Número de procesos; por defecto, el número de núcleos.
+        backend (str): Motor de posición solar (debe poder enviarse a otro proceso).
+        resumen (callable, opcional): Función de nivel de módulo aplicada a cada resultado
+            dentro del proceso trabajador (ver `simular_sitio`).
+        max_pendientes (int, opcional): Máximo de sitios en curso; por defecto, 2 por proceso.
+
+    Yields:
+        tuple: (sitio, resultado) para cada sitio terminado.
+    """
+    sitios = cargar_sitios(sitios) if isinstance(sitios, (str, os.PathLike)) else normalizar_sitios(sitios)
+    procesos = procesos or os.cpu_count() or 1
+    max_pendientes = max_pendientes or 2 * procesos
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        pendientes = {}
+        restantes = iter(sitios)
+        while True:
+            # Mantener la cola de trabajos llena sin enviar toda la flota de una vez
+            while len(pendientes) < max_pendientes:
+                sitio = next(restantes, None)
+                if sitio is None:
+                    break
+                futuro = ejecutor.submit(simular_sitio, sitio, inicio, fin, paso, backend, resumen)
+                pendientes[futuro] = sitio
+            if not pendientes:
+                break
+
+            terminados, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                yield pendientes.pop(futuro), futuro.result()
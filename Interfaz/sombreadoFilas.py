@@ -0,0 +1,391 @@
+"""
+Módulo para el sombreado entre seguidores vecinos y el *backtracking* de un campo.
+
+Un campo rectangular tiene `filas` x `columnas` seguidores iguales, con las filas
+orientadas de Este a Oeste y separadas `paso_filas` metros de Norte a Sur, y los
+seguidores de una fila separados `paso_columnas` metros de Este a Oeste. Todos
+giran con los mismos ángulos (Rx(α)·Ry(β), como en `calcular_pitch_roll`), de modo
+que sus paneles son paralelos y la sombra de un vecino sobre el plano de otro es
+el mismo rectángulo desplazado. Recortado al panel, cada sombra queda apoyada en
+su lado izquierdo o derecho, así que en cada franja horizontal del panel (entre
+dos bordes de sombra consecutivos) la parte cubierta es un tramo desde el lado
+izquierdo más otro desde el derecho: el área sombreada es exacta sumando franjas.
+
+Se tienen en cuenta los vecinos hasta `alcance` filas y columnas de distancia (5
+por defecto); con el sol muy bajo pueden sombrear vecinos más lejanos, pero
+entonces el panel ya está casi todo a la sombra. La fracción solo depende de
+cuántos vecinos tiene cada seguidor hacia cada lado, así que los seguidores se
+agrupan en clases (esquinas, bordes e interior). El cálculo es vectorizado sobre
+todos los instantes, por bloques: primero se ve qué vecinos proyectan sombra
+sobre el panel en cada instante (casi siempre ninguno o uno o dos) y luego se
+resuelven juntos todos los instantes con el mismo número de sombras, para todas
+las clases a la vez, sin recorrer los seguidores.
+
+El *backtracking* aplica en cada eje la fórmula habitual de los seguidores de un
+eje: si el ángulo que sigue al sol es θ y la razón de cobertura del eje (tamaño
+del panel sobre la separación) es `gcr`, cuando cos θ < gcr el panel se gira a
+θ - signo(θ)·arccos(cos θ / gcr), justo hasta que la sombra del vecino deja de
+tocarlo. Primero se corrige el roll (filas vecinas, Norte-Sur) y después el pitch
+(seguidores vecinos de la fila, Este-Oeste); los vecinos en diagonal aún pueden
+dar algo de sombra con el sol bajo.
+
+Uso:
+    python -m Interfaz.sombreadoFilas --anio 2025 --filas 40 --columnas 50 --paso-filas 6 --gcr 0.3
+"""
+
+import argparse
+import sys
+from datetime import date, timedelta
+import numpy as np
+from Interfaz.analisisEnergia import irradiancia_cielo_despejado, normal_seguidor, vector_solar
+from Interfaz.instrumentacion import medir
+from Interfaz.simulacionBloques import a_instante_utc, a_paso, simular_por_bloques
+
+# Filas y columnas de vecinos que se tienen en cuenta hacia cada lado
+ALCANCE_VECINOS = 5
+
+# Instantes por bloque en el cálculo de sombras
+TAMANO_BLOQUE_SOMBRA = 4096
+
+# Elementos máximos de los arreglos intermedios (instantes x franjas x sombras x clases)
+_ELEMENTOS_MAXIMOS = 2_000_000
+
+
+class CampoSeguidores:
+    """
+    Campo rectangular de seguidores de dos ejes.
+
+    Args:
+        filas (int): Número de filas (de Sur a Norte).
+        columnas (int): Seguidores por fila (de Oeste a Este).
+        paso_filas (float): Separación entre filas, de Norte a Sur (en metros).
+        paso_columnas (float, opcional): Separación entre seguidores de una fila, de Este a
+            Oeste (en metros). Si no se indica, se obtiene de `gcr`.
+        gcr (float, opcional): Razón de cobertura del suelo (área de paneles / área del campo).
+        ancho (float): Ancho del panel, de Este a Oeste en reposo (4 m, como `construir_panel`).
+        alto (float): Alto del panel, de Norte a Sur en reposo (2 m).
+    """
+
+    __slots__ = ("filas", "columnas", "paso_filas", "paso_columnas", "ancho", "alto")
+
+    def __init__(self, filas: int, columnas: int, paso_filas: float, paso_columnas: float = None, gcr: float = None,
+                 ancho: float = 4.0, alto: float = 2.0):
+        if filas <= 0 or columnas <= 0:
+            raise ValueError("El campo debe tener al menos una fila y una columna.")
+        if (paso_columnas is None) == (gcr is None):
+            raise ValueError("Se debe indicar `paso_columnas` o `gcr` (solo uno de los dos).")
+        if paso_columnas is None:
+            if gcr <= 0:
+                raise ValueError("La razón de cobertura debe ser positiva.")
+            paso_columnas = ancho * alto / (gcr * paso_filas)
+        if paso_filas < alto or paso_columnas < ancho:
+            raise ValueError(f"Los paneles se superponen: paso de filas {paso_filas:.2f} m (mínimo {alto} m), "
+                             f"paso de columnas {paso_columnas:.2f} m (mínimo {ancho} m).")
+        self.filas, self.columnas = int(filas), int(columnas)
+        self.paso_filas, self.paso_columnas = float(paso_filas), float(paso_columnas)
+        self.ancho, self.alto = float(ancho), float(alto)
+
+    def __repr__(self):
+        return (f"CampoSeguidores({self.filas}x{self.columnas}, paso_filas={self.paso_filas:.2f} m, "
+                f"paso_columnas={self.paso_columnas:.2f} m, gcr={self.gcr:.3f})")
+
+    def __len__(self):
+        return self.filas * self.columnas
+
+    @property
+    def gcr(self):
+        """float: Razón de cobertura del suelo (área de paneles / área del campo)."""
+        return self.ancho * self.alto / (self.paso_filas * self.paso_columnas)
+
+    @property
+    def gcr_filas(self):
+        """float: Razón de cobertura Norte-Sur (alto / paso de filas), la del roll."""
+        return self.alto / self.paso_filas
+
+    @property
+    def gcr_columnas(self):
+        """float: Razón de cobertura Este-Oeste (ancho / paso de columnas), la del pitch."""
+        return self.ancho / self.paso_columnas
+
+    def desplazamientos(self, alcance: int = ALCANCE_VECINOS):
+        """
+        Calcula la posición relativa de los vecinos hasta `alcance` filas y columnas.
+
+        Args:
+            alcance (int): Filas y columnas de vecinos hacia cada lado.
+
+        Returns:
+            np.ndarray: Arreglo (2·alcance + 1, 2·alcance + 1, 3) con la posición (x: Este,
+                y: Norte, z) del vecino desplazado [fila, columna] respecto al centro.
+        """
+        fila, columna = np.mgrid[-alcance:alcance + 1, -alcance:alcance + 1]
+        return np.stack([columna * self.paso_columnas, fila * self.paso_filas, np.zeros(fila.shape)], axis=-1)
+
+    def clases(self, alcance: int = ALCANCE_VECINOS):
+        """
+        Agrupa los seguidores según cuántos vecinos tienen hacia cada lado.
+
+        Args:
+            alcance (int): Filas y columnas de vecinos hacia cada lado.
+
+        Returns:
+            tuple: (clases, ventanas): `clases` es un arreglo (filas, columnas) con la clase de
+                cada seguidor y `ventanas` un arreglo (clases, 4) con los vecinos de cada clase
+                hacia el Sur, el Norte, el Oeste y el Este (de 0 a `alcance`).
+        """
+        fila, columna = np.indices((self.filas, self.columnas))
+        ventana = np.stack([np.minimum(fila, alcance), np.minimum(self.filas - 1 - fila, alcance),
+                            np.minimum(columna, alcance), np.minimum(self.columnas - 1 - columna, alcance)], axis=-1)
+        ventanas, clases = np.unique(ventana.reshape(-1, 4), axis=0, return_inverse=True)
+        return clases.reshape(fila.shape), ventanas
+
+
+def _backtracking_eje(angulo, gcr):
+    """Aplica a un ángulo de seguimiento (en radianes) el backtracking de un eje con razón de cobertura `gcr`."""
+    cos_angulo = np.cos(angulo)
+    sombreado = cos_angulo < gcr
+    correccion = np.arccos(np.minimum(cos_angulo / gcr, 1.0))
+    return np.where(sombreado, angulo - np.sign(angulo) * correccion, angulo)
+
+
+def backtracking(azimuths, elevations, campo):
+    """
+    Calcula el pitch y el roll con backtracking para que los vecinos no se sombreen.
+
+    Con el sol bajo el horizonte se devuelven los ángulos de `calcular_pitch_roll`.
+
+    Args:
+        azimuths (array-like): Azimut del sol (en grados).
+        elevations (array-like): Elevación del sol (en grados).
+        campo (CampoSeguidores): Geometría del campo.
+
+    Returns:
+        tuple: Arreglos (beta, alpha) con los ángulos de pitch y roll (en grados).
+    """
+    sx, sy, sz = vector_solar(np.asarray(azimuths, dtype=float), np.asarray(elevations, dtype=float))
+    de_dia = sz > 0
+
+    # Roll: ángulo del sol proyectado en el plano Norte-cénit, corregido por las filas vecinas
+    alpha = np.arctan2(-sy, np.abs(sz))
+    alpha = np.where(de_dia, _backtracking_eje(alpha, campo.gcr_filas), alpha)
+
+    # Pitch: ángulo del sol en el plano perpendicular al eje de pitch ya girado
+    beta = np.arctan2(sx, -sy * np.sin(alpha) + np.abs(sz) * np.cos(alpha))
+    beta = np.where(de_dia, _backtracking_eje(beta, campo.gcr_columnas), beta)
+    return np.degrees(beta), np.degrees(alpha)
+
+
+def _fraccion_union(du, dv, contiene, campo):
+    """
+    Fracción del panel cubierta por la unión de varias sombras, para cada clase.
+
+    Args:
+        du, dv (np.ndarray): Desplazamiento (instantes, sombras) de cada sombra en los ejes del panel.
+        contiene (np.ndarray): Arreglo booleano (instantes, sombras, clases): si el vecino que
+            proyecta la sombra existe para la clase.
+        campo (CampoSeguidores): Geometría del campo.
+
+    Returns:
+        np.ndarray: Arreglo (instantes, clases).
+    """
+    medio_u, medio_v = campo.ancho / 2, campo.alto / 2
+    v_min = np.maximum(dv - medio_v, -medio_v)
+    v_max = np.minimum(dv + medio_v, medio_v)
+
+    # Franjas entre bordes de sombra consecutivos; en cada una las sombras presentes no cambian
+    bordes = np.full((du.shape[0], 1), medio_v)
+    cortes = np.sort(np.concatenate([-bordes, v_min, v_max, bordes], axis=1), axis=1)
+    centros = (cortes[:, 1:] + cortes[:, :-1]) / 2
+    alturas = np.diff(cortes, axis=1)
+    cubre = ((v_min[:, None, :] < centros[:, :, None]) & (centros[:, :, None] < v_max[:, None, :]))[..., None]
+    cubre = cubre & contiene[:, None, :, :]
+
+    # Tramo cubierto desde el lado izquierdo (sombras con du < 0) y desde el derecho
+    izquierda = np.where(cubre & (du < 0)[:, None, :, None], (du + medio_u)[:, None, :, None], -medio_u).max(axis=2)
+    derecha = np.where(cubre & (du >= 0)[:, None, :, None], (du - medio_u)[:, None, :, None], medio_u).min(axis=2)
+    libre = np.clip(derecha - izquierda, 0.0, campo.ancho)
+    return 1.0 - np.einsum("isc,is->ic", libre, alturas) / (campo.ancho * campo.alto)
+
+
+def _fracciones_bloque(sol, beta, alpha, campo, ventanas, alcance):
+    """Fracción sombreada de cada clase para un bloque de instantes; arreglo (instantes, clases)."""
+    beta_rad, alpha_rad = np.radians(beta), np.radians(alpha)
+    sin_b, cos_b, sin_a, cos_a = np.sin(beta_rad), np.cos(beta_rad), np.sin(alpha_rad), np.cos(alpha_rad)
+
+    # Ejes del panel girado: u (ancho), v (alto, eje de pitch) y la normal
+    eje_u = np.stack([cos_b, sin_b * sin_a, -sin_b * cos_a])
+    eje_v = np.stack([np.zeros_like(cos_a), cos_a, sin_a])
+    normal = np.stack(normal_seguidor(beta, alpha))
+    sol = np.stack(sol)
+    sol_normal = np.einsum("ci,ci->i", sol, normal)
+    iluminado = sol_normal > 0
+    sol_normal = np.where(iluminado, sol_normal, 1.0)
+
+    # Sombra de cada vecino sobre el plano del panel: el panel desplazado en (du, dv)
+    desplazamientos = campo.desplazamientos(alcance).reshape(-1, 3)
+    distancia = desplazamientos @ normal / sol_normal
+    du = desplazamientos @ eje_u - distancia * np.einsum("ci,ci->i", sol, eje_u)
+    dv = desplazamientos @ eje_v - distancia * np.einsum("ci,ci->i", sol, eje_v)
+    proyecta = (distancia > 0) & iluminado & (np.abs(du) < campo.ancho) & (np.abs(dv) < campo.alto)
+
+    # Vecinos que existen para cada clase (dentro de su ventana hacia el Sur, Norte, Oeste y Este)
+    fila, columna = np.mgrid[-alcance:alcance + 1, -alcance:alcance + 1].reshape(2, -1, 1)
+    contiene = ((-ventanas[:, 0] <= fila) & (fila <= ventanas[:, 1])
+                & (-ventanas[:, 2] <= columna) & (columna <= ventanas[:, 3]))
+
+    # Los instantes con el mismo número de sombras se resuelven juntos
+    fracciones = np.zeros((sol.shape[1], len(ventanas)))
+    cantidades = proyecta.sum(axis=0)
+    for cantidad in np.unique(cantidades[cantidades > 0]):
+        instantes = np.flatnonzero(cantidades == cantidad)
+        paso = max(1, _ELEMENTOS_MAXIMOS // ((2 * cantidad + 1) * cantidad * len(ventanas)))
+        for inicio in range(0, instantes.size, paso):
+            seleccion = instantes[inicio:inicio + paso]
+            vecinos = np.nonzero(proyecta[:, seleccion].T)[1].reshape(seleccion.size, cantidad)
+            columnas = seleccion[:, None]
+            fracciones[seleccion] = _fraccion_union(du[vecinos, columnas], dv[vecinos, columnas], contiene[vecinos],
+                                                    campo)
+    return fracciones
+
+
+def fraccion_sombreada(azimuths, elevations, beta, alpha, campo, alcance: int = ALCANCE_VECINOS,
+                       tamano_bloque: int = TAMANO_BLOQUE_SOMBRA):
+    """
+    Calcula la fracción de cada panel cubierta por la sombra de sus vecinos.
+
+    Con el sol bajo el horizonte o detrás del panel la fracción es 0 (no hay directa que sombrear).
+
+    Args:
+        azimuths (array-like): Azimut del sol (en grados).
+        elevations (array-like): Elevación del sol (en grados).
+        beta (array-like): Ángulo de pitch de los seguidores (en grados).
+        alpha (array-like): Ángulo de roll de los seguidores (en grados).
+        campo (CampoSeguidores): Geometría del campo.
+        alcance (int): Filas y columnas de vecinos que se tienen en cuenta hacia cada lado.
+        tamano_bloque (int): Instantes por bloque de cálculo.
+
+    Returns:
+        dict:
+            - fracciones (np.ndarray): Arreglo (instantes, clases) con la fracción sombreada de cada clase.
+            - clases (np.ndarray): Arreglo (filas, columnas) con la clase de cada seguidor.
+            - media (np.ndarray): Fracción sombreada media del campo en cada instante.
+    """
+    clases, ventanas = campo.clases(alcance)
+    seguidores_por_clase = np.bincount(clases.ravel(), minlength=len(ventanas))
+
+    azimuths, elevations = np.asarray(azimuths, dtype=float), np.asarray(elevations, dtype=float)
+    beta, alpha = np.asarray(beta, dtype=float), np.asarray(alpha, dtype=float)
+    fracciones = np.zeros((azimuths.size, len(ventanas)))
+    with medir("sombreadoFilas.fracciones"):
+        for inicio in range(0, azimuths.size, tamano_bloque):
+            bloque = slice(inicio, inicio + tamano_bloque)
+            sol = vector_solar(azimuths[bloque], elevations[bloque])
+            fracciones[bloque] = _fracciones_bloque(sol, beta[bloque], alpha[bloque], campo, ventanas, alcance)
+    return {
+        "fracciones": fracciones,
+        "clases": clases,
+        "media": fracciones @ seguidores_por_clase / len(campo),
+    }
+
+
+def analizar_sombreado(inicio, fin, campo, paso=timedelta(minutes=1), latitude: float = -0.2105367,
+                       longitude: float = -78.491614, altitud: float = 2850.0, backend="numpy",
+                       zona_horaria="America/Guayaquil"):
+    """
+    Compara la energía directa del campo con seguimiento puro y con backtracking.
+
+    Cada muestra representa el intervalo [t, t + paso) y solo se simulan los instantes
+    de día. La parte sombreada del panel pierde la irradiancia directa (modelo de cielo
+    despejado de `analisisEnergia`); la difusa no se tiene en cuenta.
+
+    Args:
+        inicio: Instante inicial (ver `a_instante_utc`).
+        fin: Instante final (excluido).
+        campo (CampoSeguidores): Geometría del campo.
+        paso (timedelta | float): Paso de tiempo (número = minutos).
+        latitude (float): Latitud geográfica. Por defecto es -0.2105367 (Quito).
+        longitude (float): Longitud geográfica. Por defecto es -78.491614 (Quito).
+        altitud (float): Altitud del sitio en metros. Por defecto es 2850 (Quito).
+        backend (str | callable): Motor de posición solar (por defecto "numpy").
+        zona_horaria (str): Zona horaria IANA para interpretar los instantes locales.
+
+    Returns:
+        dict: Energía directa por metro cuadrado de panel (kWh/m²) de `sin_sombra`
+            (seguimiento puro sin vecinos), `seguimiento` (seguimiento puro con sombras) y
+            `backtracking`; `perdida` (estrategia -> fracción perdida frente a `sin_sombra`),
+            `horas_sombra` (horas con algún seguidor sombreado con seguimiento puro) y `muestras`.
+    """
+    paso = a_paso(paso)
+    inicio_utc = a_instante_utc(inicio, zona_horaria)
+    fin_utc = a_instante_utc(fin, zona_horaria)
+    if fin_utc <= inicio_utc:
+        raise ValueError("El final del análisis debe ser posterior al inicio.")
+    horas_paso = paso / np.timedelta64(1, "h")
+    energia = {"sin_sombra": 0.0, "seguimiento": 0.0, "backtracking": 0.0}
+    horas_sombra = 0.0
+    muestras = 0
+
+    for times, azimuths, elevations, beta, alpha in simular_por_bloques(
+            inicio_utc, fin_utc - paso, paso, latitude, longitude, backend=backend, solo_de_dia=True):
+        dni, _ = irradiancia_cielo_despejado(elevations, times, altitud)
+        sol = vector_solar(azimuths, elevations)
+        beta_bt, alpha_bt = backtracking(azimuths, elevations, campo)
+        # Con seguimiento puro la normal apunta al sol y la directa en el plano es la DNI
+        sombra = fraccion_sombreada(azimuths, elevations, beta, alpha, campo)["media"]
+        sombra_bt = fraccion_sombreada(azimuths, elevations, beta_bt, alpha_bt, campo)["media"]
+        normal_bt = normal_seguidor(beta_bt, alpha_bt)
+        cos_bt = np.maximum(sol[0] * normal_bt[0] + sol[1] * normal_bt[1] + sol[2] * normal_bt[2], 0.0)
+
+        energia["sin_sombra"] += dni.sum() * horas_paso / 1000.0
+        energia["seguimiento"] += (dni * (1.0 - sombra)).sum() * horas_paso / 1000.0
+        energia["backtracking"] += (dni * cos_bt * (1.0 - sombra_bt)).sum() * horas_paso / 1000.0
+        horas_sombra += np.count_nonzero(sombra > 0) * horas_paso
+        muestras += times.size
+
+    referencia = energia["sin_sombra"]
+    return {
+        **energia,
+        "perdida": {nombre: 1.0 - energia[nombre] / referencia if referencia > 0 else 0.0
+                    for nombre in ("seguimiento", "backtracking")},
+        "horas_sombra": horas_sombra,
+        "muestras": muestras,
+    }
+
+
+def main(argv=None):
+    """Punto de entrada para analizar el sombreado de un campo desde la línea de comandos."""
+    import time
+
+    parser = argparse.ArgumentParser(description="Sombreado entre seguidores y backtracking de un campo.")
+    parser.add_argument("--anio", type=int, default=date.today().year, help="Año a analizar")
+    parser.add_argument("--sitio", default="quito,-0.2105367,-78.491614",
+                        help='Sitio "nombre,latitud,longitud[,zona_horaria]"')
+    parser.add_argument("--altitud", type=float, default=2850.0, help="Altitud del sitio en metros")
+    parser.add_argument("--paso", type=float, default=1, help="Paso de tiempo en minutos")
+    parser.add_argument("--filas", type=int, default=20, help="Filas del campo")
+    parser.add_argument("--columnas", type=int, default=50, help="Seguidores por fila")
+    parser.add_argument("--paso-filas", type=float, default=5.0, help="Separación entre filas en metros")
+    parser.add_argument("--gcr", type=float, default=0.3, help="Razón de cobertura del suelo")
+    args = parser.parse_args(argv)
+
+    partes = [parte.strip() for parte in args.sitio.split(",")]
+    nombre, latitud, longitud = partes[0], float(partes[1]), float(partes[2])
+    zona_horaria = partes[3] if len(partes) > 3 else "America/Guayaquil"
+    campo = CampoSeguidores(args.filas, args.columnas, args.paso_filas, gcr=args.gcr)
+
+    inicio = time.perf_counter()
+    resultado = analizar_sombreado(date(args.anio, 1, 1), date(args.anio + 1, 1, 1), campo, args.paso,
+                                   latitud, longitud, args.altitud, zona_horaria=zona_horaria)
+    duracion = time.perf_counter() - inicio
+
+    print(f"{nombre} {args.anio}: {campo}, {len(campo)} seguidores, {resultado['muestras']} muestras en {duracion:.2f} s")
+    for estrategia in ("sin_sombra", "seguimiento", "backtracking"):
+        perdida = resultado["perdida"].get(estrategia)
+        detalle = f"  (pérdida {perdida * 100:.2f} %)" if perdida is not None else ""
+        print(f"{estrategia:<14} {resultado[estrategia]:10.1f} kWh/m² de directa{detalle}")
+    print(f"Horas con sombra (seguimiento puro): {resultado['horas_sombra']:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
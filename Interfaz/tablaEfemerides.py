@@ -0,0 +1,230 @@
+"""
+Módulo para tablas de efemérides precalculadas y mapeadas en memoria.
+
+Para sitios fijos que se simulan una y otra vez no tiene sentido recalcular la
+posición del sol. `precalcular_tabla` guarda el azimut y la elevación geométrica
+de un sitio durante varios años con un paso grueso en un archivo `.npy`, junto
+con un archivo `.json` de metadatos. `TablaEfemerides` abre ese archivo en modo
+`mmap` solo cuando se consulta por primera vez (varios procesos comparten las
+mismas páginas sin copiarlas) y responde a cualquier resolución interpolando.
+
+La interpolación es cúbica (Catmull-Rom) sobre el vector unitario hacia el sol,
+lo que evita el salto del azimut en 0°/360°; la refracción atmosférica se aplica
+después de interpolar porque varía bruscamente cerca del horizonte.
+
+Una tabla se puede pasar directamente como motor de `getSolarPosition`:
+
+    tabla = TablaEfemerides("quito.npy")
+    getSolarPosition("2025-01-27", 6, 18, step_minutes=1, backend=tabla)
+"""
+
+import argparse
+import json
+from datetime import timedelta
+import numpy as np
+from Interfaz.efemerides import a_datetime64_utc, corregir_refraccion, posicion_solar, posicion_solar_pysolar
+from Interfaz.simulacionBloques import a_instante_utc, a_paso
+
+VERSION_TABLA = 1
+
+# Instantes calculados por bloque al precalcular la tabla
+TAMANO_BLOQUE_TABLA = 100_000
+
+
+def _ruta_metadatos(ruta):
+    """Devuelve la ruta del archivo `.json` de metadatos asociado a la tabla."""
+    return str(ruta)[:-4] + ".json" if str(ruta).endswith(".npy") else str(ruta) + ".json"
+
+
+def _a_vectores(azimuts, elevaciones):
+    """Convierte azimut y elevación (en grados) a vectores unitarios (Este, Norte, cénit)."""
+    az_rad = np.radians(azimuts)
+    el_rad = np.radians(elevaciones)
+    return np.stack([np.cos(el_rad) * np.sin(az_rad), np.cos(el_rad) * np.cos(az_rad), np.sin(el_rad)], axis=-1)
+
+
+def _a_angulos(vectores):
+    """Convierte vectores hacia el sol a azimut y elevación (en grados), normalizándolos."""
+    x, y, z = vectores[..., 0], vectores[..., 1], vectores[..., 2]
+    azimuts = np.degrees(np.arctan2(x, y)) % 360
+    elevaciones = np.degrees(np.arctan2(z, np.hypot(x, y)))
+    return azimuts, elevaciones
+
+
+def precalcular_tabla(ruta, latitude: float, longitude: float, inicio, fin, paso=timedelta(minutes=10),
+                      zona_horaria="America/Guayaquil", tamano_bloque: int = TAMANO_BLOQUE_TABLA):
+    """
+    Precalcula la posición del sol de un sitio y la guarda en un archivo mapeable en memoria.
+
+    La tabla incluye una muestra extra antes de `inicio` y dos después de `fin`
+    para que la interpolación cúbica sea válida en todo el intervalo pedido.
+
+    Args:
+        ruta (str): Ruta del archivo `.npy` a crear (los metadatos van en el `.json` del mismo nombre).
+        latitude (float): Latitud geográfica del sitio.
+        longitude (float): Longitud geográfica del sitio.
+        inicio: Primer instante válido de la tabla (ver `a_instante_utc`).
+        fin: Último instante válido de la tabla.
+        paso (timedelta | float): Paso de la tabla (por defecto 10 minutos).
+        zona_horaria (str): Zona horaria IANA para interpretar los instantes locales.
+        tamano_bloque (int): Instantes calculados por bloque.
+
+    Returns:
+        TablaEfemerides: Tabla recién creada.
+    """
+    paso = a_paso(paso)
+    inicio_utc = a_instante_utc(inicio, zona_horaria)
+    fin_utc = a_instante_utc(fin, zona_horaria)
+    if fin_utc <= inicio_utc:
+        raise ValueError("El final de la tabla debe ser posterior al inicio.")
+
+    primero = inicio_utc - paso
+    cantidad = int((fin_utc - inicio_utc) // paso) + 4
+
+    datos = np.lib.format.open_memmap(str(ruta), mode="w+", dtype=np.float64, shape=(cantidad, 2))
+    for desde in range(0, cantidad, tamano_bloque):
+        indices = np.arange(desde, min(desde + tamano_bloque, cantidad))
+        azimuts, elevaciones = posicion_solar(primero + indices * paso, latitude, longitude, refraccion=False)
+        datos[indices, 0] = azimuts
+        datos[indices, 1] = elevaciones
+    datos.flush()
+    del datos
+
+    metadatos = {
+        "version": VERSION_TABLA,
+        "latitud": float(latitude),
+        "longitud": float(longitude),
+        "primer_instante_ns": int(primero.astype(np.int64)),
+        "paso_ns": int(paso.astype(np.int64)),
+        "cantidad": cantidad,
+        "valido_desde": str(inicio_utc),
+        "valido_hasta": str(fin_utc),
+    }
+    with open(_ruta_metadatos(ruta), "w", encoding="utf-8") as archivo:
+        json.dump(metadatos, archivo, indent=2)
+
+    return TablaEfemerides(ruta)
+
+
+class TablaEfemerides:
+    """
+    Tabla de efemérides precalculada, abierta en modo `mmap` de forma diferida.
+
+    Args:
+        ruta (str): Ruta del archivo `.npy` creado con `precalcular_tabla`.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = str(ruta)
+        with open(_ruta_metadatos(ruta), encoding="utf-8") as archivo:
+            self.metadatos = json.load(archivo)
+        if self.metadatos.get("version") != VERSION_TABLA:
+            raise ValueError(f"Versión de tabla no soportada: {self.metadatos.get('version')}")
+
+        self.latitud = self.metadatos["latitud"]
+        self.longitud = self.metadatos["longitud"]
+        self.paso_ns = self.metadatos["paso_ns"]
+        self.primer_instante_ns = self.metadatos["primer_instante_ns"]
+        self.cantidad = self.metadatos["cantidad"]
+        self.valido_desde = np.datetime64(self.metadatos["valido_desde"], "ns")
+        self.valido_hasta = np.datetime64(self.metadatos["valido_hasta"], "ns")
+        self._datos = None
+
+    @property
+    def datos(self):
+        """np.memmap: Arreglo (N, 2) de azimut y elevación geométrica, mapeado al consultarlo."""
+        if self._datos is None:
+            self._datos = np.load(self.ruta, mmap_mode="r")
+        return self._datos
+
+    def posicion(self, tiempos, latitud=None, longitud=None):
+        """
+        Interpola el azimut y la elevación del sol para instantes arbitrarios.
+
+        Args:
+            tiempos (array-like): Instantes a evaluar (`datetime64` en UTC o `datetime` con zona horaria).
+            latitud (float, opcional): Latitud pedida; debe coincidir con la de la tabla.
+            longitud (float, opcional): Longitud pedida; debe coincidir con la de la tabla.
+
+        Returns:
+            tuple: Arreglos (azimut, elevación aparente) en grados.
+        """
+        if latitud is not None and not np.isclose(latitud, self.latitud, rtol=0, atol=1e-9):
+            raise ValueError(f"La tabla corresponde a la latitud {self.latitud}, no a {latitud}.")
+        if longitud is not None and not np.isclose(longitud, self.longitud, rtol=0, atol=1e-9):
+            raise ValueError(f"La tabla corresponde a la longitud {self.longitud}, no a {longitud}.")
+
+        tiempos_utc = a_datetime64_utc(tiempos)
+        if tiempos_utc.size and (tiempos_utc.min() < self.valido_desde or tiempos_utc.max() > self.valido_hasta):
+            raise ValueError(f"Instantes fuera del rango de la tabla ({self.valido_desde} a {self.valido_hasta}).")
+
+        # Índice de la muestra anterior y fracción del paso, en aritmética entera para no perder precisión
+        desplazamiento = tiempos_utc.astype(np.int64) - self.primer_instante_ns
+        indice = desplazamiento // self.paso_ns
+        fraccion = ((desplazamiento % self.paso_ns) / self.paso_ns)[..., None]
+
+        # Interpolación de Catmull-Rom con las cuatro muestras que rodean cada instante
+        p0, p1, p2, p3 = (_a_vectores(self.datos[indice + k, 0], self.datos[indice + k, 1]) for k in (-1, 0, 1, 2))
+        vectores = 0.5 * (2 * p1 + (p2 - p0) * fraccion
+                          + (2 * p0 - 5 * p1 + 4 * p2 - p3) * fraccion ** 2
+                          + (3 * (p1 - p2) + p3 - p0) * fraccion ** 3)
+
+        azimuts, elevaciones = _a_angulos(vectores)
+        return azimuts, corregir_refraccion(elevaciones)
+
+    __call__ = posicion
+
+    def reportar_error(self, muestras: int = 2000, semilla: int = 0):
+        """
+        Compara la interpolación de la tabla con `pysolar` en instantes aleatorios.
+
+        Args:
+            muestras (int): Cantidad de instantes a comparar.
+            semilla (int): Semilla del generador aleatorio.
+
+        Returns:
+            dict: Errores máximo y RMS (en grados) de azimut y elevación. El azimut
+                solo se compara con el sol sobre el horizonte, donde tiene sentido.
+        """
+        generador = np.random.default_rng(semilla)
+        duracion = int((self.valido_hasta - self.valido_desde).astype(np.int64))
+        tiempos = self.valido_desde + generador.integers(0, duracion, muestras).astype("timedelta64[ns]")
+
+        az_tabla, el_tabla = self.posicion(tiempos)
+        az_ref, el_ref = posicion_solar_pysolar(tiempos, self.latitud, self.longitud)
+
+        error_elevacion = np.abs(el_tabla - el_ref)
+        error_azimut = np.abs((az_tabla - az_ref + 180) % 360 - 180)[el_ref > 0]
+        return {
+            "muestras": muestras,
+            "max_azimut": float(error_azimut.max(initial=0.0)),
+            "rms_azimut": float(np.sqrt(np.mean(error_azimut ** 2))) if error_azimut.size else 0.0,
+            "max_elevacion": float(error_elevacion.max(initial=0.0)),
+            "rms_elevacion": float(np.sqrt(np.mean(error_elevacion ** 2))),
+        }
+
+
+def main():
+    """Punto de entrada para precalcular una tabla desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Precalcula una tabla de efemérides mapeable en memoria.")
+    parser.add_argument("ruta", help="Archivo .npy de salida")
+    parser.add_argument("--latitud", type=float, default=-0.2105367)
+    parser.add_argument("--longitud", type=float, default=-78.491614)
+    parser.add_argument("--inicio", required=True, help="Fecha u hora local de inicio (YYYY-MM-DD[ HH:MM])")
+    parser.add_argument("--fin", required=True, help="Fecha u hora local de fin (YYYY-MM-DD[ HH:MM])")
+    parser.add_argument("--paso", type=float, default=10, help="Paso de la tabla en minutos")
+    parser.add_argument("--zona-horaria", default="America/Guayaquil")
+    parser.add_argument("--muestras-error", type=int, default=500,
+                        help="Instantes a comparar con pysolar para reportar el error")
+    args = parser.parse_args()
+
+    tabla = precalcular_tabla(args.ruta, args.latitud, args.longitud, args.inicio, args.fin,
+                              paso=args.paso, zona_horaria=args.zona_horaria)
+    print(f"Tabla generada: {args.ruta} ({tabla.cantidad} muestras)")
+    if args.muestras_error > 0:
+        for nombre, valor in tabla.reportar_error(args.muestras_error).items():
+            print(f"  {nombre}: {valor}")
+
+
+if __name__ == "__main__":
+    main()
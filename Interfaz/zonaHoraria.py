@@ -0,0 +1,110 @@
+"""
+Módulo para convertir ejes de tiempo UTC a hora local de forma vectorizada.
+
+Las simulaciones trabajan con instantes `datetime64[ns]` en UTC. Para mostrarlos
+en hora local no se crean objetos `datetime` con zona horaria: se leen una sola
+vez las tablas de transiciones de `pytz` de la zona (cambios de horario de verano
+y de desfase históricos) y el desfase de cada instante se obtiene con una búsqueda
+binaria sobre todo el arreglo. Funciona con cualquier zona horaria IANA.
+
+Las etiquetas de texto se generan solo en el momento de mostrarlas, con
+`formatear_tiempo` para un instante o `formatear_tiempos` para varios.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+import numpy as np
+import pytz
+
+# Zona horaria por defecto del simulador (Quito)
+ZONA_HORARIA_POR_DEFECTO = "America/Guayaquil"
+
+# Primer instante representable en `datetime64[ns]`, para acotar la transición inicial de pytz
+_PRIMER_INSTANTE = datetime(1678, 1, 1)
+
+
+@lru_cache(maxsize=None)
+def tabla_transiciones(zona_horaria=ZONA_HORARIA_POR_DEFECTO):
+    """
+    Lee las transiciones de desfase de una zona horaria de `pytz`.
+
+    Args:
+        zona_horaria (str): Zona horaria IANA.
+
+    Returns:
+        tuple: Arreglos `int64` (instantes UTC de cada transición en nanosegundos,
+            desfase respecto a UTC en nanosegundos a partir de esa transición).
+    """
+    zona = pytz.timezone(zona_horaria)
+    transiciones = getattr(zona, "_utc_transition_times", None)
+    if not transiciones:
+        # Zona de desfase fijo (UTC, Etc/GMT+5, ...)
+        desfase = zona.utcoffset(datetime(2000, 1, 1))
+        return np.zeros(1, dtype=np.int64), np.array([int(desfase.total_seconds()) * 10 ** 9], dtype=np.int64)
+
+    instantes = np.array([max(instante, _PRIMER_INSTANTE) for instante in transiciones],
+                         dtype="datetime64[ns]").astype(np.int64)
+    desfases = np.array([int(desfase.total_seconds()) * 10 ** 9 for desfase, _, _ in zona._transition_info],
+                        dtype=np.int64)
+    return instantes, desfases
+
+
+def desfases_utc(tiempos_utc, zona_horaria=ZONA_HORARIA_POR_DEFECTO):
+    """
+    Calcula el desfase respecto a UTC de cada instante en una zona horaria.
+
+    Args:
+        tiempos_utc (array-like): Instantes `datetime64` en UTC.
+        zona_horaria (str): Zona horaria IANA.
+
+    Returns:
+        np.ndarray: Desfases `timedelta64[ns]` (hora local - UTC).
+    """
+    instantes, desfases = tabla_transiciones(zona_horaria)
+    tiempos_ns = np.asarray(tiempos_utc, dtype="datetime64[ns]").astype(np.int64)
+    indices = np.searchsorted(instantes, tiempos_ns, side="right") - 1
+    return desfases[np.maximum(indices, 0)].astype("timedelta64[ns]")
+
+
+def a_hora_local(tiempos_utc, zona_horaria=ZONA_HORARIA_POR_DEFECTO):
+    """
+    Convierte instantes UTC a la hora local (de reloj) de una zona horaria.
+
+    Args:
+        tiempos_utc (array-like): Instantes `datetime64` en UTC.
+        zona_horaria (str): Zona horaria IANA.
+
+    Returns:
+        np.ndarray: Horas locales `datetime64[ns]` (sin zona horaria).
+    """
+    tiempos_utc = np.asarray(tiempos_utc, dtype="datetime64[ns]")
+    return tiempos_utc + desfases_utc(tiempos_utc, zona_horaria)
+
+
+def formatear_tiempo(instante_local, formato="%Y-%m-%d %H:%M"):
+    """
+    Da formato de texto a un instante local, en el momento de mostrarlo.
+
+    Args:
+        instante_local (np.datetime64): Hora local (ver `a_hora_local`).
+        formato (str): Formato de `strftime`.
+
+    Returns:
+        str: Instante con formato.
+    """
+    return np.datetime64(instante_local, "us").item().strftime(formato)
+
+
+def formatear_tiempos(tiempos_utc, zona_horaria=ZONA_HORARIA_POR_DEFECTO, formato="%Y-%m-%d %H:%M"):
+    """
+    Da formato de texto a varios instantes UTC en hora local.
+
+    Args:
+        tiempos_utc (array-like): Instantes `datetime64` en UTC.
+        zona_horaria (str): Zona horaria IANA.
+        formato (str): Formato de `strftime`.
+
+    Returns:
+        list: Textos de cada instante.
+    """
+    return [formatear_tiempo(instante, formato) for instante in a_hora_local(tiempos_utc, zona_horaria)]
@@ -0,0 +1,7 @@
+"""
+Módulo de inicialización para la carpeta `Rendimiento`.
+
+Contiene herramientas para medir el rendimiento del simulador (por ejemplo,
+el tiempo de importación de los módulos del núcleo de cálculo). Las
+herramientas se ejecutan como módulos: `python -m Rendimiento.<herramienta>`.
+"""
@@ -0,0 +1,260 @@
+"""
+Módulo con la batería de pruebas de rendimiento del simulador.
+
+Mide, sin abrir ventanas, las etapas principales del simulador:
+
+* `efemerides`: `getSolarPosition` con varias ventanas de tiempo, pasos y motores.
+* `cinematica`: `Rxyz` (uno por instante y por lotes) y el cálculo de pitch y roll.
+* `renderizado`: la actualización de un fotograma de la escena de `posicionSistema`
+  dibujada fuera de pantalla con Agg (redibujo completo y con *blitting*).
+* `reporte`: `generar_reporte` de principio a fin, sin la ventana de confirmación.
+
+Los resultados se guardan en JSON con los percentiles del tiempo por repetición
+y el rendimiento en muestras por segundo, para comparar ejecuciones entre sí.
+
+Uso:
+    python -m Rendimiento.benchmark --salida base.json
+    python -m Rendimiento.benchmark --etapas efemerides cinematica --salida nuevo.json
+    python -m Rendimiento.benchmark --comparar base.json nuevo.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timezone
+import numpy as np
+
+ETAPAS = ("efemerides", "cinematica", "renderizado", "reporte")
+
+# Ventanas (hora de inicio, hora de fin) y pasos en minutos medidos para getSolarPosition
+VENTANAS = ((11, 13), (6, 18), (0, 24))
+PASOS_MINUTOS = (10, 1)
+FECHA_PRUEBA = date(2025, 1, 27)
+
+
+def medir(funcion, repeticiones: int = 5, calentamiento: int = 1, muestras: int = 1):
+    """
+    Mide el tiempo de ejecución de una función.
+
+    Args:
+        funcion (callable): Función sin argumentos a medir.
+        repeticiones (int): Número de ejecuciones medidas.
+        calentamiento (int): Ejecuciones previas que no se miden.
+        muestras (int): Muestras (instantes, fotogramas, ...) que procesa cada ejecución.
+
+    Returns:
+        dict: Tiempos en segundos (mínimo, media, p50, p90, p99) y muestras por segundo
+            calculadas con la mediana.
+    """
+    for _ in range(calentamiento):
+        funcion()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    tiempos = np.array(tiempos)
+    p50, p90, p99 = np.percentile(tiempos, [50, 90, 99])
+    return {
+        "repeticiones": repeticiones,
+        "muestras": muestras,
+        "min_s": float(tiempos.min()),
+        "media_s": float(tiempos.mean()),
+        "p50_s": float(p50),
+        "p90_s": float(p90),
+        "p99_s": float(p99),
+        "muestras_por_segundo": float(muestras / p50) if p50 > 0 else float("inf"),
+    }
+
+
+def medir_efemerides(repeticiones, rapido=False):
+    """Mide `getSolarPosition` para cada ventana, paso y motor."""
+    from Interfaz.calculoAngulos import getSolarPosition
+
+    casos = {}
+    for backend in ("numpy", "pysolar"):
+        for hora_inicio, hora_fin in VENTANAS[:2] if rapido else VENTANAS:
+            for paso in PASOS_MINUTOS:
+                muestras = len(getSolarPosition(FECHA_PRUEBA, hora_inicio, hora_fin, step_minutes=paso,
+                                                backend=backend)[0])
+                nombre = f"getSolarPosition[{backend},{hora_inicio:02d}-{hora_fin:02d}h,{paso}min]"
+                casos[nombre] = medir(
+                    lambda: getSolarPosition(FECHA_PRUEBA, hora_inicio, hora_fin, step_minutes=paso, backend=backend),
+                    repeticiones, muestras=muestras)
+    return casos
+
+
+def medir_cinematica(repeticiones, rapido=False):
+    """Mide las matrices de rotación y el cálculo de pitch y roll."""
+    from Interfaz.calculoAngulos import Rxyz, Rxyz_lote, calcular_pitch_roll
+
+    generador = np.random.default_rng(0)
+    cantidad = 10_000 if rapido else 100_000
+    alpha = generador.uniform(-90, 90, cantidad)
+    beta = generador.uniform(-90, 90, cantidad)
+    azimuths = generador.uniform(0, 360, cantidad)
+    elevations = generador.uniform(0, 90, cantidad)
+    escalares = min(cantidad, 2_000)
+
+    return {
+        "Rxyz[escalar]": medir(lambda: [Rxyz(a, b, 0) for a, b in zip(alpha[:escalares], beta[:escalares])],
+                               repeticiones, muestras=escalares),
+        "Rxyz_lote": medir(lambda: Rxyz_lote(alpha, beta, 0), repeticiones, muestras=cantidad),
+        "calcular_pitch_roll": medir(lambda: calcular_pitch_roll(azimuths, elevations), repeticiones,
+                                     muestras=cantidad),
+    }
+
+
+def medir_renderizado(repeticiones, rapido=False):
+    """Mide la actualización de un fotograma de la escena dibujada con Agg."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from Interfaz.calculoAngulos import getSolarPosition
+    from Interfaz.exportarAnimacion import _crear_escena_agg, renderizar_fotogramas
+    from Interfaz.posicionSistema import crear_figura_escena
+
+    resultado = getSolarPosition(FECHA_PRUEBA, 6, 18, step_minutes=1, backend="numpy")
+    fotogramas = 10 if rapido else 30
+    mitad = len(resultado[0]) // 2
+
+    # Redibujo completo de la figura en cada fotograma
+    figura, escena = crear_figura_escena(*resultado)
+    canvas = FigureCanvasAgg(figura)
+
+    def redibujar():
+        for fotograma in range(mitad, mitad + fotogramas):
+            escena.actualizar(fotograma)
+            canvas.draw()
+
+    # Solo los artistas que cambian, sobre el fondo guardado
+    escena_agg = _crear_escena_agg(*resultado, (10, 7), 100)
+
+    return {
+        "fotograma[completo]": medir(redibujar, repeticiones, muestras=fotogramas),
+        "fotograma[blit]": medir(lambda: renderizar_fotogramas(*escena_agg, mitad, mitad + fotogramas),
+                                 repeticiones, muestras=fotogramas),
+    }
+
+
+def medir_reporte(repeticiones, rapido=False):
+    """Mide `generar_reporte` de principio a fin (sin la ventana de confirmación)."""
+    from Interfaz.cacheSimulacion import CACHE_SIMULACION
+    from Interfaz.generarReporte import generar_reporte
+
+    def generar():
+        # Sin caché, para medir también la simulación; el mensaje de confirmación se descarta
+        CACHE_SIMULACION.limpiar()
+        with contextlib.redirect_stdout(io.StringIO()):
+            generar_reporte(FECHA_PRUEBA, 6, 18, carpeta=carpeta, mostrar_ventana=False)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        return {"generar_reporte": medir(generar, max(1, repeticiones // 2) if rapido else repeticiones)}
+
+
+MEDIDORES = {
+    "efemerides": medir_efemerides,
+    "cinematica": medir_cinematica,
+    "renderizado": medir_renderizado,
+    "reporte": medir_reporte,
+}
+
+
+def ejecutar_benchmark(etapas=ETAPAS, repeticiones: int = 5, rapido: bool = False):
+    """
+    Ejecuta las etapas indicadas de la batería de pruebas.
+
+    Args:
+        etapas (iterable): Etapas a medir (ver `ETAPAS`).
+        repeticiones (int): Ejecuciones medidas por caso.
+        rapido (bool): Si es True, usa casos más pequeños.
+
+    Returns:
+        dict: Metadatos del entorno y resultados por etapa y caso.
+    """
+    import matplotlib
+
+    resultados = {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "entorno": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "numpy": np.__version__,
+            "matplotlib": matplotlib.__version__,
+        },
+        "etapas": {},
+    }
+    for etapa in etapas:
+        if etapa not in MEDIDORES:
+            raise ValueError(f"Etapa desconocida: {etapa!r}. Opciones: {', '.join(ETAPAS)}")
+        resultados["etapas"][etapa] = MEDIDORES[etapa](repeticiones, rapido)
+    return resultados
+
+
+def comparar_resultados(base, nuevo, umbral: float = 0.2):
+    """
+    Compara dos ejecuciones y detecta los casos que se volvieron más lentos.
+
+    Args:
+        base (dict): Resultados de referencia (ver `ejecutar_benchmark`).
+        nuevo (dict): Resultados a comparar.
+        umbral (float): Aumento relativo de la mediana que se considera una regresión.
+
+    Returns:
+        list: Tuplas (etapa, caso, p50 base, p50 nuevo, razón, es_regresión) de los casos comunes.
+    """
+    comparacion = []
+    for etapa, casos in nuevo["etapas"].items():
+        for caso, medicion in casos.items():
+            referencia = base["etapas"].get(etapa, {}).get(caso)
+            if referencia is None:
+                continue
+            razon = medicion["p50_s"] / referencia["p50_s"] if referencia["p50_s"] > 0 else float("inf")
+            comparacion.append((etapa, caso, referencia["p50_s"], medicion["p50_s"], razon, razon > 1 + umbral))
+    return comparacion
+
+
+def main(argv=None):
+    """Punto de entrada para ejecutar o comparar la batería de pruebas desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento del simulador de seguidor solar.")
+    parser.add_argument("--etapas", nargs="+", choices=ETAPAS, default=list(ETAPAS), help="Etapas a medir")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Ejecuciones medidas por caso")
+    parser.add_argument("--rapido", action="store_true", help="Usar casos más pequeños")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", nargs=2, metavar=("BASE", "NUEVO"),
+                        help="Comparar dos archivos de resultados en lugar de medir")
+    parser.add_argument("--umbral", type=float, default=0.2,
+                        help="Aumento relativo de la mediana considerado regresión (por defecto 0.2)")
+    args = parser.parse_args(argv)
+
+    if args.comparar:
+        with open(args.comparar[0], encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        with open(args.comparar[1], encoding="utf-8") as archivo:
+            nuevo = json.load(archivo)
+        comparacion = comparar_resultados(base, nuevo, args.umbral)
+        for etapa, caso, p50_base, p50_nuevo, razon, regresion in comparacion:
+            estado = "REGRESIÓN" if regresion else "ok"
+            print(f"{etapa:<12} {caso:<45} {p50_base * 1000:10.3f} ms -> {p50_nuevo * 1000:10.3f} ms "
+                  f"x{razon:5.2f} {estado}")
+        return 1 if any(fila[-1] for fila in comparacion) else 0
+
+    resultados = ejecutar_benchmark(args.etapas, args.repeticiones, args.rapido)
+    for etapa, casos in resultados["etapas"].items():
+        for caso, medicion in casos.items():
+            print(f"{etapa:<12} {caso:<45} p50 {medicion['p50_s'] * 1000:10.3f} ms  "
+                  f"p90 {medicion['p90_s'] * 1000:10.3f} ms  {medicion['muestras_por_segundo']:14.1f} muestras/s")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2)
+        print(f"Resultados guardados en {args.salida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""
+Módulo con el arnés de precisión frente a velocidad de los motores de posición solar.
+
+Genera una vez los datos de referencia (azimut, elevación, pitch y roll) con el
+cálculo actual de `getSolarPosition` sobre `pysolar`, para muchas fechas, latitudes
+y horas, y los guarda como archivo de referencia en `Rendimiento/referencias`.
+Después evalúa cada motor de `Interfaz.efemerides.BACKENDS` (o los indicados) sobre
+los mismos casos e informa el error máximo y el RMS de cada ángulo junto a la
+aceleración respecto a `pysolar`. Si algún error supera los umbrales configurados,
+el programa termina con código 1, de modo que un motor más rápido solo puede
+perder precisión a propósito (subiendo el umbral), nunca sin que se note.
+
+Los errores se calculan solo en los instantes con el sol sobre el horizonte en la
+referencia, que son los que sigue el panel; el error de azimut se toma sobre el
+círculo (359.99° y 0.01° difieren en 0.02°).
+
+Uso:
+    python -m Rendimiento.precision
+    python -m Rendimiento.precision --motores numpy --umbral azimut=0.05,0.01 --salida precision.json
+    python -m Rendimiento.precision --generar
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import date, datetime, timezone
+import numpy as np
+from Rendimiento.benchmark import medir
+
+RUTA_REFERENCIAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "referencias", "posicion_solar.npz")
+
+# Motor con el que se generan los datos de referencia
+MOTOR_REFERENCIA = "pysolar"
+
+# Fechas de los casos: equinoccios, solsticios, un 29 de febrero y años lejanos
+FECHAS_REFERENCIA = (
+    date(2000, 1, 1), date(2010, 3, 20), date(2016, 2, 29), date(2020, 6, 21),
+    date(2024, 9, 22), date(2025, 1, 27), date(2025, 12, 21), date(2035, 7, 4),
+)
+
+# Sitios (nombre, latitud, longitud), desde el ecuador hasta el círculo polar
+SITIOS_REFERENCIA = (
+    ("quito", -0.2105367, -78.491614),
+    ("guayaquil", -2.19616, -79.88621),
+    ("tropico", 23.44, 90.0),
+    ("sidney", -33.8688, 151.2093),
+    ("londres", 51.5074, -0.1278),
+    ("ushuaia", -54.8019, -68.303),
+    ("reikiavik", 64.1466, -21.9426),
+    ("svalbard", 78.2232, 15.6267),
+)
+
+# Paso en minutos del día completo (0 h a 24 h UTC) de cada caso
+PASO_REFERENCIA_MINUTOS = 15
+
+ANGULOS = ("azimut", "elevacion", "pitch", "roll")
+
+# Umbrales por defecto en grados: (error máximo, error RMS)
+UMBRALES = {
+    "azimut": (0.01, 0.002),
+    "elevacion": (0.01, 0.002),
+    "pitch": (0.01, 0.002),
+    "roll": (0.01, 0.002),
+}
+
+
+def _simular_caso(fecha, latitud, longitud, motor):
+    """Ejecuta `getSolarPosition` para un día completo en UTC con el paso de referencia."""
+    from Interfaz.calculoAngulos import getSolarPosition
+
+    return getSolarPosition(fecha, 0, 24, latitud, longitud, step_minutes=PASO_REFERENCIA_MINUTOS,
+                            backend=motor, zona_horaria="UTC")
+
+
+def generar_referencias(ruta=RUTA_REFERENCIAS, fechas=FECHAS_REFERENCIA, sitios=SITIOS_REFERENCIA):
+    """
+    Genera los datos de referencia con el motor `pysolar` y los guarda en un `.npz`.
+
+    Args:
+        ruta (str): Archivo de destino.
+        fechas (iterable): Fechas de los casos.
+        sitios (iterable): Tuplas (nombre, latitud, longitud).
+
+    Returns:
+        dict: Datos guardados (ver `cargar_referencias`).
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        version_motor = version("pysolar")
+    except PackageNotFoundError:
+        version_motor = "desconocida"
+
+    casos = [(fecha, sitio) for fecha in fechas for sitio in sitios]
+    resultados = [_simular_caso(fecha, latitud, longitud, MOTOR_REFERENCIA) for fecha, (_, latitud, longitud) in casos]
+    referencias = {
+        "fechas": np.array([fecha.isoformat() for fecha, _ in casos]),
+        "sitios": np.array([nombre for _, (nombre, _, _) in casos]),
+        "latitudes": np.array([latitud for _, (_, latitud, _) in casos]),
+        "longitudes": np.array([longitud for _, (_, _, longitud) in casos]),
+        "tiempos": np.stack([resultado.times for resultado in resultados]),
+        "azimut": np.stack([resultado.azimuths for resultado in resultados]),
+        "elevacion": np.stack([resultado.elevations for resultado in resultados]),
+        "pitch": np.stack([resultado.beta for resultado in resultados]),
+        "roll": np.stack([resultado.alpha for resultado in resultados]),
+        "paso_minutos": np.array(PASO_REFERENCIA_MINUTOS),
+        "motor": np.array(MOTOR_REFERENCIA),
+        "version_motor": np.array(version_motor),
+        "generado": np.array(datetime.now(timezone.utc).isoformat(timespec="seconds")),
+    }
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    np.savez_compressed(ruta, **referencias)
+    return referencias
+
+
+def cargar_referencias(ruta=RUTA_REFERENCIAS):
+    """
+    Carga los datos de referencia.
+
+    Args:
+        ruta (str): Archivo generado por `generar_referencias`.
+
+    Returns:
+        dict: Arreglos `fechas`, `sitios`, `latitudes`, `longitudes` (uno por caso),
+            `tiempos` y los ángulos de `ANGULOS` (casos x instantes), y los metadatos.
+    """
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"No existen datos de referencia en {ruta}. "
+                                "Se generan con: python -m Rendimiento.precision --generar")
+    with np.load(ruta) as datos:
+        return {nombre: datos[nombre] for nombre in datos.files}
+
+
+def calcular_casos(referencias, motor):
+    """
+    Calcula con un motor los ángulos de todos los casos de referencia.
+
+    Args:
+        referencias (dict): Datos de `cargar_referencias`.
+        motor (str | callable): Motor de posición solar (ver `obtener_backend`).
+
+    Returns:
+        dict: Ángulo -> arreglo (casos x instantes).
+    """
+    calculados = {angulo: np.empty_like(referencias[angulo]) for angulo in ANGULOS}
+    for indice, (fecha, latitud, longitud) in enumerate(zip(referencias["fechas"], referencias["latitudes"],
+                                                            referencias["longitudes"])):
+        resultado = _simular_caso(date.fromisoformat(str(fecha)), float(latitud), float(longitud), motor)
+        if not np.array_equal(resultado.times, referencias["tiempos"][indice]):
+            raise ValueError(f"El eje de tiempo del caso {fecha} ({latitud}, {longitud}) no coincide con la referencia.")
+        for angulo, columna in zip(ANGULOS, resultado.columnas[1:]):
+            calculados[angulo][indice] = columna
+    return calculados
+
+
+def errores_angulos(referencias, calculados):
+    """
+    Calcula el error máximo y el RMS de cada ángulo con el sol sobre el horizonte.
+
+    Args:
+        referencias (dict): Datos de `cargar_referencias`.
+        calculados (dict): Ángulos de `calcular_casos`.
+
+    Returns:
+        dict: Ángulo -> {"max": grados, "rms": grados, "muestras": n}.
+    """
+    de_dia = referencias["elevacion"] > 0
+    errores = {}
+    for angulo in ANGULOS:
+        diferencia = calculados[angulo][de_dia] - referencias[angulo][de_dia]
+        if angulo == "azimut":
+            diferencia = (diferencia + 180.0) % 360.0 - 180.0
+        diferencia = np.abs(diferencia)
+        errores[angulo] = {
+            "max": float(diferencia.max()) if diferencia.size else 0.0,
+            "rms": float(np.sqrt(np.mean(diferencia ** 2))) if diferencia.size else 0.0,
+            "muestras": int(diferencia.size),
+        }
+    return errores
+
+
+def evaluar_motores(motores=None, referencias=None, umbrales=None, repeticiones: int = 3):
+    """
+    Evalúa la precisión y la velocidad de varios motores frente a la referencia.
+
+    Args:
+        motores (iterable, opcional): Nombres de motores; por defecto, todos los de `BACKENDS`.
+        referencias (dict, opcional): Datos de `cargar_referencias`; por defecto se cargan del archivo.
+        umbrales (dict, opcional): Ángulo -> (error máximo, error RMS) en grados; por defecto `UMBRALES`.
+        repeticiones (int): Ejecuciones medidas de todos los casos por motor.
+
+    Returns:
+        dict: Motor -> {"errores", "tiempo_s", "instantes_por_segundo", "aceleracion",
+            "fallas"}, donde `fallas` lista los ángulos que superan su umbral.
+    """
+    from Interfaz.efemerides import BACKENDS
+
+    referencias = cargar_referencias() if referencias is None else referencias
+    umbrales = {**UMBRALES, **(umbrales or {})}
+    motores = list(BACKENDS) if motores is None else list(motores)
+    instantes = int(referencias["tiempos"].size)
+
+    # El motor de referencia se mide siempre, para calcular la aceleración
+    tiempos = {}
+    evaluacion = {}
+    for motor in dict.fromkeys([MOTOR_REFERENCIA, *motores]):
+        # La primera pasada calcula los errores y sirve de calentamiento para la medición
+        errores = errores_angulos(referencias, calcular_casos(referencias, motor))
+        medicion = medir(lambda: calcular_casos(referencias, motor), repeticiones, calentamiento=0,
+                         muestras=instantes)
+        tiempos[motor] = medicion["p50_s"]
+        fallas = [angulo for angulo, (maximo, rms) in umbrales.items()
+                  if errores[angulo]["max"] > maximo or errores[angulo]["rms"] > rms]
+        evaluacion[motor] = {
+            "errores": errores,
+            "tiempo_s": medicion["p50_s"],
+            "instantes_por_segundo": medicion["muestras_por_segundo"],
+            "fallas": fallas,
+        }
+    for motor, resultado in evaluacion.items():
+        resultado["aceleracion"] = tiempos[MOTOR_REFERENCIA] / resultado["tiempo_s"]
+    return {motor: evaluacion[motor] for motor in motores}
+
+
+def _leer_umbral(texto):
+    """Convierte "angulo=max[,rms]" en (ángulo, (max, rms))."""
+    angulo, _, valores = texto.partition("=")
+    if angulo not in ANGULOS or not valores:
+        raise argparse.ArgumentTypeError(f"Umbral inválido {texto!r}; se espera ANGULO=MAX[,RMS] "
+                                         f"con ANGULO en {', '.join(ANGULOS)}.")
+    maximo, _, rms = valores.partition(",")
+    return angulo, (float(maximo), float(rms) if rms else UMBRALES[angulo][1])
+
+
+def main(argv=None):
+    """Punto de entrada para generar las referencias o evaluar los motores desde la línea de comandos."""
+    from Interfaz.efemerides import BACKENDS
+
+    parser = argparse.ArgumentParser(description="Precisión frente a velocidad de los motores de posición solar.")
+    parser.add_argument("--generar", action="store_true", help="Regenerar los datos de referencia con pysolar")
+    parser.add_argument("--referencias", default=RUTA_REFERENCIAS, help="Archivo .npz de referencia")
+    parser.add_argument("--motores", nargs="+", choices=list(BACKENDS), help="Motores a evaluar (por defecto, todos)")
+    parser.add_argument("--umbral", action="append", type=_leer_umbral, default=[],
+                        help="Umbral de error en grados, ANGULO=MAX[,RMS] (se puede repetir)")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Ejecuciones medidas por motor")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    args = parser.parse_args(argv)
+
+    if args.generar:
+        referencias = generar_referencias(args.referencias)
+        print(f"Referencias guardadas en {args.referencias} ({referencias['tiempos'].shape[0]} casos, "
+              f"{referencias['tiempos'].size} instantes)")
+        return 0
+
+    referencias = cargar_referencias(args.referencias)
+    umbrales = {**UMBRALES, **dict(args.umbral)}
+    evaluacion = evaluar_motores(args.motores, referencias, umbrales, args.repeticiones)
+
+    print(f"Referencia: {referencias['motor']} {referencias['version_motor']}, {referencias['tiempos'].shape[0]} casos, "
+          f"{referencias['tiempos'].size} instantes")
+    for motor, resultado in evaluacion.items():
+        print(f"{motor:<10} {resultado['tiempo_s'] * 1000:10.1f} ms  x{resultado['aceleracion']:8.1f}  "
+              f"{resultado['instantes_por_segundo']:12.0f} instantes/s")
+        for angulo, error in resultado["errores"].items():
+            maximo, rms = umbrales[angulo]
+            estado = "FALLA" if angulo in resultado["fallas"] else "ok"
+            print(f"    {angulo:<10} max {error['max']:.2e}° (umbral {maximo:.0e})  "
+                  f"rms {error['rms']:.2e}° (umbral {rms:.0e})  {estado}")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump({"umbrales": umbrales, "motores": evaluacion}, archivo, indent=2)
+        print(f"Resultados guardados en {args.salida}")
+    return 1 if any(resultado["fallas"] for resultado in evaluacion.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
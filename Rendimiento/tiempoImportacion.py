@@ -0,0 +1,127 @@
+"""
+Módulo para medir el tiempo de importación de los módulos del simulador.
+
+Cada módulo se importa en un intérprete nuevo con `python -X importtime`, de
+modo que la medición no se ve afectada por lo que ya esté cargado. Se comprueba
+que el tiempo acumulado no supere su presupuesto y que el módulo no cargue
+bibliotecas gráficas o de reportes, que deben importarse solo al usarse.
+
+Uso:
+    python -m Rendimiento.tiempoImportacion
+    python -m Rendimiento.tiempoImportacion Interfaz.efemerides --repeticiones 10
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Presupuesto de importación en milisegundos (incluye numpy, que domina el tiempo)
+PRESUPUESTOS_MS = {
+    "Interfaz": 20,
+    "Experimentacion": 20,
+    "Interfaz.efemerides": 300,
+    "Interfaz.instrumentacion": 20,
+    "Interfaz.importacionDiferida": 20,
+    "Interfaz.calculoAngulos": 300,
+    "Interfaz.zonaHoraria": 300,
+    "Interfaz.resultadoSimulacion": 300,
+    "Interfaz.eventosSolares": 300,
+    "Interfaz.sombreadoFilas": 300,
+    "Interfaz.barridoParametros": 300,
+    "Interfaz.simulacionBloques": 300,
+    "Interfaz.pasoAdaptativo": 300,
+    "Interfaz.simulacionFlota": 300,
+    "Interfaz.cacheSimulacion": 300,
+    "Interfaz.tablaEfemerides": 300,
+    "Interfaz.generarReporte": 300,
+    "Interfaz.posicionSistema": 300,
+    "Interfaz.exportarAnimacion": 300,
+    "Interfaz.exportarResultados": 300,
+    "Interfaz.analisisEnergia": 300,
+    "Interfaz.servicioConsignas": 300,
+    "Interfaz.servidorAPI": 300,
+    "simulacionLotes": 350,
+}
+
+# Paquetes que el núcleo de cálculo no debe importar
+MODULOS_PROHIBIDOS = ("tkinter", "tkcalendar", "matplotlib", "mpl_toolkits", "PIL", "fpdf", "webbrowser")
+
+# Carpeta raíz del proyecto, para que los módulos se importen igual que desde los scripts principales
+RAIZ_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def medir_importacion(modulo):
+    """
+    Importa un módulo en un intérprete nuevo y registra lo que carga.
+
+    Args:
+        modulo (str): Nombre del módulo a importar.
+
+    Returns:
+        tuple: (milisegundos acumulados de la importación, conjunto de módulos cargados).
+    """
+    entorno = dict(os.environ)
+    entorno["PYTHONPATH"] = os.pathsep.join(filter(None, [RAIZ_PROYECTO, entorno.get("PYTHONPATH")]))
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                             capture_output=True, text=True, env=entorno, cwd=RAIZ_PROYECTO)
+    if proceso.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {modulo}:\n{proceso.stderr}")
+
+    # Formato de cada línea: "import time: <propio> | <acumulado> | <nombre con sangría>"
+    cargados = {}
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        cargados[nombre.strip()] = int(acumulado) / 1000
+    return cargados.get(modulo, 0.0), set(cargados)
+
+
+def verificar_modulos(modulos=None, repeticiones: int = 5):
+    """
+    Mide varios módulos y los compara con su presupuesto.
+
+    Args:
+        modulos (iterable, opcional): Módulos a medir; por defecto, los de `PRESUPUESTOS_MS`.
+        repeticiones (int): Mediciones por módulo; se conserva la más rápida.
+
+    Returns:
+        list: Diccionarios con el módulo, el tiempo, el presupuesto, los módulos
+            prohibidos que se cargaron y si la verificación se cumple.
+    """
+    resultados = []
+    for modulo in modulos or PRESUPUESTOS_MS:
+        mediciones = [medir_importacion(modulo) for _ in range(repeticiones)]
+        milisegundos = min(tiempo for tiempo, _ in mediciones)
+        prohibidos = sorted({nombre.split(".")[0] for nombre in mediciones[0][1]} & set(MODULOS_PROHIBIDOS))
+        presupuesto = PRESUPUESTOS_MS.get(modulo)
+        resultados.append({
+            "modulo": modulo,
+            "milisegundos": milisegundos,
+            "presupuesto_ms": presupuesto,
+            "prohibidos": prohibidos,
+            "cumple": not prohibidos and (presupuesto is None or milisegundos <= presupuesto),
+        })
+    return resultados
+
+
+def main(argv=None):
+    """Punto de entrada para verificar el presupuesto de importación desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Mide el tiempo de importación de los módulos del simulador.")
+    parser.add_argument("modulos", nargs="*", help="Módulos a medir (por defecto, todos los que tienen presupuesto)")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Mediciones por módulo")
+    args = parser.parse_args(argv)
+
+    resultados = verificar_modulos(args.modulos, args.repeticiones)
+    for resultado in resultados:
+        presupuesto = resultado["presupuesto_ms"]
+        limite = f"{presupuesto:6.0f} ms" if presupuesto is not None else "     - ms"
+        estado = "OK   " if resultado["cumple"] else "FALLA"
+        detalle = f"  carga {', '.join(resultado['prohibidos'])}" if resultado["prohibidos"] else ""
+        print(f"{estado} {resultado['modulo']:<30} {resultado['milisegundos']:8.1f} ms / {limite}{detalle}")
+    return 0 if all(resultado["cumple"] for resultado in resultados) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
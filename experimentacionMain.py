@@ -49,6 +49,7 @@ sola ventana.
 """
 
 from Experimentacion import sun_position, panel_position, datetime_picker, sun_path
+from Interfaz.cacheSimulacion import CacheLRU, memoizar
 from pytz import timezone
 from datetime import datetime, timedelta
 
@@ -56,14 +57,17 @@ start_date = datetime.strptime(datetime_picker.st_fecha, "%Y-%m-%d")
 start_date = start_date.replace(tzinfo=timezone("America/Guayaquil"))
 print(start_date)
 
-times, azimuths, elevations, beta, alpha = sun_position.getSolarPosition(start_date, start_hour=datetime_picker.start_t.hour, end_hour=datetime_picker.end_t.hour)
+# Las dos consultas usan el mismo escenario, así que la segunda se toma de la caché
+getSolarPosition = memoizar(sun_position.getSolarPosition, CacheLRU(max_entradas=4))
+
+times, azimuths, elevations, beta, alpha = getSolarPosition(start_date, start_hour=datetime_picker.start_t.hour, end_hour=datetime_picker.end_t.hour)
 
 # Llamar a la función para graficar la trayectoria
 panel_position.visualizar_trayectoria_panel(times, azimuths, elevations, beta, alpha)
 
 start_date = datetime.strptime(datetime_picker.st_fecha, "%Y-%m-%d")
 start_date = start_date.replace(tzinfo=timezone("America/Guayaquil"))
-times, azimuths, elevations, beta, alpha = sun_position.getSolarPosition(start_date, start_hour=datetime_picker.start_t.hour, end_hour=datetime_picker.end_t.hour)
+times, azimuths, elevations, beta, alpha = getSolarPosition(start_date, start_hour=datetime_picker.start_t.hour, end_hour=datetime_picker.end_t.hour)
 
 for i in range(len(times)):
     print(f"Tiempo: {times[i]}, Azimut: {azimuths[i]}, Elevación: {elevations[i]}")
@@ -4,7 +4,7 @@ from functools import partial
 from datetime import datetime
 from Interfaz.seleccionarParametros import crear_ventana_datetime
 from Interfaz.generarReporte import generar_reporte
-from Interfaz.calculoAngulos import getSolarPosition
+from Interfaz.cacheSimulacion import obtener_simulacion_cacheada
 from Interfaz.posicionSistema import visualizar_trayectoria_panel_y_sol
 
 label_fecha = None
@@ -13,6 +13,7 @@ label_fin = None
 boton_iniciar = None
 botton_icono = None
 main_area = None
+ultima_simulacion = None  # (parámetros mostrados, resultado) de la última simulación visualizada
 
 def centrar_ventana(ventana):
     """
@@ -54,16 +55,13 @@ def actualizar_parametros(fecha, hora_inicio, hora_fin):
 
 
 def simulacion():
-    times, azimuths, elevations, beta, alpha = getSolarPosition(
-        label_fecha.cget("text"),
-        label_inicio.cget("text"),
-        label_fin.cget("text")
-    )
-    
-    phi = alpha
+    global ultima_simulacion
+    parametros = (label_fecha.cget("text"), label_inicio.cget("text"), label_fin.cget("text"))
+    resultado = obtener_simulacion_cacheada(*parametros)
+    ultima_simulacion = (parametros, resultado)
 
     # Llamar a la función modificada pasando main_area
-    visualizar_trayectoria_panel_y_sol(main_area, times, azimuths, elevations, beta, phi)
+    visualizar_trayectoria_panel_y_sol(main_area, resultado)
 
 
 def reporte():
@@ -88,8 +86,12 @@ def reporte():
             print(f"⚠️ Error: Formato de hora inválido ({inicio_str}, {fin_str}).")
             return
 
+        # Reutilizar la simulación visualizada si corresponde a los mismos parámetros
+        parametros = (label_fecha.cget("text"), label_inicio.cget("text"), label_fin.cget("text"))
+        resultado = ultima_simulacion[1] if ultima_simulacion and ultima_simulacion[0] == parametros else None
+
         # Llamar a la función que genera el reporte, ahora con las variables correctas
-        reporte_texto = generar_reporte(fecha, inicio, fin)  # Aquí pasas las variables correctas
+        reporte_texto = generar_reporte(fecha, inicio, fin, resultado=resultado)
 
         # Guardar el reporte en un archivo
         ruta_reporte = f"Reporte_Solar_{fecha_str.replace('/', '-')}.txt"
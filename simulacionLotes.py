@@ -0,0 +1,217 @@
+"""
+Ejecución por lotes del simulador de seguidor solar, sin interfaz gráfica.
+
+Este script calcula la trayectoria del sol y los ángulos de control pitch y
+roll para varias fechas, ventanas horarias y sitios, y guarda los resultados
+en disco. No importa `tkinter` ni `matplotlib`, por lo que puede usarse en
+servidores sin pantalla.
+
+Ejemplos:
+    python simulacionLotes.py --fecha 2025-01-27 --hora-inicio 6 --hora-fin 18 --salida resultados
+    python simulacionLotes.py --escenario escenario.json --salida resultados --procesos 4
+
+Formato del archivo de escenario (JSON; también puede ser una lista de escenarios):
+    {
+        "fechas": ["2025-01-27", "2025-06-21"],
+        "hora_inicio": 6,
+        "hora_fin": 18,
+        "paso": 10,
+        "backend": "numpy",
+        "sitios": [{"nombre": "quito", "latitud": -0.2105367, "longitud": -78.491614,
+                    "zona_horaria": "America/Guayaquil"}]
+    }
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from Interfaz.exportarResultados import FORMATOS, exportar_resultado
+from Interfaz.simulacionFlota import cargar_sitios, normalizar_sitios, simular_flota, simular_sitio
+
+# Sitio por defecto del simulador (Quito)
+SITIO_POR_DEFECTO = {"nombre": "quito", "latitud": -0.2105367, "longitud": -78.491614,
+                     "zona_horaria": "America/Guayaquil"}
+
+FORMATOS_SALIDA = ("csv",) + FORMATOS
+
+# Extensión de cada formato binario (`npy` es una carpeta con un archivo por columna)
+EXTENSIONES = {"npz": ".npz", "npy": "", "parquet": ".parquet", "arrow": ".arrow"}
+
+
+def leer_sitio(texto):
+    """
+    Convierte un argumento "nombre,latitud,longitud[,zona_horaria]" en un sitio.
+
+    Args:
+        texto (str): Descripción del sitio separada por comas.
+
+    Returns:
+        dict: Sitio con nombre, latitud, longitud y zona horaria.
+    """
+    partes = [parte.strip() for parte in texto.split(",")]
+    if len(partes) not in (3, 4):
+        raise argparse.ArgumentTypeError("El sitio debe tener el formato nombre,latitud,longitud[,zona_horaria]")
+    return normalizar_sitios([partes])[0]
+
+
+def construir_escenarios(args):
+    """
+    Combina los argumentos de la línea de comandos y el archivo de escenario.
+
+    Args:
+        args (argparse.Namespace): Argumentos leídos.
+
+    Returns:
+        list: Lista de escenarios con fechas, horas, paso, motor y sitios.
+    """
+    if args.escenario:
+        with open(args.escenario, encoding="utf-8") as archivo:
+            contenido = json.load(archivo)
+        escenarios = contenido if isinstance(contenido, list) else [contenido]
+    else:
+        escenarios = [{}]
+
+    sitios_cli = list(args.sitio or [])
+    if args.sitios:
+        sitios_cli += cargar_sitios(args.sitios)
+
+    resultado = []
+    for escenario in escenarios:
+        fechas = args.fecha or escenario.get("fechas")
+        if not fechas:
+            raise SystemExit("Se debe indicar al menos una fecha (--fecha o \"fechas\" en el escenario).")
+        sitios = sitios_cli or normalizar_sitios(escenario.get("sitios") or [SITIO_POR_DEFECTO])
+        resultado.append({
+            "fechas": fechas,
+            "hora_inicio": args.hora_inicio if args.hora_inicio is not None else int(escenario.get("hora_inicio", 6)),
+            "hora_fin": args.hora_fin if args.hora_fin is not None else int(escenario.get("hora_fin", 18)),
+            "paso": args.paso if args.paso is not None else float(escenario.get("paso", 10)),
+            "backend": args.backend or escenario.get("backend", "numpy"),
+            "sitios": sitios,
+        })
+    return resultado
+
+
+def ventana_local(fecha, hora_inicio, hora_fin):
+    """
+    Construye los instantes locales de inicio y fin de una ventana horaria.
+
+    Args:
+        fecha (str): Fecha en formato "YYYY-MM-DD".
+        hora_inicio (int): Hora de inicio (0 a 24).
+        hora_fin (int): Hora de fin (0 a 24).
+
+    Returns:
+        tuple: (inicio, fin) como `datetime` sin zona horaria.
+    """
+    dia = datetime.strptime(str(fecha).strip(), "%Y-%m-%d")
+    if not 0 <= hora_inicio <= hora_fin <= 24:
+        raise SystemExit(f"Ventana horaria inválida: {hora_inicio} a {hora_fin}.")
+    return dia + timedelta(hours=hora_inicio), dia + timedelta(hours=hora_fin)
+
+
+def guardar_resultado(resultado, ruta_base, formato):
+    """
+    Guarda las columnas de una simulación en disco.
+
+    Args:
+        resultado (tuple): Arreglos (times, azimuths, elevations, beta, alpha).
+        ruta_base (str): Ruta de salida sin extensión.
+        formato (str): "csv" o uno de los formatos de `Interfaz.exportarResultados`.
+
+    Returns:
+        str: Ruta del archivo (o carpeta) escrito.
+    """
+    if formato != "csv":
+        return exportar_resultado(ruta_base + EXTENSIONES[formato], resultado, formato)
+
+    times, azimuths, elevations, beta, alpha = resultado
+
+    ruta = ruta_base + ".csv"
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        archivo.write("tiempo_utc,azimut,elevacion,beta,alpha\n")
+        archivo.writelines(
+            f"{t},{az:.6f},{el:.6f},{b:.6f},{a:.6f}\n"
+            for t, az, el, b, a in zip(np.datetime_as_string(times, unit="s"), azimuths, elevations, beta, alpha)
+        )
+    return ruta
+
+
+def ejecutar(escenarios, salida, formato="csv", procesos=1):
+    """
+    Ejecuta todos los escenarios y escribe un archivo por sitio y fecha.
+
+    Args:
+        escenarios (list): Escenarios devueltos por `construir_escenarios`.
+        salida (str): Carpeta de salida.
+        formato (str): Formato de los archivos de resultados.
+        procesos (int): Procesos a usar para repartir los sitios de cada fecha.
+
+    Returns:
+        dict: Resumen con el número de simulaciones, instantes, segundos y tasa de instantes por segundo.
+    """
+    os.makedirs(salida, exist_ok=True)
+    simulaciones = 0
+    instantes = 0
+    inicio_reloj = time.perf_counter()
+
+    for escenario in escenarios:
+        for fecha in escenario["fechas"]:
+            inicio, fin = ventana_local(fecha, escenario["hora_inicio"], escenario["hora_fin"])
+            argumentos = (inicio, fin, escenario["paso"])
+
+            if procesos > 1 and len(escenario["sitios"]) > 1:
+                resultados = simular_flota(escenario["sitios"], *argumentos, procesos=procesos,
+                                           backend=escenario["backend"])
+            else:
+                resultados = ((sitio, simular_sitio(sitio, *argumentos, backend=escenario["backend"]))
+                              for sitio in escenario["sitios"])
+
+            for sitio, resultado in resultados:
+                ruta_base = os.path.join(
+                    salida, f"{sitio['nombre']}_{fecha}_{escenario['hora_inicio']:02d}-{escenario['hora_fin']:02d}")
+                guardar_resultado(resultado, ruta_base, formato)
+                simulaciones += 1
+                instantes += resultado[0].size
+
+    segundos = time.perf_counter() - inicio_reloj
+    return {
+        "simulaciones": simulaciones,
+        "instantes": instantes,
+        "segundos": segundos,
+        "instantes_por_segundo": instantes / segundos if segundos > 0 else float("inf"),
+    }
+
+
+def crear_parser():
+    """Crea el analizador de argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Simulación por lotes del seguidor solar (sin interfaz gráfica).")
+    parser.add_argument("--fecha", action="append", help="Fecha a simular (YYYY-MM-DD); se puede repetir")
+    parser.add_argument("--hora-inicio", type=int, help="Hora local de inicio (por defecto 6)")
+    parser.add_argument("--hora-fin", type=int, help="Hora local de fin (por defecto 18)")
+    parser.add_argument("--paso", type=float, help="Paso de simulación en minutos (por defecto 10)")
+    parser.add_argument("--sitio", action="append", type=leer_sitio,
+                        help="Sitio nombre,latitud,longitud[,zona_horaria]; se puede repetir")
+    parser.add_argument("--sitios", help="Archivo CSV con la tabla de sitios")
+    parser.add_argument("--escenario", help="Archivo JSON con uno o varios escenarios")
+    parser.add_argument("--backend", help="Motor de posición solar: numpy (por defecto) o pysolar")
+    parser.add_argument("--salida", default="resultados", help="Carpeta de salida")
+    parser.add_argument("--formato", choices=FORMATOS_SALIDA, default="csv", help="Formato de los resultados")
+    parser.add_argument("--procesos", type=int, default=1, help="Procesos para repartir los sitios")
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    resumen = ejecutar(construir_escenarios(args), args.salida, args.formato, args.procesos)
+    print(f"{resumen['simulaciones']} simulaciones, {resumen['instantes']} instantes en "
+          f"{resumen['segundos']:.3f} s ({resumen['instantes_por_segundo']:.0f} instantes/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Pruebas de humo del simulador: recorren los caminos principales de punta a punta.
+
+Se ejecutan desde la raíz del proyecto con:
+    python -m pytest -q
+"""
+
+import asyncio
+import sys
+import types
+import matplotlib
+
+matplotlib.use("Agg")
+
+import pytest
+from Interfaz.calculoAngulos import getSolarPosition
+from Interfaz.generarReporte import construir_reporte_pdf
+from Interfaz.posicionSistema import crear_figura_escena, visualizar_trayectoria_panel_y_sol
+from Interfaz.resultadoSimulacion import ResultadoSimulacion
+from Interfaz.servicioConsignas import ControladorSimulado, ServicioConsignas
+
+SEGUIDORES = [("quito", -0.2105367, -78.491614), ("guayaquil", -2.19616, -79.88621)]
+
+
+@pytest.fixture(scope="module")
+def resultado():
+    return getSolarPosition("2025-01-27", 6, 18, step_minutes=10, backend="numpy")
+
+
+@pytest.fixture
+def tk_simulado(monkeypatch):
+    """Reemplaza `tkinter` y el canvas de Tk por equivalentes sin ventana."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    class Marco:
+        def __init__(self, *args, **kwargs):
+            self.hijos = []
+
+        def pack(self, *args, **kwargs):
+            pass
+
+        def winfo_children(self):
+            return self.hijos
+
+        def update_idletasks(self):
+            pass
+
+    class CanvasTk(FigureCanvasAgg):
+        def __init__(self, figura, master=None):
+            super().__init__(figura)
+
+        def get_tk_widget(self):
+            return Marco()
+
+    tkinter = types.ModuleType("tkinter")
+    tkinter.Frame, tkinter.BOTH = Marco, "both"
+    backend_tkagg = types.ModuleType("matplotlib.backends.backend_tkagg")
+    backend_tkagg.FigureCanvasTkAgg = CanvasTk
+    monkeypatch.setitem(sys.modules, "tkinter", tkinter)
+    monkeypatch.setitem(sys.modules, "matplotlib.backends.backend_tkagg", backend_tkagg)
+    return Marco
+
+
+def test_resultado_se_desempaqueta_como_tupla(resultado):
+    assert isinstance(resultado, ResultadoSimulacion)
+    times, azimuths, elevations, beta, alpha = resultado
+    assert resultado.muestras == times.size == 73
+    assert resultado[0] is resultado.times
+    with pytest.raises(TypeError):
+        len(resultado)
+
+
+def test_escena_3d(resultado):
+    figura, escena = crear_figura_escena(resultado)
+    assert escena.cantidad == resultado.muestras
+    escena.iniciar()
+    escena.actualizar(resultado.muestras - 1)
+    figura.canvas.draw()
+
+
+def test_visualizacion_en_tk(resultado, tk_simulado):
+    animacion = visualizar_trayectoria_panel_y_sol(tk_simulado(), resultado)
+    assert animacion is not None
+
+
+def test_reporte_pdf(resultado):
+    from datetime import date
+
+    contenido = construir_reporte_pdf(resultado, date(2025, 1, 27), 6, 18)
+    assert bytes(contenido).startswith(b"%PDF")
+
+
+def test_servicio_consignas_con_controlador_simulado():
+    async def probar():
+        servicio = ServicioConsignas(SEGUIDORES, frecuencia=20)
+        host, puerto = await servicio.iniciar()
+        try:
+            async with ControladorSimulado("*", host, puerto) as controlador:
+                await controlador.escuchar(3)
+                assert set(controlador.consignas) == {"quito", "guayaquil"}
+
+                # Una suscripción mal formada recibe un error y la conexión sigue abierta
+                await controlador.suscribir(5)
+                with pytest.raises(ValueError, match="seguidores"):
+                    for _ in range(100):
+                        await controlador.recibir()
+
+                await controlador.suscribir(["quito"])
+                for _ in range(100):
+                    mensaje = await controlador.recibir()
+                    if set(mensaje["consignas"]) == {"quito"}:
+                        break
+                else:
+                    pytest.fail("No llegaron consignas tras la nueva suscripción.")
+        finally:
+            await servicio.detener()
+
+    asyncio.run(probar())